@@ -5,15 +5,26 @@ Officer Info Backfill Script
 Backfill officer_badge, officer_name, and officer_beat for existing citations
 by OCR-processing their receipt images (last image in image_urls).
 
+Receipts are downloaded concurrently and OCR'd on a process pool sized to the
+machine's cores (OcrWorkerPool), so throughput scales with CPU count.
+
+Citations are paged newest-first by citation_number and each batch is written
+in one UPDATE. Progress is checkpointed after every batch, so an interrupted run
+resumes where it stopped. Receipts where OCR finds no officer info are marked
+(officer_info_extracted_at) and skipped by later runs unless --retry-misses.
+
 Usage:
-    python backfill_officer_info.py [--limit N] [--dry-run] [--batch-size N]
+    python backfill_officer_info.py [--limit N] [--dry-run] [--batch-size N] [--workers N]
+                                    [--retry-misses] [--restart]
 """
 
 import os
 import sys
 import logging
 import argparse
-import time
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import List, Dict, Optional
 
@@ -24,7 +35,9 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from db_manager import DatabaseManager
-from scraper import CitationScraper
+from scraper import CitationScraper, RateLimiter
+from ocr_pool import OcrWorkerPool
+from ocr_cache import ocr_cache_from_env
 
 # Configure logging
 logging.basicConfig(
@@ -49,84 +62,52 @@ DB_CONFIG = {
 }
 
 
-def get_citations_without_officer_info(db_manager: DatabaseManager, limit: int = 100, offset: int = 0) -> List[Dict]:
-    """Get citations that have images but no officer info.
-    
-    If the officer_badge column doesn't exist yet, falls back to getting
-    all citations with images.
-    """
-    try:
-        # First, try to query with officer_badge filter (column exists)
-        try:
-            result = (
-                db_manager.supabase
-                .table('citations')
-                .select('citation_number,image_urls')
-                .not_.is_('image_urls', 'null')
-                .is_('officer_badge', 'null')
-                .order('citation_number', desc=True)
-                .range(offset, offset + limit - 1)
-                .execute()
-            )
-        except Exception as col_err:
-            # If the column doesn't exist, fall back to getting all citations with images
-            if '42703' in str(col_err) or 'does not exist' in str(col_err):
-                logger.warning("officer_badge column not found - please run the migration first!")
-                logger.warning("Run: docs/migration_add_officer_info.sql in Supabase SQL Editor")
-                # Fall back to getting all citations with images
-                result = (
-                    db_manager.supabase
-                    .table('citations')
-                    .select('citation_number,image_urls')
-                    .not_.is_('image_urls', 'null')
-                    .order('citation_number', desc=True)
-                    .range(offset, offset + limit - 1)
-                    .execute()
-                )
-            else:
-                raise col_err
-        
-        citations = result.data or []
-        # Filter to only include citations that have at least one image URL
-        citations_with_images = [
-            c for c in citations 
-            if c.get('image_urls') and isinstance(c['image_urls'], list) and len(c['image_urls']) > 0
-        ]
-        return citations_with_images
-    except Exception as e:
-        logger.error(f"Failed to query citations: {e}")
-        return []
-
-
-def update_officer_info(db_manager: DatabaseManager, citation_number: int, officer_info: Dict) -> bool:
-    """Update a citation with officer info."""
+DEFAULT_CHECKPOINT = os.path.join(os.path.dirname(__file__), '.cache', 'officer_backfill_checkpoint.json')
+
+
+def load_checkpoint(path: str, retry_misses: bool) -> Optional[int]:
+    """Citation number to resume below, or None to start from the newest citation."""
+    if not os.path.exists(path):
+        return None
     try:
-        update_data = {}
-        if officer_info.get('officer_badge'):
-            update_data['officer_badge'] = officer_info['officer_badge']
-        if officer_info.get('officer_name'):
-            update_data['officer_name'] = officer_info['officer_name']
-        if officer_info.get('officer_beat'):
-            update_data['officer_beat'] = officer_info['officer_beat']
-        
-        if not update_data:
-            return False
-        
-        # Add timestamp for when we extracted this info
-        update_data['officer_info_extracted_at'] = datetime.now(timezone.utc).isoformat()
-        
-        db_manager.supabase.table('citations').update(update_data).eq('citation_number', citation_number).execute()
-        return True
-    except Exception as e:
-        logger.error(f"Failed to update citation {citation_number}: {e}")
-        return False
+        with open(path) as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+        return None
+    if checkpoint.get('retry_misses', False) != retry_misses:
+        logger.info("Checkpoint was written with a different --retry-misses setting; starting over")
+        return None
+    return checkpoint.get('before')
+
+
+def save_checkpoint(path: str, before: int, retry_misses: bool) -> None:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({
+            'before': before,
+            'retry_misses': retry_misses,
+            'updated_at': datetime.now(timezone.utc).isoformat(),
+        }, f)
+    os.replace(tmp_path, path)
+
+
+def clear_checkpoint(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
 
 
 def backfill_officer_info(
     limit: int = 0,
     batch_size: int = 100,
     dry_run: bool = False,
-    delay_between_requests: float = 0.1
+    delay_between_requests: float = 0.1,
+    workers: int = 0,
+    download_workers: int = 8,
+    retry_misses: bool = False,
+    checkpoint_path: str = DEFAULT_CHECKPOINT,
+    restart: bool = False,
 ):
     """Main backfill function."""
     logger.info("=" * 60)
@@ -138,79 +119,115 @@ def backfill_officer_info(
     
     # Initialize components
     db_manager = DatabaseManager(DB_CONFIG)
-    scraper = CitationScraper()
+    # delay_between_requests now spaces out image downloads across all download threads
+    rate_limiter = RateLimiter(1.0 / delay_between_requests) if delay_between_requests > 0 else None
+    local = threading.local()
+
+    def download(url: str) -> Optional[bytes]:
+        # One scraper (session) per download thread
+        if not hasattr(local, 'scraper'):
+            local.scraper = CitationScraper(rate_limiter=rate_limiter)
+        try:
+            return local.scraper.download_receipt(url)
+        except Exception as e:
+            logger.warning(f"Failed to download receipt {url}: {e}")
+            return None
     
     total_processed = 0
     total_updated = 0
     total_skipped = 0
     total_errors = 0
-    offset = 0
+    finished = False
+
+    if restart:
+        clear_checkpoint(checkpoint_path)
+    before = load_checkpoint(checkpoint_path, retry_misses)
+    if before is not None:
+        logger.info(f"Resuming below citation {before} (checkpoint {checkpoint_path})")
+
+    def next_page(below: Optional[int]) -> List[Dict]:
+        remaining = limit - total_processed if limit > 0 else batch_size
+        if remaining <= 0:
+            return []
+        return db_manager.get_officer_backfill_batch(before=below, limit=min(batch_size, remaining), retry_misses=retry_misses)
     
-    while True:
-        # Get batch of citations
-        citations = get_citations_without_officer_info(db_manager, batch_size, offset)
-        
-        if not citations:
-            logger.info(f"No more citations to process (offset={offset})")
-            break
-        
-        logger.info(f"Processing batch of {len(citations)} citations (offset={offset})")
-        
-        for citation in citations:
-            citation_number = citation['citation_number']
-            image_urls = citation['image_urls']
-            
-            # Get the receipt image (last image in the list)
-            receipt_url = image_urls[-1] if image_urls else None
-            
-            if not receipt_url:
-                logger.debug(f"No receipt URL for citation {citation_number}")
-                total_skipped += 1
-                continue
-            
+    # Receipts OCR'd before (by the scraper or an earlier backfill) are served from the cache
+    ocr_cache = ocr_cache_from_env(db_manager)
+    with OcrWorkerPool(workers=workers or None, cache=ocr_cache) as pool, ThreadPoolExecutor(max_workers=download_workers) as downloader:
+        logger.info(f"OCR on {pool.workers} worker process(es), {download_workers} download thread(s)")
+
+        def start_downloads(page: List[Dict]) -> List[Future]:
+            return [downloader.submit(download, c['image_urls'][-1]) for c in page]
+
+        # Pages are fetched by citation_number keyset, so rows updated mid-run can't shift later
+        # pages. The next page's downloads run while the current page is on the OCR pool.
+        try:
+            citations = next_page(before)
+        except Exception as e:
+            logger.error(f"Failed to query citations: {e}")
+            citations = None
+        downloads = start_downloads(citations or [])
+        while citations:
+            logger.info(f"Processing batch of {len(citations)} citations ({citations[0]['citation_number']} down to {citations[-1]['citation_number']})")
+            images = [f.result() for f in downloads]
+            before = citations[-1]['citation_number']
+            total_processed += len(citations)
+
             try:
-                # Extract officer info
-                officer_info = scraper.extract_officer_info_from_receipt(receipt_url)
-                
+                upcoming = next_page(before)
+            except Exception as e:
+                logger.error(f"Failed to query citations: {e}")
+                break
+            downloads = start_downloads(upcoming)
+
+            fetched = [(c, img) for c, img in zip(citations, images) if img]
+            # Failed downloads are left untouched and picked up by the next full pass
+            total_errors += len(citations) - len(fetched)
+            results = pool.analyze_batch([img for _, img in fetched])
+
+            updates = []
+            for (citation, _), officer_info in zip(fetched, results):
+                citation_number = citation['citation_number']
+                if officer_info is None:
+                    # OCR failed or timed out: leave the row unmarked so the next pass retries it
+                    logger.warning(f"Receipt OCR failed for citation {citation_number}")
+                    total_errors += 1
+                    continue
                 if officer_info.get('officer_badge') or officer_info.get('officer_name'):
-                    if dry_run:
-                        logger.info(f"[DRY RUN] Would update citation {citation_number}: {officer_info}")
-                    else:
-                        success = update_officer_info(db_manager, citation_number, officer_info)
-                        if success:
-                            logger.info(f"✓ Updated citation {citation_number}: badge={officer_info.get('officer_badge')}, name={officer_info.get('officer_name')}, beat={officer_info.get('officer_beat')}")
-                            total_updated += 1
-                        else:
-                            total_errors += 1
+                    logger.info(f"{'[DRY RUN] ' if dry_run else ''}✓ Citation {citation_number}: badge={officer_info.get('officer_badge')}, name={officer_info.get('officer_name')}, beat={officer_info.get('officer_beat')}")
+                    total_updated += 1
                 else:
                     logger.debug(f"No officer info found for citation {citation_number}")
                     total_skipped += 1
-                
-                total_processed += 1
-                
-                # Check limit
-                if limit > 0 and total_processed >= limit:
-                    logger.info(f"Reached limit of {limit} citations")
+                # Misses (OCR ran, found no officer fields) are written too, which marks them as attempted
+                updates.append((citation_number, officer_info))
+
+            if not dry_run:
+                try:
+                    db_manager.save_officer_info(updates)
+                except Exception as e:
+                    logger.error(f"Failed to save batch ending at citation {before}: {e}")
+                    total_errors += len(updates)
                     break
-                
-                # Delay between requests
-                time.sleep(delay_between_requests)
-                
-            except Exception as e:
-                logger.error(f"Error processing citation {citation_number}: {e}")
-                total_errors += 1
-        
-        # Check if we should stop
-        if limit > 0 and total_processed >= limit:
-            break
-        
-        offset += batch_size
-        
-        # Safety break if we've processed too many
-        if offset > 100000:
-            logger.warning("Safety limit reached (100k citations)")
-            break
+                save_checkpoint(checkpoint_path, before, retry_misses)
+
+            citations = upcoming
+        else:
+            finished = citations is not None and (limit <= 0 or total_processed < limit)
+
+        for f in downloads:
+            f.cancel()
+
+    if finished and not dry_run:
+        logger.info("No more citations to process")
+        clear_checkpoint(checkpoint_path)
+    elif limit > 0 and total_processed >= limit:
+        logger.info(f"Reached limit of {limit} citations; rerun to continue from the checkpoint")
     
+    if ocr_cache is not None:
+        logger.info(f"OCR cache: {ocr_cache.hits} hit(s), {ocr_cache.misses} miss(es)")
+        ocr_cache.close()
+
     # Summary
     logger.info("=" * 60)
     logger.info("BACKFILL SUMMARY")
@@ -227,7 +244,12 @@ def main():
     parser.add_argument('--limit', type=int, default=0, help='Maximum number of citations to process (0 = unlimited)')
     parser.add_argument('--batch-size', type=int, default=100, help='Number of citations per batch')
     parser.add_argument('--dry-run', action='store_true', help='Preview changes without updating database')
-    parser.add_argument('--delay', type=float, default=0.1, help='Delay between requests in seconds')
+    parser.add_argument('--delay', type=float, default=0.1, help='Minimum seconds between image downloads (0 = unthrottled)')
+    parser.add_argument('--workers', type=int, default=0, help='OCR worker processes (default: OCR_POOL_WORKERS or CPU count)')
+    parser.add_argument('--download-workers', type=int, default=8, help='Concurrent receipt downloads')
+    parser.add_argument('--retry-misses', action='store_true', help='Also re-OCR receipts where no officer info was found before')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT, help='Progress file used to resume an interrupted run')
+    parser.add_argument('--restart', action='store_true', help='Ignore any checkpoint and start from the newest citation')
     
     args = parser.parse_args()
     
@@ -235,7 +257,12 @@ def main():
         limit=args.limit,
         batch_size=args.batch_size,
         dry_run=args.dry_run,
-        delay_between_requests=args.delay
+        delay_between_requests=args.delay,
+        workers=args.workers,
+        download_workers=args.download_workers,
+        retry_misses=args.retry_misses,
+        checkpoint_path=args.checkpoint,
+        restart=args.restart,
     )
 
 
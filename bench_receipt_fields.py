@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Receipt field-extraction micro-benchmark.
+
+Times the compiled receipt_fields engine against the previous line-by-line parsers
+(kept below as the reference) and checks that both return the same fields.
+
+Inputs are the OCR texts in receipt_ocr_corpus.jsonl (one {"text": ...} per line),
+plus, with --from-cache, every receipt in the local OCR cache (.cache/ocr_results.sqlite3),
+which holds the real Tesseract output seen by the scraper and backfills. The texts are
+cycled to --size parses per run.
+
+Usage:
+    python bench_receipt_fields.py [--size 50000] [--repeat 5] [--from-cache]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Dict, Optional
+
+# Add src directory to Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from receipt_fields import extract_location, extract_officer_fields
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), 'receipt_ocr_corpus.jsonl')
+
+
+# ---------------------------------------------------------------------------
+# Reference: the parsers as they were before receipt_fields
+# ---------------------------------------------------------------------------
+
+def legacy_officer(text: str) -> Dict:
+    """Parse officer badge, name, and beat from OCR text.
+
+    Typical receipt patterns:
+    - OFFICER: 801 RITTER
+    - OFFICER: 1234 SMITH, JOHN
+    - OFFICER 1234 SMITH JOHN
+    - BADGE: 1234
+    - BEAT: A
+    """
+    result = {
+        'officer_badge': None,
+        'officer_name': None,
+        'officer_beat': None
+    }
+
+    if not text:
+        return result
+
+    # Normalize text
+    text = text.upper()
+    lines = text.split('\n')
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        # Pattern: OFFICER: 1234 SMITH, JOHN or OFFICER 1234 SMITH JOHN
+        # Allow 1-8 digits for badge to be safe
+        officer_patterns = [
+            # OFFICER: badge name (e.g. OFFICER : 801 RITTER)
+            r'OFFICER[:\s]+(\d{1,8})\s+([A-Z0-9][A-Z0-9\s,\.\'-]+)',
+            # OFFICER: name (badge)
+            r'OFFICER[:\s]+([A-Z][A-Z\s,\.\'-]+)\s*\((\d{1,8})\)',
+            # Just looking for badge number on a line with OFFICER
+            r'OFFICER[:\s]+(\d{1,8})$',
+        ]
+
+        # Check officer patterns
+        for pattern in officer_patterns:
+            match = re.search(pattern, line)
+            if match:
+                groups = match.groups()
+                if len(groups) >= 2:
+                    # First pattern: badge then name
+                    if groups[0].isdigit():
+                        result['officer_badge'] = groups[0].strip()
+                        result['officer_name'] = legacy_clean_officer_name(groups[1])
+                    else:
+                        # Second pattern: name then badge
+                        result['officer_name'] = legacy_clean_officer_name(groups[0])
+                        result['officer_badge'] = groups[1].strip()
+                elif len(groups) == 1 and groups[0].isdigit():
+                    result['officer_badge'] = groups[0].strip()
+
+                # If we found something, break logic for this line?
+                # We might still find BEAT on the same line if it exists
+                break
+
+        # Pattern: BADGE: 1234 or BADGE 1234 (if not found in OFFICER line)
+        if not result['officer_badge']:
+            badge_match = re.search(r'BADGE[:\s]+(\d{1,8})', line)
+            if badge_match:
+                result['officer_badge'] = badge_match.group(1).strip()
+
+        # Pattern: BEAT: A1 or BEAT A (single letter or number or mix)
+        # Sometimes just "BEAT A"
+        if not result['officer_beat']:
+            beat_match = re.search(r'BEAT[:\s]+([A-Z0-9\-]+)', line)
+            if beat_match:
+                result['officer_beat'] = beat_match.group(1).strip()
+
+        # Pattern: OFFICER NAME: SMITH, JOHN
+        if not result['officer_name']:
+            name_match = re.search(r'(?:OFFICER\s*)?NAME[:\s]+([A-Z][A-Z\s,\.\'-]+)', line)
+            if name_match:
+                result['officer_name'] = legacy_clean_officer_name(name_match.group(1))
+
+    return result
+
+
+def legacy_clean_officer_name(name: str) -> Optional[str]:
+    """Clean up officer name from OCR text."""
+    if not name:
+        return None
+
+    # Remove extra whitespace
+    name = ' '.join(name.split())
+
+    # Remove trailing punctuation except for valid name characters
+    name = name.strip(' ,.')
+
+    # Skip if too short or looks like noise
+    if len(name) < 2:
+        return None
+
+    # Skip if it's mostly numbers
+    if sum(c.isdigit() for c in name) > len(name) // 2:
+        return None
+
+    return name if name else None
+
+
+def legacy_address(text: str) -> Optional[str]:
+    """Parse address from OCR text"""
+    if not text:
+        return None
+
+    # Look for LOCATION patterns - handle both "LOCATION:" and "LOCATION" formats
+    location_patterns = [
+        # Pattern: LOCATION: 800 S Forest Ave (with direction)
+        r'LOCATION:\s*(\d+)\s*([NSEW])\s+([A-Za-z\s]+(?:St|Street|Ave|Avenue|Rd|Road|Blvd|Boulevard|Dr|Drive|Ln|Lane|Ct|Court|Pl|Place|Way|Cir|Circle))',
+        # Pattern: LOCATION: 1100 Prospect St (without direction)
+        r'LOCATION:\s*(\d+)\s+([A-Za-z\s]+(?:St|Street|Ave|Avenue|Rd|Road|Blvd|Boulevard|Dr|Drive|Ln|Lane|Ct|Court|Pl|Place|Way|Cir|Circle))',
+        # Pattern without colon: LOCATION800SForestAve
+        r'LOCATION(\d+)([NSEW])([A-Za-z]+(?:St|Street|Ave|Avenue|Rd|Road|Blvd|Boulevard|Dr|Drive|Ln|Lane|Ct|Court|Pl|Place|Way|Cir|Circle))',
+        # Pattern without colon and direction: LOCATION1100ProspectSt
+        r'LOCATION(\d+)([A-Za-z]+(?:St|Street|Ave|Avenue|Rd|Road|Blvd|Boulevard|Dr|Drive|Ln|Lane|Ct|Court|Pl|Place|Way|Cir|Circle))',
+    ]
+
+    for pattern in location_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            if len(match.groups()) == 3:
+                # Pattern with direction
+                number, direction, street = match.groups()
+                formatted_street = legacy_add_spaces(street.strip())
+                # Clean up the address - remove newlines and extra whitespace
+                address = f"{number} {direction} {formatted_street}"
+                address = re.sub(r'\s+', ' ', address).strip()
+                # Take only the first line (before any newline)
+                address = address.split('\n')[0].strip()
+                return address
+            elif len(match.groups()) == 2:
+                # Pattern without direction
+                number, street = match.groups()
+                formatted_street = legacy_add_spaces(street.strip())
+                # Clean up the address - remove newlines and extra whitespace
+                address = f"{number} {formatted_street}"
+                address = re.sub(r'\s+', ' ', address).strip()
+                # Take only the first line (before any newline)
+                address = address.split('\n')[0].strip()
+                return address
+
+    return None
+
+
+def legacy_add_spaces(text: str) -> str:
+    """Add spaces before capital letters for better readability"""
+    if not text:
+        return text
+
+    # Special handling for directional indicators (N, S, E, W)
+    directional_pattern = r'^([NSEW])([A-Z][a-z]+.*)$'
+    match = re.match(directional_pattern, text)
+    if match:
+        direction = match.group(1)
+        street_part = match.group(2)
+        formatted_street = legacy_add_spaces(street_part)
+        return f"{direction} {formatted_street}"
+
+    # Regular case: add space before capital letters
+    result = text[0]
+    for i in range(1, len(text)):
+        char = text[i]
+        if char.isupper() and text[i-1].islower():
+            result += ' ' + char
+        else:
+            result += char
+
+    return result
+
+
+# ---------------------------------------------------------------------------
+
+
+def load_texts(from_cache: bool) -> list:
+    texts = []
+    with open(CORPUS_PATH) as f:
+        for line in f:
+            if line.strip():
+                texts.append(json.loads(line)['text'])
+    if from_cache:
+        from ocr_cache import OcrResultCache
+        cache = OcrResultCache()
+        cached = ['\n'.join(l['text'] for l in lines) for _, lines, _ in cache.entries()]
+        cache.close()
+        print(f"{len(cached)} receipt(s) from the OCR cache")
+        texts.extend(cached)
+    return texts
+
+
+def run_once(texts: list, officer, address) -> float:
+    start = time.perf_counter()
+    for text in texts:
+        officer(text)
+        address(text)
+    return time.perf_counter() - start
+
+
+def report(label: str, count: int, elapsed: float, repeat: int) -> None:
+    print(f"{label:<10} {elapsed * 1000:8.1f} ms  ({count / elapsed:,.0f} receipts/s, best of {repeat})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark receipt field extraction')
+    parser.add_argument('--size', type=int, default=50000, help='Number of receipts to parse per run')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per parser; the fastest is reported')
+    parser.add_argument('--from-cache', action='store_true', help='Include real OCR output from the local OCR cache')
+    args = parser.parse_args()
+
+    texts = load_texts(args.from_cache)
+    mismatches = 0
+    for text in texts:
+        old = (legacy_officer(text), legacy_address(text))
+        new = (extract_officer_fields(text), extract_location(text))
+        if old != new:
+            mismatches += 1
+            print(f"MISMATCH for {text!r}:\n  legacy: {old}\n  engine: {new}")
+    print(f"{len(texts)} distinct text(s), {mismatches} mismatch(es)")
+
+    workload = [texts[i % len(texts)] for i in range(args.size)]
+    # Runs alternate between the parsers and the fastest of each is kept, so machine
+    # noise during one run does not decide the speedup
+    legacy = engine = float('inf')
+    for _ in range(args.repeat):
+        legacy = min(legacy, run_once(workload, legacy_officer, legacy_address))
+        engine = min(engine, run_once(workload, extract_officer_fields, extract_location))
+    report('legacy', len(workload), legacy, args.repeat)
+    report('engine', len(workload), engine, args.repeat)
+    print(f"speedup    {legacy / engine:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Receipt OCR benchmark: latency and field accuracy with and without OpenCV preprocessing.
+
+A fixture set is a directory of receipt images plus expected.json mapping each file
+name to its expected fields (location, officer_badge, officer_name, officer_beat).
+Build one from stored citations with --fetch; the expected values are then whatever is
+currently stored in the DB, so spot-check and hand-correct expected.json before relying
+on the accuracy numbers.
+
+Usage:
+    python bench_receipt_ocr.py --fetch 50                 # download 50 recent receipts as fixtures
+    python bench_receipt_ocr.py                            # benchmark both OCR paths
+    python bench_receipt_ocr.py --fixtures path/to/fixtures
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from dotenv import load_dotenv
+
+# Add src directory to Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from receipt_ocr import analyze_receipt_bytes
+from receipt_preprocess import preprocessing_available
+
+load_dotenv()
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(__file__), '.cache', 'receipt_fixtures')
+FIELDS = ('location', 'officer_badge', 'officer_name', 'officer_beat')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def fetch_fixtures(fixtures_dir: str, count: int) -> None:
+    """Download recent receipts and their stored fields into a fixture directory."""
+    from db_manager import DatabaseManager
+    from scraper import CitationScraper
+
+    db_manager = DatabaseManager({
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'database': os.getenv('DB_NAME', 'postgres'),
+        'user': os.getenv('DB_USER', 'postgres'),
+        'password': os.getenv('DB_PASSWORD', ''),
+        'port': os.getenv('DB_PORT', '5432'),
+    })
+    rows = (
+        db_manager.supabase
+        .table('citations')
+        .select('citation_number,image_urls,location,officer_badge,officer_name,officer_beat')
+        .not_.is_('image_urls', 'null')
+        .not_.is_('officer_badge', 'null')
+        .order('citation_number', desc=True)
+        .limit(count)
+        .execute()
+    ).data or []
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    expected_path = os.path.join(fixtures_dir, 'expected.json')
+    expected = {}
+    if os.path.exists(expected_path):
+        with open(expected_path) as f:
+            expected = json.load(f)
+
+    scraper = CitationScraper()
+    for row in rows:
+        name = f"{row['citation_number']}.jpg"
+        try:
+            image_bytes = scraper.download_receipt(row['image_urls'][-1])
+        except Exception as e:
+            print(f"skip {row['citation_number']}: {e}")
+            continue
+        with open(os.path.join(fixtures_dir, name), 'wb') as f:
+            f.write(image_bytes)
+        expected.setdefault(name, {field: row.get(field) for field in FIELDS})
+
+    with open(expected_path, 'w') as f:
+        json.dump(expected, f, indent=2, sort_keys=True)
+    print(f"Wrote {len(rows)} fixture(s) to {fixtures_dir}")
+
+
+def normalize(value) -> str:
+    return ' '.join(str(value).upper().split()) if value else ''
+
+
+def run(images, expected, preprocess: bool):
+    latencies = []
+    correct = {field: 0 for field in FIELDS}
+    labelled = {field: 0 for field in FIELDS}
+    for name, image_bytes in images:
+        start = time.perf_counter()
+        fields = analyze_receipt_bytes(image_bytes, preprocess=preprocess)
+        latencies.append((time.perf_counter() - start) * 1000)
+        for field in FIELDS:
+            want = normalize(expected.get(name, {}).get(field))
+            if not want:
+                continue
+            labelled[field] += 1
+            if normalize(fields.get(field)) == want:
+                correct[field] += 1
+    return latencies, correct, labelled
+
+
+def report(label, latencies, correct, labelled):
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"\n{label}")
+    print(f"  latency ms: mean {statistics.mean(latencies):.0f}, median {statistics.median(latencies):.0f}, p95 {p95:.0f}")
+    for field in FIELDS:
+        if labelled[field]:
+            print(f"  {field:<14} {correct[field]}/{labelled[field]} ({100.0 * correct[field] / labelled[field]:.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark receipt OCR with and without preprocessing')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES, help='Fixture directory (images + expected.json)')
+    parser.add_argument('--fetch', type=int, default=0, help='Download N recent receipts from the DB as fixtures first')
+    args = parser.parse_args()
+
+    if args.fetch:
+        fetch_fixtures(args.fixtures, args.fetch)
+
+    expected_path = os.path.join(args.fixtures, 'expected.json')
+    if not os.path.exists(expected_path):
+        sys.exit(f"No fixtures at {args.fixtures}; run with --fetch N first")
+    with open(expected_path) as f:
+        expected = json.load(f)
+
+    images = []
+    for name in sorted(os.listdir(args.fixtures)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            with open(os.path.join(args.fixtures, name), 'rb') as f:
+                images.append((name, f.read()))
+    if not images:
+        sys.exit(f"No receipt images in {args.fixtures}")
+
+    print(f"{len(images)} receipt(s) from {args.fixtures}")
+    report('Baseline (PIL crop + LANCZOS upscale)', *run(images, expected, preprocess=False))
+    if preprocessing_available():
+        report('Preprocessed (OpenCV threshold + deskew + text band)', *run(images, expected, preprocess=True))
+    else:
+        print("\nOpenCV/NumPy not installed (or RECEIPT_PREPROCESS=0); skipping the preprocessed run")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Build or refresh the local citation bitmap (.cache/citation_bitmap.bin).
+
+The scraper keeps this file up to date on its own; run this to seed it locally for the
+discovery scripts and backfills, or to inspect coverage and gaps in a range.
+
+Usage:
+    python build_citation_bitmap.py                       # sync incrementally (full build if missing)
+    python build_citation_bitmap.py --rebuild             # discard the file and rebuild from scratch
+    python build_citation_bitmap.py --gaps 10013000 10014000
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+from dotenv import load_dotenv
+
+# Add src directory to Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from db_manager import DatabaseManager
+from citation_bitmap import CitationBitmap, DEFAULT_BITMAP_PATH
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'database': os.getenv('DB_NAME', 'postgres'),
+    'user': os.getenv('DB_USER', 'postgres'),
+    'password': os.getenv('DB_PASSWORD', ''),
+    'port': os.getenv('DB_PORT', '5432'),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or refresh the local citation bitmap')
+    parser.add_argument('--path', default=os.getenv('CITATION_BITMAP_PATH', DEFAULT_BITMAP_PATH))
+    parser.add_argument('--rebuild', action='store_true', help='Ignore the existing file and rebuild')
+    parser.add_argument('--gaps', nargs=2, type=int, metavar=('START', 'END'),
+                        help='Print numbers missing from [START, END] after syncing')
+    args = parser.parse_args()
+
+    if args.rebuild and os.path.exists(args.path):
+        os.remove(args.path)
+
+    db_manager = DatabaseManager(DB_CONFIG)
+    bitmap = CitationBitmap.open(db_manager, args.path)
+    logger.info(f"{len(bitmap)} known citations, {os.path.getsize(args.path):,} bytes on disk at {args.path}")
+
+    if args.gaps:
+        start, end = args.gaps
+        gaps = bitmap.gaps(start, end)
+        print(f"{len(gaps)} of {end - start + 1} numbers in {start}-{end} are not stored:")
+        for n in gaps:
+            print(n)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Build or inspect the offline street index used by LocalGeocoder (.cache/street_index.json).
+
+The scraper rebuilds the index from stored citation coordinates (minus those the index
+answered itself) when it is older than STREET_INDEX_MAX_AGE_HOURS; run this to build it
+by hand, look addresses up, or measure how well interpolation reproduces known
+coordinates. --lookup and --evaluate only read the file, so they work fully offline once
+it exists.
+
+Usage:
+    python build_street_index.py                          # rebuild from the DB
+    python build_street_index.py --lookup "815 S Main St" # geocode from the saved index
+    python build_street_index.py --evaluate 2000          # leave-one-out error on 2000 known points
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+
+from dotenv import load_dotenv
+
+# Add src directory to Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from local_geocoder import DEFAULT_STREET_INDEX_PATH, LocalGeocoder, haversine_m
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'database': os.getenv('DB_NAME', 'postgres'),
+    'user': os.getenv('DB_USER', 'postgres'),
+    'password': os.getenv('DB_PASSWORD', ''),
+    'port': os.getenv('DB_PORT', '5432'),
+}
+
+
+def evaluate(index: LocalGeocoder, samples: int) -> None:
+    """Remove each sampled point, geocode its address from the rest and report the error."""
+    points = [(street, p) for street, pts in index.streets.items() for p in pts]
+    random.seed(0)
+    sample = random.sample(points, min(samples, len(points)))
+    errors = []
+    unanswered = 0
+    for street, point in sample:
+        number, lat, lon = point
+        remaining = [p for p in index.streets[street] if p != point]
+        held_out = LocalGeocoder({street: remaining})
+        result = held_out.geocode(f"{number} {street}")
+        if result is None:
+            unanswered += 1
+            continue
+        errors.append(haversine_m(lat, lon, result[0], result[1]))
+    print(f"{len(sample)} held-out address(es): {len(errors)} answered locally, {unanswered} left for Nominatim")
+    if errors:
+        errors.sort()
+        print(f"error m: median {statistics.median(errors):.0f}, p90 {errors[int(len(errors) * 0.9)]:.0f}, max {errors[-1]:.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or inspect the offline street index')
+    parser.add_argument('--path', default=os.getenv('STREET_INDEX_PATH', DEFAULT_STREET_INDEX_PATH))
+    parser.add_argument('--lookup', nargs='+', metavar='ADDRESS', help='Geocode addresses from the saved index')
+    parser.add_argument('--evaluate', type=int, metavar='N', help='Leave-one-out error on N known points')
+    args = parser.parse_args()
+
+    if args.lookup or args.evaluate:
+        index = LocalGeocoder.load(args.path)
+        if index is None:
+            sys.exit(f"No street index at {args.path}; run without arguments to build it")
+    else:
+        from db_manager import DatabaseManager
+        index = LocalGeocoder.from_db(DatabaseManager(DB_CONFIG))
+        index.save(args.path)
+        logger.info(f"{len(index)} point(s) on {len(index.streets)} street(s) written to {args.path}")
+
+    for address in args.lookup or []:
+        print(f"{address}: {index.geocode(address)}")
+    if args.evaluate:
+        evaluate(index, args.evaluate)
+
+
+if __name__ == '__main__':
+    main()
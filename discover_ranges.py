@@ -25,6 +25,8 @@ import sys
 # Add src directory to Python path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+from citation_bitmap import CitationBitmap
+
 # Output file for discovered ranges
 OUTPUT_FILE = "discovered_ranges.txt"
 
@@ -67,6 +69,13 @@ def is_in_known_range(citation_num: int) -> bool:
             return True
     return False
 
+# Citations already stored (local bitmap from build_citation_bitmap.py; empty if not built)
+STORED_CITATIONS = CitationBitmap.load()
+
+def has_stored_citations(start: int, end: int) -> bool:
+    """Check if any citation in [start, end) is already in the DB, per the local bitmap."""
+    return STORED_CITATIONS.any_in_range(start, end)
+
 def get_10k_ranges_to_check() -> list:
     """
     Generate list of 10k ranges to check.
@@ -76,7 +85,7 @@ def get_10k_ranges_to_check() -> list:
     - 2,000,000 to 3,000,000 (2M band, 10k increments)
     - 10,000,000 to 11,000,000 (10M band, 10k increments)
     
-    Skip ranges that are already known/tracked.
+    Skip ranges that are already known/tracked or already have stored citations.
     """
     ranges_to_check = []
     
@@ -88,7 +97,7 @@ def get_10k_ranges_to_check() -> list:
             if not (end <= known_start or start >= known_end):
                 overlaps = True
                 break
-        if not overlaps:
+        if not overlaps and not has_stored_citations(start, end):
             ranges_to_check.append((start, end))
     
     # 2M to 3M band
@@ -99,7 +108,7 @@ def get_10k_ranges_to_check() -> list:
             if not (end <= known_start or start >= known_end):
                 overlaps = True
                 break
-        if not overlaps:
+        if not overlaps and not has_stored_citations(start, end):
             ranges_to_check.append((start, end))
     
     # 10M to 11M band
@@ -110,7 +119,7 @@ def get_10k_ranges_to_check() -> list:
             if not (end <= known_start or start >= known_end):
                 overlaps = True
                 break
-        if not overlaps:
+        if not overlaps and not has_stored_citations(start, end):
             ranges_to_check.append((start, end))
     
     return ranges_to_check
@@ -0,0 +1,8 @@
+-- Migration: Index citations by created_at
+-- Run this in your Supabase SQL Editor or via psql
+-- CitationBitmap.sync reads only citations created since its last sync
+-- (iter_citation_numbers_since); without this index that is a full table scan.
+-- Keyset on citation_number would miss backfilled numbers below a band's maximum.
+
+CREATE INDEX IF NOT EXISTS idx_citations_created_at
+  ON public.citations (created_at);
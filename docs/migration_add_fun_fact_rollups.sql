@@ -0,0 +1,82 @@
+-- Migration: Add rollup tables behind /api/fun-facts
+-- Run this in your Supabase SQL Editor or via psql
+-- get_fun_facts reads these instead of paging every citation in the lookback window.
+-- batch_insert_citations and save_officer_info rebuild the UTC days they touch; the
+-- backfill below builds everything already stored and is safe to re-run.
+
+CREATE TABLE IF NOT EXISTS public.citation_rollup_buckets (
+  bucket_start   timestamp with time zone PRIMARY KEY,
+  citation_count integer NOT NULL,
+  amount_total   numeric(14,2) NOT NULL,
+  amount_count   integer NOT NULL,
+  max_amount     numeric(12,2)
+);
+
+CREATE TABLE IF NOT EXISTS public.citation_rollup_locations (
+  day            date NOT NULL,
+  location       text NOT NULL,
+  citation_count integer NOT NULL,
+  amount_total   numeric(14,2) NOT NULL,
+  amount_count   integer NOT NULL,
+  last_seen      timestamp with time zone NOT NULL,
+  PRIMARY KEY (day, location)
+);
+
+CREATE TABLE IF NOT EXISTS public.citation_rollup_plates (
+  day            date NOT NULL,
+  plate_state    text NOT NULL,
+  plate_number   text NOT NULL,
+  citation_count integer NOT NULL,
+  amount_total   numeric(14,2) NOT NULL,
+  last_seen      timestamp with time zone NOT NULL,
+  PRIMARY KEY (day, plate_state, plate_number)
+);
+
+CREATE TABLE IF NOT EXISTS public.citation_rollup_officers (
+  day            date NOT NULL,
+  officer_name   text NOT NULL,
+  citation_count integer NOT NULL,
+  amount_total   numeric(14,2) NOT NULL,
+  PRIMARY KEY (day, officer_name)
+);
+
+COMMENT ON TABLE public.citation_rollup_buckets IS '30-minute issue_date buckets (date_bin from 2000-01-01 UTC)';
+COMMENT ON COLUMN public.citation_rollup_locations.day IS 'UTC date of issue_date';
+
+-- Backfill from existing citations
+BEGIN;
+SELECT pg_advisory_xact_lock(hashtext('citation_rollups'));
+TRUNCATE public.citation_rollup_buckets, public.citation_rollup_locations,
+         public.citation_rollup_plates, public.citation_rollup_officers;
+
+CREATE TEMP TABLE rollup_source ON COMMIT DROP AS
+SELECT (issue_date AT TIME ZONE 'UTC')::date AS day, issue_date, btrim(location) AS location,
+       upper(btrim(plate_state)) AS plate_state, btrim(plate_number) AS plate_number,
+       amount_due, btrim(officer_name) AS officer_name
+FROM public.citations
+WHERE issue_date IS NOT NULL;
+
+INSERT INTO public.citation_rollup_buckets (bucket_start, citation_count, amount_total, amount_count, max_amount)
+SELECT date_bin('30 minutes', issue_date, timestamptz '2000-01-01'), count(*),
+       coalesce(sum(amount_due), 0), count(amount_due), max(amount_due)
+FROM rollup_source
+GROUP BY 1;
+
+INSERT INTO public.citation_rollup_locations (day, location, citation_count, amount_total, amount_count, last_seen)
+SELECT day, location, count(*), coalesce(sum(amount_due), 0), count(amount_due), max(issue_date)
+FROM rollup_source
+WHERE location <> ''
+GROUP BY day, location;
+
+INSERT INTO public.citation_rollup_plates (day, plate_state, plate_number, citation_count, amount_total, last_seen)
+SELECT day, plate_state, plate_number, count(*), coalesce(sum(amount_due), 0), max(issue_date)
+FROM rollup_source
+WHERE plate_state <> '' AND plate_number <> ''
+GROUP BY day, plate_state, plate_number;
+
+INSERT INTO public.citation_rollup_officers (day, officer_name, citation_count, amount_total)
+SELECT day, officer_name, count(*), coalesce(sum(amount_due), 0)
+FROM rollup_source
+WHERE officer_name <> ''
+GROUP BY day, officer_name;
+COMMIT;
@@ -0,0 +1,33 @@
+-- Migration: Add geocode_cache normalised address -> coordinates table
+-- Run this in your Supabase SQL Editor or via psql
+-- Replaces exact-text lookups of citations.location (unindexed) when reusing coordinates.
+
+CREATE TABLE IF NOT EXISTS public.geocode_cache (
+  address_key text PRIMARY KEY,
+  latitude    double precision,
+  longitude   double precision,
+  source      text NOT NULL,
+  confidence  real,
+  resolved    boolean NOT NULL,
+  updated_at  timestamp with time zone NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_geocode_cache_updated ON public.geocode_cache (updated_at DESC);
+
+COMMENT ON COLUMN public.geocode_cache.address_key IS 'Canonical upper-case address (address_canonicalizer.address_key); rows seeded below use a simpler key until geocode_key_report.py --rekey';
+COMMENT ON COLUMN public.geocode_cache.source IS 'Where the coordinates came from: citations, alias, nominatim';
+COMMENT ON COLUMN public.geocode_cache.resolved IS 'false = no geocoder could resolve the address (negative entry)';
+
+-- Seed from citations that are already geocoded, most common coordinates per address
+INSERT INTO public.geocode_cache (address_key, latitude, longitude, source, resolved, updated_at)
+SELECT DISTINCT ON (address_key) address_key, latitude, longitude, 'citations', true, now()
+FROM (
+  SELECT upper(btrim(regexp_replace(location, '\s+', ' ', 'g'))) AS address_key,
+         latitude, longitude, count(*) AS uses
+  FROM public.citations
+  WHERE location IS NOT NULL AND latitude IS NOT NULL AND longitude IS NOT NULL
+  GROUP BY 1, 2, 3
+) seeded
+WHERE address_key <> ''
+ORDER BY address_key, uses DESC
+ON CONFLICT (address_key) DO NOTHING;
@@ -0,0 +1,7 @@
+-- Migration: Index citations that still need coordinates
+-- Run this in your Supabase SQL Editor or via psql
+-- geocode_backfill.py pages through these rows by citation_number (keyset).
+
+CREATE INDEX IF NOT EXISTS idx_citations_missing_coords
+  ON public.citations (citation_number)
+  WHERE latitude IS NULL AND location IS NOT NULL;
@@ -0,0 +1,18 @@
+-- Migration: Add ocr_results receipt OCR cache
+-- Run this in your Supabase SQL Editor or via psql
+-- Optional: only used when OCR_CACHE_DB is enabled, so OCR output is shared between machines.
+
+CREATE TABLE IF NOT EXISTS public.ocr_results (
+  image_sha256   text NOT NULL,
+  config_version integer NOT NULL,
+  parser_version integer NOT NULL,
+  lines          jsonb NOT NULL,
+  fields         jsonb NOT NULL,
+  created_at     timestamp with time zone DEFAULT now(),
+  updated_at     timestamp with time zone DEFAULT now(),
+  PRIMARY KEY (image_sha256, config_version)
+);
+
+COMMENT ON COLUMN public.ocr_results.image_sha256 IS 'sha256 of the receipt image bytes';
+COMMENT ON COLUMN public.ocr_results.lines IS 'Tesseract lines with word boxes, as fractions of the image';
+COMMENT ON COLUMN public.ocr_results.fields IS 'Fields parsed from lines by receipt parser parser_version';
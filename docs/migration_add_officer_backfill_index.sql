@@ -0,0 +1,11 @@
+-- Migration: Index the officer-info backfill work queue
+-- Run this in your Supabase SQL Editor or via psql
+-- backfill_officer_info.py pages through citations without officer info by citation_number
+-- (keyset). Receipts OCR'd without finding anything keep officer_badge NULL but get
+-- officer_info_extracted_at set, which drops them out of this index.
+
+CREATE INDEX IF NOT EXISTS idx_citations_officer_backfill
+  ON public.citations (citation_number DESC)
+  WHERE officer_badge IS NULL AND officer_info_extracted_at IS NULL;
+
+COMMENT ON COLUMN public.citations.officer_info_extracted_at IS 'Timestamp when the receipt was OCR''d for officer info (set even when nothing was found)';
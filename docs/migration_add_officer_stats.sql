@@ -0,0 +1,35 @@
+-- Migration: Add officer_stats per-officer totals
+-- Run this in your Supabase SQL Editor or via psql
+-- get_officer_stats reads one row from here instead of fetching every image_urls array
+-- for the officer. batch_insert_citations and save_officer_info keep it current; the
+-- backfill below rebuilds it from citations and is safe to re-run; re-run it if
+-- batch_insert_citations ever logs that Postgres was unavailable for a Supabase fallback.
+
+CREATE TABLE IF NOT EXISTS public.officer_stats (
+  key_type        text NOT NULL CHECK (key_type IN ('badge', 'name')),
+  officer_key     text NOT NULL,
+  total_citations integer NOT NULL DEFAULT 0,
+  total_photos    integer NOT NULL DEFAULT 0,
+  total_revenue   numeric(14,2) NOT NULL DEFAULT 0,
+  first_seen      timestamp with time zone,
+  last_seen       timestamp with time zone,
+  updated_at      timestamp with time zone NOT NULL DEFAULT now(),
+  PRIMARY KEY (key_type, officer_key)
+);
+
+COMMENT ON COLUMN public.officer_stats.officer_key IS 'btrim(officer_badge) for key_type badge, btrim(officer_name) for key_type name';
+
+-- Backfill from existing citations
+BEGIN;
+SELECT pg_advisory_xact_lock(hashtext('officer_stats'));
+TRUNCATE public.officer_stats;
+
+INSERT INTO public.officer_stats (key_type, officer_key, total_citations, total_photos, total_revenue, first_seen, last_seen, updated_at)
+SELECT k.key_type, k.officer_key, count(*),
+       sum(CASE WHEN jsonb_typeof(c.image_urls) = 'array' THEN jsonb_array_length(c.image_urls) ELSE 0 END),
+       coalesce(sum(c.amount_due), 0), min(c.issue_date), max(c.issue_date), now()
+FROM public.citations c
+CROSS JOIN LATERAL (VALUES ('badge', btrim(c.officer_badge)), ('name', btrim(c.officer_name))) AS k(key_type, officer_key)
+WHERE k.officer_key <> ''
+GROUP BY k.key_type, k.officer_key;
+COMMIT;
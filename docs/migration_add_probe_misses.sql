@@ -0,0 +1,11 @@
+-- Migration: Add citation_probe_misses negative-result cache
+-- Run this in your Supabase SQL Editor or via psql
+-- The scraper backs off exponentially on numbers listed here, except near each range's frontier.
+
+CREATE TABLE IF NOT EXISTS public.citation_probe_misses (
+  citation_number bigint PRIMARY KEY,
+  miss_count      integer NOT NULL DEFAULT 1,
+  last_probed_at  timestamp with time zone NOT NULL DEFAULT now()
+);
+
+COMMENT ON COLUMN public.citation_probe_misses.miss_count IS 'Consecutive "No results found" responses; re-probe backoff doubles with each';
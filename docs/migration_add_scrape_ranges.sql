@@ -0,0 +1,34 @@
+-- Migration: Add scrape_ranges registry table
+-- Run this in your Supabase SQL Editor or via psql
+-- Adding a new citation band is a row insert; the scraper picks it up on its next run.
+
+CREATE TABLE IF NOT EXISTS public.scrape_ranges (
+  label             text PRIMARY KEY,
+  min_inclusive     bigint NOT NULL,
+  max_exclusive     bigint NOT NULL,
+  default_center    bigint,
+  frontier          bigint,
+  velocity_per_hour double precision,
+  enabled           boolean NOT NULL DEFAULT true,
+  last_run_at       timestamp with time zone,
+  updated_at        timestamp with time zone DEFAULT now()
+);
+
+-- Seed with the bands previously hardcoded in scraper_only.py
+INSERT INTO public.scrape_ranges (label, min_inclusive, max_exclusive, default_center) VALUES
+  ('AA',       10000000, 10020000, 10014000),
+  ('NC',        2080000,  2100000,  2081673),
+  ('Third',     1000000,  1020000,  1123108),
+  ('Fourth',    2000000,  2080000,  2025645),
+  ('Fifth',     1020000,  1030000,  1027117),
+  ('FifthB',    1030000,  1040000,  1035000),
+  ('Sixth',     1040000,  1050000,  1048162),
+  ('Seventh',   1070000,  1080000,  1072744),
+  ('Eighth',    1120000,  1130000,  1123252),
+  ('Ninth',    10910000, 10920000, 10913791),
+  ('Tenth',     2040000,  2060000,  2050000),
+  ('Eleventh', 10310000, 10320000, 10310223)
+ON CONFLICT (label) DO NOTHING;
+
+COMMENT ON COLUMN public.scrape_ranges.frontier IS 'Highest citation number seen in this band';
+COMMENT ON COLUMN public.scrape_ranges.velocity_per_hour IS 'Smoothed citations found per hour in this band';
@@ -44,6 +44,101 @@ insert into public.scraper_state (id, last_successful_citation, last_citation_se
 values (1, null, null, null)
 on conflict (id) do nothing;
 
+-- Registry of citation-number bands the scraper tracks (see migration_add_scrape_ranges.sql for seed rows)
+create table if not exists public.scrape_ranges (
+  label             text primary key,
+  min_inclusive     bigint not null,
+  max_exclusive     bigint not null,
+  default_center    bigint,
+  frontier          bigint,
+  velocity_per_hour double precision,
+  enabled           boolean not null default true,
+  last_run_at       timestamp with time zone,
+  updated_at        timestamp with time zone default now()
+);
+
+-- Citation numbers that returned "No results found", for exponential re-probe backoff
+create table if not exists public.citation_probe_misses (
+  citation_number bigint primary key,
+  miss_count      integer not null default 1,
+  last_probed_at  timestamp with time zone not null default now()
+);
+
+-- Content-addressed receipt OCR output (see src/ocr_cache.py)
+create table if not exists public.ocr_results (
+  image_sha256   text not null,
+  config_version integer not null,
+  parser_version integer not null,
+  lines          jsonb not null,
+  fields         jsonb not null,
+  created_at     timestamp with time zone default now(),
+  updated_at     timestamp with time zone default now(),
+  primary key (image_sha256, config_version)
+);
+
+-- Normalised address -> coordinates, including addresses that could not be geocoded (see src/geocode_cache.py)
+create table if not exists public.geocode_cache (
+  address_key text primary key,
+  latitude    double precision,
+  longitude   double precision,
+  source      text not null,
+  confidence  real,
+  resolved    boolean not null,
+  updated_at  timestamp with time zone not null default now()
+);
+
+-- Fun-facts rollups, rebuilt per UTC day of issue_date whenever citations on that day change
+-- (DatabaseManager._refresh_fun_fact_rollups; see migration_add_fun_fact_rollups.sql)
+create table if not exists public.citation_rollup_buckets (
+  bucket_start   timestamp with time zone primary key,
+  citation_count integer not null,
+  amount_total   numeric(14,2) not null,
+  amount_count   integer not null,
+  max_amount     numeric(12,2)
+);
+
+create table if not exists public.citation_rollup_locations (
+  day            date not null,
+  location       text not null,
+  citation_count integer not null,
+  amount_total   numeric(14,2) not null,
+  amount_count   integer not null,
+  last_seen      timestamp with time zone not null,
+  primary key (day, location)
+);
+
+create table if not exists public.citation_rollup_plates (
+  day            date not null,
+  plate_state    text not null,
+  plate_number   text not null,
+  citation_count integer not null,
+  amount_total   numeric(14,2) not null,
+  last_seen      timestamp with time zone not null,
+  primary key (day, plate_state, plate_number)
+);
+
+create table if not exists public.citation_rollup_officers (
+  day            date not null,
+  officer_name   text not null,
+  citation_count integer not null,
+  amount_total   numeric(14,2) not null,
+  primary key (day, officer_name)
+);
+
+-- Per-officer totals shown in the citation popup, keyed by badge and by name
+-- (maintained at ingest by DatabaseManager._apply_officer_stats_delta; see migration_add_officer_stats.sql)
+create table if not exists public.officer_stats (
+  key_type        text not null check (key_type in ('badge', 'name')),
+  officer_key     text not null,
+  total_citations integer not null default 0,
+  total_photos    integer not null default 0,
+  total_revenue   numeric(14,2) not null default 0,
+  first_seen      timestamp with time zone,
+  last_seen       timestamp with time zone,
+  updated_at      timestamp with time zone not null default now(),
+  primary key (key_type, officer_key)
+);
+
 -- Logs of search attempts
 create table if not exists public.scrape_logs (
   id             bigserial primary key,
@@ -80,6 +175,7 @@ create table if not exists public.citation_images (
 
 -- Helpful indexes
 create index if not exists idx_citations_issue_date on public.citations (issue_date);
+create index if not exists idx_citations_created_at on public.citations (created_at);
 create index if not exists idx_citations_plate on public.citations (plate_state, plate_number);
 create index if not exists idx_citations_location on public.citations (latitude, longitude);
 create index if not exists idx_citations_officer_badge on public.citations (officer_badge);
@@ -87,4 +183,7 @@ create index if not exists idx_citations_officer_name on public.citations (offic
 create index if not exists idx_citation_images_citation on public.citation_images (citation_number);
 create index if not exists idx_citation_images_b2_citation on public.citation_images_b2 (citation_number);
 create index if not exists idx_citation_images_b2_hash on public.citation_images_b2 (content_hash);
-create index if not exists idx_citation_images_b2_filename on public.citation_images_b2 (b2_filename);
\ No newline at end of file
+create index if not exists idx_citation_images_b2_filename on public.citation_images_b2 (b2_filename);
+create index if not exists idx_citations_officer_backfill on public.citations (citation_number desc) where officer_badge is null and officer_info_extracted_at is null;
+create index if not exists idx_geocode_cache_updated on public.geocode_cache (updated_at desc);
+create index if not exists idx_citations_missing_coords on public.citations (citation_number) where latitude is null and location is not null;
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Coordinate backfill: geocode every citation that has a location but no coordinates.
+
+Rows are streamed by citation_number keyset, each distinct location is resolved once
+(geocode cache -> nonstandard.md aliases -> local street index -> Nominatim) and results
+are written back one bulk UPDATE per page. Progress is checkpointed, so an interrupted run
+picks up where it stopped.
+
+Usage:
+    python geocode_backfill.py                              # all rows missing coordinates
+    python geocode_backfill.py --since 2025-11-12T15:20:04+00:00
+    python geocode_backfill.py --aliases-only               # only nonstandard.md locations
+    python geocode_backfill.py --regeocode                  # re-resolve every located row
+"""
+
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+# Add src directory to Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from db_manager import DatabaseManager
+from coord_backfill import DEFAULT_CHECKPOINT, run_geocode_backfill
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.getLogger('httpx').setLevel(logging.WARNING)
+logging.getLogger('httpcore').setLevel(logging.WARNING)
+
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'database': os.getenv('DB_NAME', 'postgres'),
+    'user': os.getenv('DB_USER', 'postgres'),
+    'password': os.getenv('DB_PASSWORD', ''),
+    'port': os.getenv('DB_PORT', '5432'),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bulk-geocode citations missing coordinates')
+    parser.add_argument('--since', type=datetime.fromisoformat, help='Only rows scraped at or after this ISO timestamp')
+    parser.add_argument('--aliases-only', action='store_true', help='Only locations listed in nonstandard.md')
+    parser.add_argument('--regeocode', action='store_true', help='Re-resolve rows that already have coordinates')
+    parser.add_argument('--batch-size', type=int, default=5000, help='Rows per page / UPDATE')
+    parser.add_argument('--dry-run', action='store_true', help='Resolve locations without writing coordinates')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT, help='Progress file used to resume an interrupted run')
+    parser.add_argument('--restart', action='store_true', help='Ignore any checkpoint and start from the beginning')
+    args = parser.parse_args(argv)
+
+    stats = run_geocode_backfill(
+        DatabaseManager(DB_CONFIG),
+        since=args.since,
+        aliases_only=args.aliases_only,
+        regeocode=args.regeocode,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+        checkpoint_path=args.checkpoint,
+        restart=args.restart,
+    )
+
+    print("\nGeocoding complete!")
+    print(f"  Rows scanned:       {stats['rows']}")
+    print(f"  Geocoded:           {stats['updated']}")
+    print(f"  Unresolved:         {stats['unresolved']}")
+    if args.aliases_only:
+        print(f"  Skipped (no alias): {stats['skipped']}")
+    print(f"  Distinct locations: {stats['distinct_locations']}")
+    print(f"  Nominatim requests: {stats['nominatim_requests']}")
+
+
+if __name__ == '__main__':
+    main()
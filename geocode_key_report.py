@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Measure how address canonicalisation affects geocode cache hit rates on our history.
+
+Replays every stored citation location in citation_number order against an empty cache
+and counts how many lookups would have been hits under three keys:
+  - exact:     the location text as stored (the old citations.location lookup)
+  - case:      upper-cased with whitespace collapsed
+  - canonical: address_canonicalizer.address_key (directionals, suffixes, OCR spacing, aliases)
+
+With --rekey, geocode_cache rows are also moved to their canonical keys, keeping the
+resolved entry when several old keys collapse into one.
+
+Usage:
+    python geocode_key_report.py [--top 20] [--rekey]
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter, defaultdict
+
+from dotenv import load_dotenv
+
+# Add src directory to Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from address_canonicalizer import address_key
+from db_manager import DatabaseManager
+
+load_dotenv()
+
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'database': os.getenv('DB_NAME', 'postgres'),
+    'user': os.getenv('DB_USER', 'postgres'),
+    'password': os.getenv('DB_PASSWORD', ''),
+    'port': os.getenv('DB_PORT', '5432'),
+}
+
+KEYS = {
+    'exact': lambda location: location,
+    'case': lambda location: ' '.join(location.split()).upper(),
+    'canonical': address_key,
+}
+
+
+def replay(locations):
+    """Return ({key name: hits}, total, {canonical key: Counter of spellings})."""
+    seen = {name: set() for name in KEYS}
+    hits = Counter()
+    spellings = defaultdict(Counter)
+    total = 0
+    for location in locations:
+        total += 1
+        for name, key_fn in KEYS.items():
+            key = key_fn(location)
+            if key in seen[name]:
+                hits[name] += 1
+            else:
+                seen[name].add(key)
+        spellings[address_key(location)][location] += 1
+    return hits, total, spellings
+
+
+def rekey(db_manager: DatabaseManager) -> None:
+    rows = db_manager.load_geocode_cache(limit=10_000_000)
+    merged = {}
+    stale = []
+    for row in rows:
+        key = address_key(row['address_key'])
+        if key != row['address_key']:
+            stale.append(row['address_key'])
+        current = merged.get(key)
+        # Prefer resolved entries, then the most recently updated (rows arrive newest first)
+        if current is None or (row['resolved'] and not current['resolved']):
+            merged[key] = row
+    moved = [
+        (key, row['latitude'], row['longitude'], row['source'], row['confidence'], row['resolved'])
+        for key, row in merged.items()
+    ]
+    db_manager.save_geocode_entries(moved)
+    db_manager.delete_geocode_entries([k for k in stale if k not in merged])
+    print(f"Re-keyed geocode_cache: {len(rows)} row(s) -> {len(merged)} canonical key(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Geocode cache hit rates by key normalisation')
+    parser.add_argument('--top', type=int, default=20, help='Show the canonical keys with the most spellings')
+    parser.add_argument('--rekey', action='store_true', help='Move geocode_cache rows to canonical keys')
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(DB_CONFIG)
+    hits, total, spellings = replay(db_manager.iter_citation_locations())
+    if not total:
+        sys.exit("No citation locations found")
+
+    print(f"{total} located citation(s)")
+    for name in KEYS:
+        distinct = total - hits[name]
+        print(f"  {name:<10} {distinct:>7} distinct key(s), hit rate {100.0 * hits[name] / total:.2f}%")
+    gained = hits['canonical'] - hits['exact']
+    print(f"Canonical keys save {gained} geocoder lookup(s) vs exact text ({100.0 * gained / total:.2f} points)")
+
+    merged = sorted(((k, c) for k, c in spellings.items() if len(c) > 1), key=lambda kc: -len(kc[1]))
+    if merged and args.top:
+        print(f"\nKeys with the most spellings ({len(merged)} merged in total):")
+        for key, counter in merged[:args.top]:
+            print(f"  {key}: " + ', '.join(f"{s!r} x{n}" for s, n in counter.most_common(5)))
+
+    if args.rekey:
+        rekey(db_manager)
+
+
+if __name__ == '__main__':
+    main()
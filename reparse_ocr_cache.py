@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Re-parse cached receipt OCR output with the current field parsers.
+
+Run after changing the parsers in src/receipt_ocr.py (and bumping RECEIPT_PARSER_VERSION):
+every cached receipt is re-parsed from its stored Tesseract lines, without running OCR.
+
+Usage:
+    python reparse_ocr_cache.py [--path .cache/ocr_results.sqlite3] [--share]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+
+# Add src directory to Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from ocr_cache import OcrResultCache, DEFAULT_OCR_CACHE_PATH
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-parse cached receipt OCR output')
+    parser.add_argument('--path', default=os.getenv('OCR_CACHE_PATH', DEFAULT_OCR_CACHE_PATH))
+    parser.add_argument('--share', action='store_true', help='Also push re-parsed fields to the ocr_results table')
+    args = parser.parse_args()
+
+    db_manager = None
+    if args.share:
+        from db_manager import DatabaseManager
+        db_manager = DatabaseManager({
+            'host': os.getenv('DB_HOST', 'localhost'),
+            'database': os.getenv('DB_NAME', 'postgres'),
+            'user': os.getenv('DB_USER', 'postgres'),
+            'password': os.getenv('DB_PASSWORD', ''),
+            'port': os.getenv('DB_PORT', '5432'),
+        })
+
+    cache = OcrResultCache(args.path, db_manager=db_manager)
+    start = time.perf_counter()
+    stats = cache.reparse()
+    elapsed = time.perf_counter() - start
+    cache.close()
+    logger.info(f"Re-parsed {stats['total']} cached receipt(s) in {elapsed:.2f}s; {stats['changed']} changed")
+
+
+if __name__ == '__main__':
+    main()
@@ -18,11 +18,19 @@ from dotenv import load_dotenv
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from db_manager import DatabaseManager
-from scraper import CitationScraper
+from async_scraper import AsyncCitationScraper
+from ingest_pipeline import IngestPipeline
+from range_registry import RangeRegistry, scan_settings_from_env
+from miss_cache import MissCache
+from citation_bitmap import CitationBitmap, DEFAULT_BITMAP_PATH
+from ocr_cache import ocr_cache_from_env
 from email_notifier import EmailNotifier
 from storage_factory import StorageFactory
 from geocoder import Geocoder
-from nonstandard import resolve_alias
+from geocode_cache import GeocodeCache
+from batch_geocoder import BatchGeocoder
+from local_geocoder import LocalGeocoder, DEFAULT_STREET_INDEX_PATH
+from location_index import LocationSubscriptionIndex
 from webhook_notifier import WebhookNotifier
 
 # Configure logging (configurable via LOG_LEVEL)
@@ -76,27 +84,37 @@ def write_github_actions_summary(title: str = "Parking Citation Scraper", body_l
         pass
 
 def ongoing_scraper_job():
-    """Run scraper job across multiple ranges with configurable ± range.
+    """Run scraper job across every range in the scrape_ranges registry.
 
     Ranges:
-      - AA (Ann Arbor): [10,000,000, 10,020,000) - auto-updates from DB max
-      - NC (North Campus): [2,080,000, 2,100,000) - auto-updates from DB max
-      - Third: [1,000,000, 1,020,000) - auto-updates from DB max
-      - Fourth: [2,000,000, 2,080,000) - auto-updates from DB max
-      - Fifth: Center 1,027,117 - uses 1.02M-1.03M window to find max, scrapes 50 in either direction
-      - FifthB: [1,030,000, 1,040,000) - auto-updates from DB max
-      - Sixth: Center 1,048,162 - uses 1.04M-1.05M window to find max, scrapes 50 in either direction
-      - Seventh: Center 1,072,744 - uses 1.07M-1.08M window to find max, scrapes 50 in either direction
-      - Eighth: Center 1,123,252 - uses 1.12M-1.13M window to find max, scrapes 50 in either direction
-      - Ninth: Center 10,913,791 - uses 10.91M-10.92M window to find max, scrapes 50 in either direction
-      - Tenth: [2,040,000, 2,060,000) - auto-updates from DB max
-      - Eleventh: Center 10,310,223 - uses 10.31M-10.32M window to find max, scrapes 50 in either direction
+      - Loaded from the scrape_ranges table (bounds, frontier, issuance velocity);
+        falls back to range_registry.DEFAULT_RANGES when the table is missing
+      - Each frontier auto-updates from the DB max inside the range's bounds
+      - Adding a range is a row insert (see docs/migration_add_scrape_ranges.sql)
+
+    Concurrency:
+      - All ranges are scanned at once through AsyncCitationScraper
+      - SCRAPER_CONCURRENCY caps in-flight portal requests (default 8)
+      - SCRAPER_MAX_RPS caps request starts per second across all workers (default 10)
 
     Range size:
-      - SCRAPE_RANGE_SIZE env var (defaults to 50 for all ranges)
-      - All ranges scrape 50 citations in either direction (100 total per range)
-      - New ranges use 10k windows (1.02M-1.03M, 1.04M-1.05M, 10.91M-10.92M, 10.31M-10.32M, etc.) to find max citation for center updates
-    
+      - ADAPTIVE_WINDOWS (default on): size each range's backward window and forward miss limit
+        from its issuance rate and portal lag (issue_date/scraped_at history), bounded by
+        ADAPTIVE_MIN_PROBES (default 5) and ADAPTIVE_MAX_PROBES (default 200)
+      - SCRAPE_RANGE_SIZE: numbers re-checked behind the frontier for ranges without history (default 50)
+      - FRONTIER_MISS_LIMIT: consecutive misses that end the forward scan without history (default 25)
+      - FRONTIER_MAX_FORWARD: hard cap on how far past the frontier one run may probe (default 500)
+      - Backward numbers that keep returning "No results found" are skipped on an exponential
+        backoff via the citation_probe_misses table (see miss_cache.MissCache)
+      - Numbers already stored are read from the cached CitationBitmap (CITATION_BITMAP_PATH,
+        default .cache/citation_bitmap.bin), synced incrementally from the DB each run
+      - Locations are geocoded through the geocode_cache table (preloaded once per run,
+        GEOCODE_CACHE_SIZE), which also remembers addresses Nominatim could not resolve
+      - New addresses on known streets are interpolated from stored coordinates (LocalGeocoder,
+        STREET_INDEX_PATH, rebuilt every STREET_INDEX_MAX_AGE_HOURS); Nominatim is the fallback
+      - Location subscriptions are loaded once per run into a LocationSubscriptionIndex and
+        matched per flushed batch, in memory
+
     Note: Range 1039342 (ends at 1039399) should be run locally once up to 1039400.
           This is a one-time historical backfill, not added as a recurring range.
     """
@@ -104,8 +122,8 @@ def ongoing_scraper_job():
     
     try:
         logger.info("Initializing components...")
-        scraper = CitationScraper()
-        logger.info("✓ CitationScraper initialized")
+        async_scraper = AsyncCitationScraper()
+        logger.info(f"✓ AsyncCitationScraper initialized ({async_scraper.max_concurrency_per_host} concurrent per host)")
         
         db_manager = DatabaseManager(DB_CONFIG)
         logger.info("✓ DatabaseManager initialized")
@@ -143,476 +161,308 @@ def ongoing_scraper_job():
     latest_citation_number = None
     latest_citation_seen_at = None
     
-    # Global batch buffer for citations to be inserted
-    citation_batch = []
-    
-    def flush_citation_batch() -> None:
-        """Flush all citations in the batch to the database"""
-        nonlocal citation_batch, errors
-        if not citation_batch:
-            return
-        
-        try:
-            batch_result = db_manager.batch_insert_citations(citation_batch)
-            if batch_result.get('failed_count', 0) > 0:
-                errors.extend(batch_result.get('errors', []))
-            logger.info(f"Batch inserted {batch_result.get('success_count', 0)} citations, {batch_result.get('failed_count', 0)} failed")
-        except Exception as e:
-            logger.error(f"Error flushing citation batch: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            # Add batch citations to errors
-            for citation in citation_batch:
-                errors.append(f"Failed to save citation {citation.get('citation_number', 'unknown')}: {e}")
-        finally:
-            citation_batch = []
-    
     try:
-        logger.info("Getting last successful citation...")
-        # Removed dependency on scraper_state table
-        last_citation = None 
-
-        # Determine dynamic bases from DB using leading-digit bands
-        # NC (starts with 2,080,000+): [2,080,000, 2,100,000)
-        nc_db_max = db_manager.get_max_citation_between(2_080_000, 2_100_000)
-        # AA (starts with 1): [10,000,000, 10,020,000)
-        aa_db_max = db_manager.get_max_citation_between(10_000_000, 10_020_000)
-        # Third range (starts with 1): [1,000,000, 1,020,000)
-        third_db_max = db_manager.get_max_citation_between(1_000_000, 1_020_000)
-        # Fourth range (starts from 2025645): [2,000,000, 2,080,000)
-        fourth_db_max = db_manager.get_max_citation_between(2_000_000, 2_080_000)
-        
-        # New range centers discovered from citation_hits.txt analysis
-        # These are separate ranges covering the 1M-2M band in 10k increments
-        # Each range uses a 10k window (based on million boundaries) to find max citation for center updates
-        # But scraping still uses the standard range_size (50) in either direction
-        fifth_db_max = db_manager.get_max_citation_between(1_020_000, 1_030_000)  # 1.02M to 1.03M
-        fifthb_db_max = db_manager.get_max_citation_between(1_030_000, 1_040_000)  # 1.03M to 1.04M
-        sixth_db_max = db_manager.get_max_citation_between(1_040_000, 1_050_000)  # 1.04M to 1.05M
-        seventh_db_max = db_manager.get_max_citation_between(1_070_000, 1_080_000)  # 1.07M to 1.08M
-        eighth_db_max = db_manager.get_max_citation_between(1_120_000, 1_130_000)  # 1.12M to 1.13M
-        # Ninth range: AA range split into 10k windows (10.91M-10.92M window)
-        ninth_db_max = db_manager.get_max_citation_between(10_910_000, 10_920_000)  # 10.91M to 10.92M
-        # Tenth range: [2,040,000, 2,060,000)
-        tenth_db_max = db_manager.get_max_citation_between(2_040_000, 2_060_000)
-        # Eleventh range: [10,310,000, 10,320,000)
-        eleventh_db_max = db_manager.get_max_citation_between(10_310_000, 10_320_000)  # 10.31M to 10.32M
-        
-        logger.info(f"NC DB max [2,080,000..2,100,000): {nc_db_max}")
-        logger.info(f"AA DB max [10,000,000..10,020,000): {aa_db_max}")
-        logger.info(f"Third range DB max [1,000,000..1,020,000): {third_db_max}")
-        logger.info(f"Fourth range DB max [2,000,000..2,080,000): {fourth_db_max}")
-        logger.info(f"Fifth range DB max [1,020,000..1,030,000): {fifth_db_max}")
-        logger.info(f"FifthB range DB max [1,030,000..1,040,000): {fifthb_db_max}")
-        logger.info(f"Sixth range DB max [1,040,000..1,050,000): {sixth_db_max}")
-        logger.info(f"Seventh range DB max [1,070,000..1,080,000): {seventh_db_max}")
-        logger.info(f"Eighth range DB max [1,120,000..1,130,000): {eighth_db_max}")
-        logger.info(f"Ninth range DB max [10,910,000..10,920,000): {ninth_db_max}")
-        logger.info(f"Tenth range DB max [2,040,000..2,060,000): {tenth_db_max}")
-        logger.info(f"Eleventh range DB max [10,310,000..10,320,000): {eleventh_db_max}")
-
-        # Configure range size from environment
-        # All ranges use the same scraping range size (50 in either direction = 100 total)
+        # Load the range registry, then fetch per-range maxima, existing numbers, issuance
+        # stats and cached misses in a single query
+        registry = RangeRegistry.load(db_manager)
+        settings = scan_settings_from_env()
+
+        # Known citation numbers come from the locally cached bitmap when it can be brought up to date
+        bitmap_path = os.getenv('CITATION_BITMAP_PATH', DEFAULT_BITMAP_PATH)
+        citation_bitmap = None
         try:
-            range_size = int(os.getenv('SCRAPE_RANGE_SIZE', '50'))
-        except ValueError:
-            range_size = 50
-
-        # Center ranges on DB maxima directly (no env seeds)
-        aa_center = aa_db_max if aa_db_max is not None else 10014000
-        nc_center = nc_db_max if nc_db_max is not None else 2081673
-        third_center = third_db_max if third_db_max is not None else 1123108
-        fourth_center = fourth_db_max if fourth_db_max is not None else 2025645
-        
-        # New range centers - use discovered centers if DB max found, otherwise use fixed centers
-        # The 10k window is only used to find the max; scraping uses standard range_size
-        fifth_center = fifth_db_max if fifth_db_max is not None else 1_027_117
-        fifthb_center = fifthb_db_max if fifthb_db_max is not None else 1_035_000
-        sixth_center = sixth_db_max if sixth_db_max is not None else 1_048_162
-        seventh_center = seventh_db_max if seventh_db_max is not None else 1_072_744
-        eighth_center = eighth_db_max if eighth_db_max is not None else 1_123_252
-        ninth_center = ninth_db_max if ninth_db_max is not None else 10_913_791
-        tenth_center = tenth_db_max if tenth_db_max is not None else 2_050_000
-        eleventh_center = eleventh_db_max if eleventh_db_max is not None else 10_310_223
-
-        # All ranges use the same scraping range size (50 in either direction)
-        aa_range = (aa_center - range_size, aa_center + range_size)
-        nc_range = (nc_center - range_size, nc_center + range_size)
-        third_range = (third_center - range_size, third_center + range_size)
-        fourth_range = (fourth_center - range_size, fourth_center + range_size)
-        fifth_range = (fifth_center - range_size, fifth_center + range_size)
-        fifthb_range = (fifthb_center - range_size, fifthb_center + range_size)
-        sixth_range = (sixth_center - range_size, sixth_center + range_size)
-        seventh_range = (seventh_center - range_size, seventh_center + range_size)
-        eighth_range = (eighth_center - range_size, eighth_center + range_size)
-        ninth_range = (ninth_center - range_size, ninth_center + range_size)
-        tenth_range = (tenth_center - range_size, tenth_center + range_size)
-        eleventh_range = (eleventh_center - range_size, eleventh_center + range_size)
-        
-        ranges = [aa_range, nc_range, third_range, fourth_range, fifth_range, fifthb_range, sixth_range, seventh_range, eighth_range, ninth_range, tenth_range, eleventh_range]
-
-        overall_start = min(start for start, _ in ranges)
-        overall_end = max(end for _, end in ranges)
-
-        logger.info(
-            f"Processing twelve ranges: "
-            f"AA[{aa_range[0]}..{aa_range[1]}], "
-            f"NC[{nc_range[0]}..{nc_range[1]}], "
-            f"Third[{third_range[0]}..{third_range[1]}], "
-            f"Fourth[{fourth_range[0]}..{fourth_range[1]}], "
-            f"Fifth[{fifth_range[0]}..{fifth_range[1]}], "
-            f"FifthB[{fifthb_range[0]}..{fifthb_range[1]}], "
-            f"Sixth[{sixth_range[0]}..{sixth_range[1]}], "
-            f"Seventh[{seventh_range[0]}..{seventh_range[1]}], "
-            f"Eighth[{eighth_range[0]}..{eighth_range[1]}], "
-            f"Ninth[{ninth_range[0]}..{ninth_range[1]}], "
-            f"Tenth[{tenth_range[0]}..{tenth_range[1]}], "
-            f"Eleventh[{eleventh_range[0]}..{eleventh_range[1]}] "
-            f"(overall {overall_start}..{overall_end})"
+            citation_bitmap = CitationBitmap.open(db_manager, bitmap_path)
+        except Exception as e:
+            logger.warning(f"Citation bitmap unavailable, using DB lookups for existing numbers: {e}")
+
+        snapshot = db_manager.get_range_snapshot(
+            [(r.label, r.min_inclusive, r.max_exclusive, r.center()) for r in registry.ranges],
+            behind=max(settings['back_window'], settings['max_probes']),
+            ahead=settings['max_forward'],
+            lookback_days=settings['stats_lookback_days'],
+            include_existing=citation_bitmap is None,
         )
+        if snapshot:
+            maxima = {label: snap['max'] for label, snap in snapshot.items()}
+            if settings['adaptive']:
+                registry.apply_issuance_stats({label: snap['stats'] for label, snap in snapshot.items()})
+        else:
+            logger.warning("Range snapshot unavailable; falling back to per-range lookups")
+            maxima = {}
+            for r in registry.ranges:
+                maxima[r.label] = db_manager.get_max_citation_between(r.min_inclusive, r.max_exclusive)
+            if settings['adaptive']:
+                registry.apply_issuance_stats(db_manager.get_range_issuance_stats(
+                    [(r.label, r.min_inclusive, r.max_exclusive) for r in registry.ranges],
+                    lookback_days=settings['stats_lookback_days'],
+                ))
+
+        # Move each frontier up to the DB max inside its band, then size each range's window
+        registry.update_frontiers(maxima)
+        scans = registry.plan(settings)
+
+        for r in registry.ranges:
+            scan = scans[r.label]
+            rate = f"{r.expected_rate():.1f}/h" if r.rate_per_hour is not None else "n/a"
+            logger.info(
+                f"{r.label} [{r.min_inclusive:,}..{r.max_exclusive:,}): DB max {maxima.get(r.label)}, "
+                f"rate {rate}, frontier {scan.center}, scanning {scan.back_start}..{scan.center} then forward until "
+                f"{scan.miss_limit} consecutive misses (cap {scan.forward_cap})"
+            )
 
         # Add a GitHub Actions title and initial summary
         write_github_actions_summary(
             body_lines=[
-                f"AA range: {aa_range[0]}..{aa_range[1]}",
-                f"NC range: {nc_range[0]}..{nc_range[1]}",
-                f"Third range: {third_range[0]}..{third_range[1]}",
-                f"Fourth range: {fourth_range[0]}..{fourth_range[1]}",
-                f"Fifth range: {fifth_range[0]}..{fifth_range[1]}",
-                f"FifthB range: {fifthb_range[0]}..{fifthb_range[1]}",
-                f"Sixth range: {sixth_range[0]}..{sixth_range[1]}",
-                f"Seventh range: {seventh_range[0]}..{seventh_range[1]}",
-                f"Eighth range: {eighth_range[0]}..{eighth_range[1]}",
-                f"Ninth range: {ninth_range[0]}..{ninth_range[1]}",
-                f"Tenth range: {tenth_range[0]}..{tenth_range[1]}",
-                f"Eleventh range: {eleventh_range[0]}..{eleventh_range[1]}",
-                f"Overall: {overall_start}..{overall_end}",
+                f"{r.label} range: {scans[r.label].back_start}..{scans[r.label].center} (+frontier scan)"
+                for r in registry.ranges
             ]
         )
 
-        def process_range(label: str, start_range: int, end_range: int, update_last_successful: bool) -> None:
-            nonlocal last_citation, total_processed, images_uploaded, skipped_existing, aa_db_max, nc_db_max, third_db_max, fourth_db_max, fifth_db_max, fifthb_db_max, sixth_db_max, seventh_db_max, eighth_db_max, ninth_db_max, tenth_db_max, eleventh_db_max, citation_batch, latest_citation_number, latest_citation_seen_at
-            logger.info(f"Fetching existing citations for {label} range {start_range}-{end_range}...")
-            existing_citations = db_manager.get_existing_citation_numbers_in_range(start_range, end_range)
-            logger.info(f"Found {len(existing_citations)} existing citations in {label} range. Will skip these.")
-            if existing_citations:
-                # Log a small sample to confirm values are as expected
-                sample = sorted(list(existing_citations))[:10]
-                logger.debug(f"Sample existing citations in {label}: {sample}")
-
-            total_in_range = (end_range - start_range) + 1
-            for idx, citation_num in enumerate(range(start_range, end_range + 1), start=1):
-                # Skip if citation already exists in database
-                if citation_num in existing_citations:
-                    logger.debug(f"Skipping citation {citation_num} - already exists in database")
-                    skipped_existing += 1
-                    # No network request made here, so do not sleep
-                    if idx % 25 == 0:
-                        logger.info(f"[{label}] Progress: {idx}/{total_in_range} in range; skipped so far: {skipped_existing}")
-                    continue
+        # Known addresses (and known failures) are geocoded from memory for the whole run
+        geocode_cache = GeocodeCache(db_manager)
+        geocode_cache.preload()
+        # New addresses on streets we have seen are interpolated locally instead of asking Nominatim
+        street_index_path = os.getenv('STREET_INDEX_PATH', DEFAULT_STREET_INDEX_PATH)
+        local_geocoder = LocalGeocoder.open(db_manager, street_index_path)
+        if local_geocoder is not None:
+            logger.info(f"Street index: {len(local_geocoder)} point(s) on {len(local_geocoder.streets)} street(s)")
+        # Every distinct location is resolved once per run, however many citations share it
+        batch_geocoder = BatchGeocoder(geocode_cache, geocoder, local_geocoder)
+
+        # Location subscriptions are loaded once per run and matched in memory
+        location_index = LocationSubscriptionIndex.from_db(db_manager)
+        logger.info(f"Location subscription index: {len(location_index)} active subscription(s)")
+
+        # Numbers that keep missing away from the frontier are re-probed on an exponential backoff
+        if snapshot:
+            cached_misses = {}
+            for snap in snapshot.values():
+                cached_misses.update(snap['misses'])
+            miss_cache = MissCache(cached_misses)
+        else:
+            miss_cache = MissCache.load(db_manager, [(scan.back_start, scan.forward_cap) for scan in scans.values()])
+
+        def collect_jobs(label: str, scan) -> list:
+            """Return initial (label, citation_number) jobs for a range, skipping numbers already in the DB."""
+            nonlocal skipped_existing
+            if citation_bitmap is not None:
+                existing_citations = set(citation_bitmap.members(scan.back_start, scan.center))
+            elif label in snapshot:
+                existing_citations = {n for n in snapshot[label]['existing'] if scan.back_start <= n <= scan.center}
+            else:
+                existing_citations = db_manager.get_existing_citation_numbers_in_range(scan.back_start, scan.center)
+            logger.info(f"{label}: {len(existing_citations)} existing citations in {scan.back_start}-{scan.center} will be skipped")
+            skipped_existing += len(existing_citations)
+            return [(label, n) for n in scan.initial_numbers(existing_citations, miss_cache.should_probe)]
+
+        def on_probe(label: str, citation_num: int, found: bool) -> list:
+            """Count every portal probe and advance the range frontier; runs on the event loop thread."""
+            nonlocal total_processed
+            total_processed += 1
+            miss_cache.record(citation_num, found)
+            return registry.on_probe(label, citation_num, found)
+
+        def on_probe_error(label: str, citation_num: int) -> list:
+            """A failed search is neither a miss nor a hit; keep it out of the frontier's miss count."""
+            errors.append(f"Search failed for citation {citation_num}")
+            return registry.on_probe_error(label, citation_num)
+
+        def geocode_result(result: dict) -> None:
+            """Geocode a found citation BEFORE insert so coordinates are included in the insert."""
+            citation_num = result.get('citation_number')
+            if result.get('location'):
+                try:
+                    coords = batch_geocoder.resolve(result['location'])
+                    if coords:
+                        lat, lon = coords
+                        result['latitude'] = lat
+                        result['longitude'] = lon
+                        result['geocoded_at'] = datetime.now(timezone.utc).isoformat()
+                        logger.debug(f"✓ Geocoded citation {citation_num} -> ({lat}, {lon})")
+                except Exception as e:
+                    logger.warning(f"Failed to geocode citation {citation_num}: {e}")
 
+        def on_citation(label: str, result: dict) -> None:
+            """Record a found citation and notify subscribers; runs in the pipeline's writer stage."""
+            nonlocal images_uploaded, latest_citation_number, latest_citation_seen_at
+            citation_num = int(result.get('citation_number'))
+            try:
+                successful_citations.append(result)
+                try:
+                    citation_value = int(result.get('citation_number'))
+                    if latest_citation_number is None or citation_value > latest_citation_number:
+                        latest_citation_number = citation_value
+                except (TypeError, ValueError):
+                    pass
+                latest_citation_seen_at = datetime.now(timezone.utc)
+
+                # Notify subscribers for matching plate
                 try:
-                    logger.debug(f"Processing citation {citation_num}...")
-                    result = scraper.search_citation(str(citation_num))
-                    total_processed += 1
-
-                    if result:
-                        logger.debug(f"Found citation {citation_num}, adding to batch...")
-                        
-                        # Geocode address BEFORE adding to batch so coordinates are included in the insert
-                        # This fixes the issue where geocoding tried to update citations that didn't exist yet
-                        if result.get('location'):
-                            location_str = result['location']
-                            try:
-                                # 1) DB cache: reuse coords if location was already geocoded before
-                                cached = db_manager.get_cached_coords_for_location(location_str)
-                                if cached:
-                                    lat, lon = cached
-                                    result['latitude'] = lat
-                                    result['longitude'] = lon
-                                    result['geocoded_at'] = datetime.now(timezone.utc).isoformat()
-                                    logger.debug(f"✓ Reused cached coords for {citation_num} -> ({lat}, {lon})")
-                                else:
-                                    # 2) Nonstandard alias mapping: coords or mapped address
-                                    mapped_address, coords = resolve_alias(location_str)
-                                    if coords:
-                                        lat, lon = coords
-                                        result['latitude'] = lat
-                                        result['longitude'] = lon
-                                        result['geocoded_at'] = datetime.now(timezone.utc).isoformat()
-                                        logger.debug(f"✓ Applied nonstandard coords for {citation_num} -> ({lat}, {lon})")
-                                    elif mapped_address:
-                                        # Geocode the mapped address
-                                        geocoded_coords = geocoder.geocode_address(mapped_address)
-                                        if geocoded_coords:
-                                            lat, lon = geocoded_coords
-                                            result['latitude'] = lat
-                                            result['longitude'] = lon
-                                            result['geocoded_at'] = datetime.now(timezone.utc).isoformat()
-                                            logger.debug(f"✓ Geocoded via nonstandard mapping for {citation_num} -> '{mapped_address}'")
-                                    else:
-                                        # 3) Fallback: geocode the raw location string
-                                        geocoded_coords = geocoder.geocode_address(location_str)
-                                        if geocoded_coords:
-                                            lat, lon = geocoded_coords
-                                            result['latitude'] = lat
-                                            result['longitude'] = lon
-                                            result['geocoded_at'] = datetime.now(timezone.utc).isoformat()
-                                            logger.debug(f"✓ Geocoded citation {citation_num}")
-                            except Exception as e:
-                                logger.warning(f"Failed to geocode citation {citation_num}: {e}")
-                        
-                        # Add to batch - will be inserted all at once per range (with coordinates if geocoded)
-                        citation_batch.append(result)
-                        successful_citations.append(result)
-                        try:
-                            citation_value = int(result.get('citation_number'))
-                            if latest_citation_number is None or citation_value > latest_citation_number:
-                                latest_citation_number = citation_value
-                        except (TypeError, ValueError):
-                            pass
-                        latest_citation_seen_at = datetime.now(timezone.utc)
-
-                        # Notify subscribers for matching plate
-                        try:
-                            subs = db_manager.find_active_subscriptions_for_plate(
-                                result.get('plate_state', ''),
-                                result.get('plate_number', '')
+                    subs = db_manager.find_active_subscriptions_for_plate(
+                        result.get('plate_state', ''),
+                        result.get('plate_number', '')
+                    )
+                    if subs:
+                        logger.info(f"Found {len(subs)} subscriber(s) for {result.get('plate_state')} {result.get('plate_number')}")
+                    for sub in subs:
+                        if sub.get('email'):
+                            email_notifier.send_ticket_alert(
+                                sub['email'],
+                                result,
+                                context={
+                                    'type': 'plate',
+                                    'plate_state': result.get('plate_state'),
+                                    'plate_number': result.get('plate_number'),
+                                },
                             )
-                            if subs:
-                                logger.info(f"Found {len(subs)} subscriber(s) for {result.get('plate_state')} {result.get('plate_number')}")
-                            for sub in subs:
-                                if sub.get('email'):
-                                    email_notifier.send_ticket_alert(
-                                        sub['email'],
-                                        result,
-                                        context={
-                                            'type': 'plate',
-                                            'plate_state': result.get('plate_state'),
-                                            'plate_number': result.get('plate_number'),
-                                        },
-                                    )
-                                if sub.get('webhook_url'):
-                                    webhook_notifier.send_ticket_alert(sub['webhook_url'], result)
-                        except Exception as e:
-                            logger.error(f"Failed notifying subscribers for {citation_num}: {e}")
-
-                        # Notify subscribers for matching location
-                        try:
-                            if result.get('latitude') and result.get('longitude'):
-                                lat = float(result.get('latitude'))
-                                lon = float(result.get('longitude'))
-                                loc_subs = db_manager.find_active_location_subscriptions_for_point(lat, lon)
-                                if loc_subs:
-                                    logger.info(f"Found {len(loc_subs)} location subscriber(s) for citation {citation_num}")
-                                for sub in loc_subs:
-                                    if sub.get('email'):
-                                        email_notifier.send_ticket_alert(
-                                            sub['email'],
-                                            result,
-                                            context={
-                                                'type': 'location',
-                                                'center_lat': sub.get('center_lat'),
-                                                'center_lon': sub.get('center_lon'),
-                                                'radius_m': sub.get('radius_m'),
-                                            },
-                                        )
-                        except Exception as e:
-                            logger.error(f"Failed notifying location subscribers for {citation_num}: {e}")
-
-                        # Upload images to cloud storage if available
-                        # TEMPORARILY COMMENTED OUT - Cloudflare image saving disabled
-                        # if result.get('image_urls') and cloud_storage and cloud_storage.is_configured():
-                        #     try:
-                        #         logger.debug(f"Uploading images for citation {citation_num}...")
-                        #         uploaded_images = cloud_storage.upload_images_for_citation(
-                        #             result['image_urls'],
-                        #             citation_num
-                        #         )
-
-                        #         # Save cloud storage image metadata to database
-                        #         for image_data in uploaded_images:
-                        #             image_data['original_url'] = result['image_urls'][uploaded_images.index(image_data)]
-                        #             db_manager.save_b2_image(citation_num, image_data)
-                        #             images_uploaded += 1
-
-                        #         logger.info(f"Uploaded {len(uploaded_images)} images for citation {citation_num}")
-
-                        #     except Exception as e:
-                        #         logger.error(f"Failed to upload images for citation {citation_num}: {e}")
-                        #         logger.error(f"Traceback: {traceback.format_exc()}")
-
-                        # Update range bases in-memory during processing (optimization for current run)
-                        # All ranges auto-derive from DB at start of next run; this is just for efficiency
-                        if label == "AA" and 10_000_000 <= citation_num < 10_020_000:
-                            if aa_db_max is None or citation_num > aa_db_max:
-                                aa_db_max = citation_num
-                        elif label == "NC" and 2_080_000 <= citation_num < 2_100_000:
-                            if nc_db_max is None or citation_num > nc_db_max:
-                                nc_db_max = citation_num
-                        elif label == "Third" and 1_000_000 <= citation_num < 1_020_000:
-                            if third_db_max is None or citation_num > third_db_max:
-                                third_db_max = citation_num
-                        elif label == "Fourth" and 2_000_000 <= citation_num < 2_080_000:
-                            if fourth_db_max is None or citation_num > fourth_db_max:
-                                fourth_db_max = citation_num
-                        elif label == "Fifth" and 1_020_000 <= citation_num < 1_030_000:
-                            if fifth_db_max is None or citation_num > fifth_db_max:
-                                fifth_db_max = citation_num
-                        elif label == "FifthB" and 1_030_000 <= citation_num < 1_040_000:
-                            if fifthb_db_max is None or citation_num > fifthb_db_max:
-                                fifthb_db_max = citation_num
-                        elif label == "Sixth" and 1_040_000 <= citation_num < 1_050_000:
-                            if sixth_db_max is None or citation_num > sixth_db_max:
-                                sixth_db_max = citation_num
-                        elif label == "Seventh" and 1_070_000 <= citation_num < 1_080_000:
-                            if seventh_db_max is None or citation_num > seventh_db_max:
-                                seventh_db_max = citation_num
-                        elif label == "Eighth" and 1_120_000 <= citation_num < 1_130_000:
-                            if eighth_db_max is None or citation_num > eighth_db_max:
-                                eighth_db_max = citation_num
-                        elif label == "Ninth" and 10_910_000 <= citation_num < 10_920_000:
-                            if ninth_db_max is None or citation_num > ninth_db_max:
-                                ninth_db_max = citation_num
-                        elif label == "Tenth" and 2_040_000 <= citation_num < 2_060_000:
-                            if tenth_db_max is None or citation_num > tenth_db_max:
-                                tenth_db_max = citation_num
-                        elif label == "Eleventh" and 10_310_000 <= citation_num < 10_320_000:
-                            if eleventh_db_max is None or citation_num > eleventh_db_max:
-                                eleventh_db_max = citation_num
-
-                        logger.info(f"✓ [{label}] Found citation {citation_num} (added to batch)")
-                    else:
-                        logger.debug(f"[{label}] No results for citation {citation_num}")
-
+                        if sub.get('webhook_url'):
+                            webhook_notifier.send_ticket_alert(sub['webhook_url'], result)
                 except Exception as e:
-                    error_msg = f"Error processing citation {citation_num}: {str(e)}"
-                    logger.error(error_msg)
-                    logger.error(f"Traceback: {traceback.format_exc()}")
-                    errors.append(error_msg)
-
-                # Minimal delay between requests (only after we made a request)
-                time.sleep(0.01)
-            
-            # Flush all citations collected for this range
-            if citation_batch:
-                logger.info(f"Flushing {len(citation_batch)} citations for {label} range...")
-                flush_citation_batch()
-                
-                # Post-batch geocoding: geocode any citations that failed to geocode during initial pass
-                # This handles cases where geocoding failed or was skipped
-                logger.info(f"Post-batch geocoding for {label} range...")
-                for citation in citation_batch:
-                    citation_num = citation.get('citation_number')
-                    location_str = citation.get('location')
-                    # Only geocode if we have a location but no coordinates
-                    if location_str and not citation.get('latitude') and not citation.get('longitude'):
-                        try:
-                            # Try cached coords first
-                            cached = db_manager.get_cached_coords_for_location(location_str)
-                            if cached:
-                                lat, lon = cached
-                                db_manager.supabase.table('citations').update({
-                                    'latitude': lat,
-                                    'longitude': lon,
-                                    'geocoded_at': 'now()'
-                                }).eq('citation_number', citation_num).execute()
-                                logger.debug(f"✓ Post-batch: Reused cached coords for {citation_num}")
-                                continue
-                            
-                            # Try nonstandard alias
-                            mapped_address, coords = resolve_alias(location_str)
-                            if coords:
-                                lat, lon = coords
-                                db_manager.supabase.table('citations').update({
-                                    'latitude': lat,
-                                    'longitude': lon,
-                                    'geocoded_at': 'now()'
-                                }).eq('citation_number', citation_num).execute()
-                                logger.debug(f"✓ Post-batch: Applied nonstandard coords for {citation_num}")
-                                continue
-                            
-                            # Geocode the address
-                            if mapped_address:
-                                geocoder.geocode_and_update_citation(db_manager, citation_num, mapped_address)
-                            else:
-                                geocoder.geocode_and_update_citation(db_manager, citation_num, location_str)
-                            logger.debug(f"✓ Post-batch: Geocoded citation {citation_num}")
-                        except Exception as e:
-                            logger.warning(f"Post-batch geocoding failed for citation {citation_num}: {e}")
-
-        # Explicitly run all ranges sequentially, isolating failures
-        try:
-            process_range("AA", aa_range[0], aa_range[1], update_last_successful=False)
-        except Exception as e:
-            logger.error(f"AA range processing failed: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-
-        try:
-            process_range("NC", nc_range[0], nc_range[1], update_last_successful=False)
-        except Exception as e:
-            logger.error(f"NC range processing failed: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-
-        try:
-            process_range("Third", third_range[0], third_range[1], update_last_successful=False)
-        except Exception as e:
-            logger.error(f"Third range processing failed: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-
-        try:
-            process_range("Fourth", fourth_range[0], fourth_range[1], update_last_successful=False)
-        except Exception as e:
-            logger.error(f"Fourth range processing failed: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-
-        try:
-            process_range("Fifth", fifth_range[0], fifth_range[1], update_last_successful=False)
-        except Exception as e:
-            logger.error(f"Fifth range processing failed: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-
-        try:
-            process_range("FifthB", fifthb_range[0], fifthb_range[1], update_last_successful=False)
-        except Exception as e:
-            logger.error(f"FifthB range processing failed: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
+                    logger.error(f"Failed notifying subscribers for {citation_num}: {e}")
+
+                # Upload images to cloud storage if available
+                # TEMPORARILY COMMENTED OUT - Cloudflare image saving disabled
+                # if result.get('image_urls') and cloud_storage and cloud_storage.is_configured():
+                #     try:
+                #         logger.debug(f"Uploading images for citation {citation_num}...")
+                #         uploaded_images = cloud_storage.upload_images_for_citation(
+                #             result['image_urls'],
+                #             citation_num
+                #         )
+
+                #         # Save cloud storage image metadata to database
+                #         for image_data in uploaded_images:
+                #             image_data['original_url'] = result['image_urls'][uploaded_images.index(image_data)]
+                #             db_manager.save_b2_image(citation_num, image_data)
+                #             images_uploaded += 1
+
+                #         logger.info(f"Uploaded {len(uploaded_images)} images for citation {citation_num}")
+
+                #     except Exception as e:
+                #         logger.error(f"Failed to upload images for citation {citation_num}: {e}")
+                #         logger.error(f"Traceback: {traceback.format_exc()}")
+
+                logger.info(f"✓ [{label}] Found citation {citation_num} (queued for insert)")
+            except Exception as e:
+                error_msg = f"Error processing citation {citation_num}: {str(e)}"
+                logger.error(error_msg)
+                logger.error(f"Traceback: {traceback.format_exc()}")
+                errors.append(error_msg)
 
-        try:
-            process_range("Sixth", sixth_range[0], sixth_range[1], update_last_successful=False)
-        except Exception as e:
-            logger.error(f"Sixth range processing failed: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
+        def post_batch_geocode(citations: list) -> None:
+            """Geocode flushed citations still missing coordinates: one lookup per distinct location, one UPDATE."""
+            leftovers = [
+                c for c in citations
+                if c.get('location') and not c.get('latitude') and not c.get('longitude')
+            ]
+            if not leftovers:
+                return
+            try:
+                # Locations already resolved (or known to fail) this run come back without a request
+                coords_by_location = batch_geocoder.resolve_many(c['location'] for c in leftovers)
+                rows = []
+                for c in leftovers:
+                    coords = coords_by_location.get(c['location'])
+                    if coords:
+                        # Kept on the dict too, so location subscribers are matched against it
+                        c['latitude'], c['longitude'] = coords
+                        rows.append((c['citation_number'], *coords))
+                if rows:
+                    db_manager.update_citation_coords(rows)
+                    logger.info(f"Post-batch: geocoded {len(rows)} of {len(leftovers)} citation(s) missing coordinates")
+            except Exception as e:
+                logger.warning(f"Post-batch geocoding failed: {e}")
 
-        try:
-            process_range("Seventh", seventh_range[0], seventh_range[1], update_last_successful=False)
-        except Exception as e:
-            logger.error(f"Seventh range processing failed: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
+        def notify_location_subscribers(citations: list) -> None:
+            """Alert location subscribers about a batch of citations, matched in one pass against the run's index."""
+            located = [c for c in citations if c.get('latitude') and c.get('longitude')]
+            if not located or not len(location_index):
+                return
+            try:
+                matches = location_index.match_many((float(c['latitude']), float(c['longitude'])) for c in located)
+            except Exception as e:
+                logger.error(f"Failed matching location subscriptions: {e}")
+                return
+            for citation, loc_subs in zip(located, matches):
+                if not loc_subs:
+                    continue
+                citation_num = citation.get('citation_number')
+                logger.info(f"Found {len(loc_subs)} location subscriber(s) for citation {citation_num}")
+                try:
+                    for sub in loc_subs:
+                        if sub.get('email'):
+                            email_notifier.send_ticket_alert(
+                                sub['email'],
+                                citation,
+                                context={
+                                    'type': 'location',
+                                    'center_lat': sub.get('center_lat'),
+                                    'center_lon': sub.get('center_lon'),
+                                    'radius_m': sub.get('radius_m'),
+                                },
+                            )
+                except Exception as e:
+                    logger.error(f"Failed notifying location subscribers for {citation_num}: {e}")
 
-        try:
-            process_range("Eighth", eighth_range[0], eighth_range[1], update_last_successful=False)
-        except Exception as e:
-            logger.error(f"Eighth range processing failed: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
+        def flush_citation_batch(batch: list) -> None:
+            """Insert a batch of citations, geocode any still missing coordinates, then alert location subscribers."""
+            try:
+                batch_result = db_manager.batch_insert_citations(batch)
+                if batch_result.get('failed_count', 0) > 0:
+                    errors.extend(batch_result.get('errors', []))
+                logger.info(f"Batch inserted {batch_result.get('success_count', 0)} citations, {batch_result.get('failed_count', 0)} failed")
+                if citation_bitmap is not None and not batch_result.get('failed_count'):
+                    citation_bitmap.update(int(c['citation_number']) for c in batch)
+            except Exception as e:
+                logger.error(f"Error flushing citation batch: {e}")
+                logger.error(f"Traceback: {traceback.format_exc()}")
+                # Add batch citations to errors
+                for citation in batch:
+                    errors.append(f"Failed to save citation {citation.get('citation_number', 'unknown')}: {e}")
+            else:
+                post_batch_geocode(batch)
+            notify_location_subscribers(batch)
+
+        # Build the initial job list for every range, isolating failures per range
+        jobs = []
+        for label, scan in scans.items():
+            try:
+                jobs.extend(collect_jobs(label, scan))
+            except Exception as e:
+                logger.error(f"{label} range processing failed: {e}")
+                logger.error(f"Traceback: {traceback.format_exc()}")
 
-        try:
-            process_range("Ninth", ninth_range[0], ninth_range[1], update_last_successful=False)
-        except Exception as e:
-            logger.error(f"Ninth range processing failed: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            
-        try:
-            process_range("Tenth", tenth_range[0], tenth_range[1], update_last_successful=False)
-        except Exception as e:
-            logger.error(f"Tenth range processing failed: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
+        # Drive all ranges through the staged pipeline at once: probing never waits on OCR,
+        # geocoding or inserts, which run in their own stages and flush in batches
+        pipeline = IngestPipeline(
+            async_scraper,
+            geocode=geocode_result,
+            on_citation=on_citation,
+            flush=flush_citation_batch,
+            on_probe=on_probe,
+            on_probe_error=on_probe_error,
+            ocr_cache=ocr_cache_from_env(db_manager),
+        )
+        pipeline.run_sync(jobs)
+        logger.info(f"Fetched {async_scraper.token_manager.fetch_count} verification token(s) for {total_processed} searches")
+
+        # Persist new frontiers and issuance velocity for the next run
+        registry.finish_run()
+        registry.save(db_manager)
+        miss_cache.save(db_manager)
+        geocode_cache.flush()
+        if local_geocoder is not None:
+            local_geocoder.save(street_index_path)
+        logger.info(
+            f"Geocoding: {batch_geocoder.lookups} distinct location(s), {batch_geocoder.deduplicated} repeat(s) shared, "
+            f"{batch_geocoder.nominatim_requests} Nominatim lookup(s); cache {geocode_cache.hits} hit(s), {geocode_cache.misses} miss(es)"
+        )
+        if citation_bitmap is not None:
+            citation_bitmap.save(bitmap_path)
+        for r in registry.ranges:
+            if r.hits_this_run:
+                logger.info(f"{r.label}: {r.hits_this_run} new citation(s), frontier now {r.frontier}")
 
-        try:
-            process_range("Eleventh", eleventh_range[0], eleventh_range[1], update_last_successful=False)
-        except Exception as e:
-            logger.error(f"Eleventh range processing failed: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            
     except Exception as e:
         error_msg = f"Critical error in scraper job: {str(e)}"
         logger.error(error_msg)
@@ -621,15 +471,7 @@ def ongoing_scraper_job():
     
     finally:
         logger.info("Scraper job finishing up...")
-        # Flush any remaining citations in batch before finishing
-        if citation_batch:
-            logger.info(f"Flushing final batch of {len(citation_batch)} citations...")
-            try:
-                flush_citation_batch()
-            except Exception as e:
-                logger.error(f"Error flushing final citation batch: {e}")
-                logger.error(f"Traceback: {traceback.format_exc()}")
-        
+
         now_utc = datetime.now(timezone.utc)
         found_count = len(successful_citations)
         errors_count = len(errors)
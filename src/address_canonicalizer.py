@@ -0,0 +1,94 @@
+import re
+from typing import Optional, Tuple
+
+# Full street suffix -> the abbreviation the city portal (and Nominatim) uses
+STREET_SUFFIXES = {
+    'STREET': 'St', 'STR': 'St', 'AVENUE': 'Ave', 'AV': 'Ave', 'ROAD': 'Rd', 'BOULEVARD': 'Blvd',
+    'DRIVE': 'Dr', 'LANE': 'Ln', 'COURT': 'Ct', 'PLACE': 'Pl', 'CIRCLE': 'Cir',
+    'PARKWAY': 'Pkwy', 'TERRACE': 'Ter', 'HIGHWAY': 'Hwy',
+}
+DIRECTIONALS = {'NORTH': 'N', 'SOUTH': 'S', 'EAST': 'E', 'WEST': 'W'}
+
+# Streets the portal names differently from the map, keyed by canonical upper-case street
+# name without its directional prefix ("S Tappan St" is matched as "TAPPAN ST")
+STREET_ALIASES = {
+    'TAPPAN ST': 'Tappan Ave',
+}
+
+_CITY_RE = re.compile(r',?\s*ANN\s+ARBOR\b.*$', re.IGNORECASE)
+_PUNCT_RE = re.compile(r'[.,#]')
+_ADDRESS_RE = re.compile(r'^(\d+)[A-Za-z]?(?:-\d+[A-Za-z]?)?\s+(\S.*)$')
+# OCR drops spaces: "800SForestAve", "1100ProspectSt"
+_PACKED_RE = re.compile(r'^\d+[A-Za-z]+$')
+_PACKED_DIRECTION_RE = re.compile(r'^(\d+)([NSEW])(?=[A-Z][a-z])')
+_PACKED_NUMBER_RE = re.compile(r'^(\d+)(?=[A-Z][a-z])')
+_CAMEL_RE = re.compile(r'(?<=[a-z])(?=[A-Z])')
+
+
+def _alias_pattern(street: str) -> str:
+    """Regex for a STREET_ALIASES key in free text, accepting every spelling of its suffix."""
+    *name, suffix = street.split()
+    spellings = {suffix} | {full for full, abbr in STREET_SUFFIXES.items() if abbr.upper() == suffix}
+    return r'\b' + r'\s+'.join(map(re.escape, name)) + r'\s+(?:' + '|'.join(sorted(spellings)) + r')\b'
+
+
+# STREET_ALIASES as applied to locations that are not "<number> <street>", e.g. intersections
+_STREET_ALIAS_RES = [(re.compile(_alias_pattern(street), re.IGNORECASE), alias) for street, alias in STREET_ALIASES.items()]
+
+
+def _unpack(text: str) -> str:
+    if not _PACKED_RE.match(text):
+        return text
+    text = _PACKED_DIRECTION_RE.sub(r'\1 \2 ', text)
+    text = _PACKED_NUMBER_RE.sub(r'\1 ', text)
+    return _CAMEL_RE.sub(' ', text)
+
+
+def split_address(address: str) -> Optional[Tuple[int, str]]:
+    """(house_number, street) for a street address in canonical form, or None if it is not one.
+
+    The street keeps its original casing except for rewritten tokens, e.g.
+    "800 South Forest Avenue, Ann Arbor, MI" -> (800, 'S Forest Ave').
+    """
+    if not address:
+        return None
+    text = ' '.join(_PUNCT_RE.sub(' ', _CITY_RE.sub('', address)).split())
+    match = _ADDRESS_RE.match(_unpack(text))
+    if not match:
+        return None
+    tokens = match.group(2).split()
+    # A directional prefix is only abbreviated when a street name follows it ("North St" stays)
+    if len(tokens) > 2 and tokens[0].upper() in DIRECTIONALS:
+        tokens[0] = DIRECTIONALS[tokens[0].upper()]
+    elif len(tokens) > 1 and len(tokens[0]) == 1 and tokens[0].upper() in 'NSEW':
+        tokens[0] = tokens[0].upper()
+    if len(tokens) > 1 and tokens[-1].upper() in STREET_SUFFIXES:
+        tokens[-1] = STREET_SUFFIXES[tokens[-1].upper()]
+    prefix = tokens[:1] if len(tokens) > 2 and tokens[0] in DIRECTIONALS.values() else []
+    name = ' '.join(tokens[len(prefix):])
+    street = ' '.join(prefix + [STREET_ALIASES.get(name.upper(), name)])
+    return int(match.group(1)), street
+
+
+def canonical_address(address: str) -> str:
+    """Readable canonical form of a location: "800 S Forest Ave" for every spelling of that address.
+
+    Strings that are not street addresses (lot names, intersections) only have whitespace
+    collapsed and STREET_ALIASES applied, so they still match nonstandard.md:
+    "Tappan Street & Hill St" -> "Tappan Ave & Hill St".
+    """
+    if not address:
+        return address
+    parsed = split_address(address)
+    if parsed is None:
+        text = ' '.join(address.split())
+        for pattern, alias in _STREET_ALIAS_RES:
+            text = pattern.sub(alias, text)
+        return text
+    number, street = parsed
+    return f"{number} {street}"
+
+
+def address_key(address: str) -> str:
+    """Cache key for a location: the canonical address, upper-cased."""
+    return canonical_address(address or '').upper()
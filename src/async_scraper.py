@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from scraper import CitationScraper, RateLimiter
+from token_manager import VerificationTokenManager
+
+logger = logging.getLogger(__name__)
+
+PORTAL_HOST = urlparse('https://annarbor.citationportal.com/').netloc
+
+
+class AsyncCitationScraper:
+    """Run CitationScraper lookups concurrently on an asyncio event loop.
+
+    Each worker owns its own CitationScraper (and therefore its own requests.Session and
+    cookies); a shared VerificationTokenManager caches each session's token between its
+    requests. run() checks a scraper out for each blocking call and runs it on a dedicated
+    thread pool; an asyncio semaphore caps how many are in flight per host and a shared
+    RateLimiter caps request starts per second across all workers.
+    """
+
+    def __init__(self, max_concurrency_per_host: Optional[int] = None, max_requests_per_second: Optional[float] = None):
+        if max_concurrency_per_host is None:
+            max_concurrency_per_host = int(os.getenv('SCRAPER_CONCURRENCY', '8'))
+        if max_requests_per_second is None:
+            max_requests_per_second = float(os.getenv('SCRAPER_MAX_RPS', '10'))
+        self.max_concurrency_per_host = max(1, max_concurrency_per_host)
+        self.rate_limiter = RateLimiter(max_requests_per_second)
+        self.token_manager = VerificationTokenManager()
+        self._scrapers = [
+            CitationScraper(rate_limiter=self.rate_limiter, token_manager=self.token_manager)
+            for _ in range(self.max_concurrency_per_host)
+        ]
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _host_limit(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_concurrency_per_host)
+        return self._host_limits[host]
+
+    async def __aenter__(self) -> 'AsyncCitationScraper':
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency_per_host, thread_name_prefix='portal')
+        self._idle = asyncio.Queue()
+        for scraper in self._scrapers:
+            self._idle.put_nowait(scraper)
+        self._host_limits = {}
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def run(self, func: Callable, *args, host: str = PORTAL_HOST):
+        """Run func(scraper, *args) on a pooled scraper under the host concurrency limit."""
+        async with self._host_limit(host):
+            scraper = await self._idle.get()
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, func, scraper, *args)
+            finally:
+                self._idle.put_nowait(scraper)
@@ -0,0 +1,114 @@
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from address_canonicalizer import address_key
+from geocode_cache import GeocodeCache
+from nonstandard import resolve_alias
+
+logger = logging.getLogger(__name__)
+
+Coords = Optional[Tuple[float, float]]
+
+
+class BatchGeocoder:
+    """Resolves each distinct location once per run: geocode cache, alias, local index, then Nominatim.
+
+    Lookups are keyed by canonical address, so every citation on the same block shares one
+    resolution. Concurrent callers asking for a key that is already being resolved wait for
+    that result instead of starting their own, and at most `nominatim_concurrency` Nominatim
+    requests are in flight at once. Definitive results (including "cannot be geocoded") are
+    remembered for the rest of the run; transient Nominatim failures are not, so a later
+    pass can retry them.
+    """
+
+    def __init__(self, cache: GeocodeCache, geocoder, local_geocoder=None,
+                 alias_resolver: Callable[[str], Tuple[Optional[str], Coords]] = resolve_alias,
+                 nominatim_concurrency: Optional[int] = None):
+        if nominatim_concurrency is None:
+            nominatim_concurrency = int(os.getenv('NOMINATIM_CONCURRENCY', '1'))
+        self.cache = cache
+        self.geocoder = geocoder
+        self.local_geocoder = local_geocoder
+        self.alias_resolver = alias_resolver
+        self.nominatim_concurrency = max(1, nominatim_concurrency)
+        self._nominatim_slots = threading.Semaphore(self.nominatim_concurrency)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._resolved: Dict[str, Coords] = {}
+        self.lookups = 0
+        self.deduplicated = 0
+        self.nominatim_requests = 0
+
+    def resolve(self, location: str) -> Coords:
+        """(lat, lon) for a location string, or None if it cannot be geocoded."""
+        key = address_key(location)
+        if not key:
+            return None
+        with self._lock:
+            if key in self._resolved:
+                self.deduplicated += 1
+                return self._resolved[key]
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+                self.lookups += 1
+            else:
+                self.deduplicated += 1
+        if not owner:
+            return future.result()
+
+        coords, definitive = None, False
+        try:
+            coords, definitive = self._lookup(location)
+        except Exception as e:
+            logger.warning(f"Geocoding failed for '{location}': {e}")
+        finally:
+            with self._lock:
+                if definitive:
+                    self._resolved[key] = coords
+                del self._inflight[key]
+            future.set_result(coords)
+        return coords
+
+    def _lookup(self, location: str) -> Tuple[Coords, bool]:
+        known, coords = self.cache.get(location)
+        if known:
+            return coords, True
+        mapped_address, coords = self.alias_resolver(location)
+        if coords:
+            self.cache.store(location, coords, 'alias')
+            return coords, True
+        address = mapped_address or location
+        if self.local_geocoder is not None:
+            local = self.local_geocoder.geocode(address)
+            if local is not None:
+                lat, lon, confidence = local
+                self.cache.store(location, (lat, lon), 'local', confidence)
+                return (lat, lon), True
+        with self._nominatim_slots:
+            self.nominatim_requests += 1
+            coords, definitive = self.geocoder.geocode_with_status(address)
+        # Transient failures are not cached so the next attempt asks Nominatim again
+        if coords or definitive:
+            self.cache.store(location, coords, 'nominatim')
+        if coords and self.local_geocoder is not None:
+            self.local_geocoder.add(address, *coords)
+        return coords, definitive
+
+    def resolve_many(self, locations: Iterable[str]) -> Dict[str, Coords]:
+        """Resolve many location strings, each distinct canonical address once; returns {location: coords}."""
+        locations = [location for location in locations if location]
+        by_key: Dict[str, str] = {}
+        for location in locations:
+            by_key.setdefault(address_key(location), location)
+        if not by_key:
+            return {}
+        workers = min(len(by_key), self.nominatim_concurrency * 4)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='geocode') as pool:
+            resolved = dict(zip(by_key, pool.map(self.resolve, by_key.values())))
+        return {location: resolved[address_key(location)] for location in locations}
@@ -0,0 +1,215 @@
+import logging
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BITMAP_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.cache', 'citation_bitmap.bin')
+
+_MAGIC = b'CBM1'
+_CHUNK_BITS = 16
+_CHUNK_SIZE = 1 << _CHUNK_BITS
+_LOW_MASK = _CHUNK_SIZE - 1
+# Above this many members a chunk is cheaper as a 64K-bit (8 KB) bitmap than as a sorted uint16 array
+_ARRAY_MAX = 4096
+_BITMAP_BYTES = _CHUNK_SIZE // 8
+# Re-read this much history on each sync to catch rows whose transactions committed late
+_SYNC_OVERLAP = timedelta(minutes=10)
+
+Container = Union[array, bytearray]
+
+
+class CitationBitmap:
+    """Compact set of known citation numbers (roaring-style).
+
+    Numbers are split into 65,536-wide chunks keyed by the high bits. A sparse chunk is a
+    sorted array of 16-bit offsets (2 bytes per citation); once it passes 4,096 members it
+    becomes a fixed 8 KB bitmap. Memory therefore follows how densely a band is populated
+    rather than how many citations exist, and membership / gap / max queries need no DB
+    round-trip.
+
+    The file on disk is refreshed incrementally with sync(), which pulls only citations
+    created since the last sync.
+    """
+
+    def __init__(self):
+        self._chunks: Dict[int, Container] = {}
+        self.synced_at: Optional[datetime] = None
+
+    # Membership
+
+    def add(self, citation_num: int) -> None:
+        key, low = citation_num >> _CHUNK_BITS, citation_num & _LOW_MASK
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            self._chunks[key] = array('H', [low])
+            return
+        if isinstance(chunk, bytearray):
+            chunk[low >> 3] |= 1 << (low & 7)
+            return
+        i = bisect_left(chunk, low)
+        if i < len(chunk) and chunk[i] == low:
+            return
+        chunk.insert(i, low)
+        if len(chunk) > _ARRAY_MAX:
+            self._chunks[key] = self._to_bitmap(chunk)
+
+    def update(self, citation_nums: Iterable[int]) -> None:
+        for n in citation_nums:
+            self.add(int(n))
+
+    def __contains__(self, citation_num: int) -> bool:
+        chunk = self._chunks.get(citation_num >> _CHUNK_BITS)
+        if chunk is None:
+            return False
+        low = citation_num & _LOW_MASK
+        if isinstance(chunk, bytearray):
+            return bool(chunk[low >> 3] & (1 << (low & 7)))
+        i = bisect_left(chunk, low)
+        return i < len(chunk) and chunk[i] == low
+
+    def __len__(self) -> int:
+        return sum(self._cardinality(c) for c in self._chunks.values())
+
+    # Range queries (inclusive bounds, matching get_existing_citation_numbers_in_range)
+
+    def members(self, start: int, end: int) -> List[int]:
+        """Known citation numbers in [start, end], ascending."""
+        out: List[int] = []
+        for key in range(start >> _CHUNK_BITS, (end >> _CHUNK_BITS) + 1):
+            chunk = self._chunks.get(key)
+            if chunk is None:
+                continue
+            base = key << _CHUNK_BITS
+            lo = max(start - base, 0)
+            hi = min(end - base, _LOW_MASK)
+            if isinstance(chunk, bytearray):
+                out.extend(base + low for low in range(lo, hi + 1) if chunk[low >> 3] & (1 << (low & 7)))
+            else:
+                out.extend(base + low for low in chunk[bisect_left(chunk, lo):bisect_right(chunk, hi)])
+        return out
+
+    def gaps(self, start: int, end: int) -> List[int]:
+        """Numbers in [start, end] that are not known."""
+        known = set(self.members(start, end))
+        return [n for n in range(start, end + 1) if n not in known]
+
+    def max_in_range(self, min_inclusive: int, max_exclusive: int) -> Optional[int]:
+        """Highest known number in [min_inclusive, max_exclusive), like get_max_citation_between."""
+        for key in range((max_exclusive - 1) >> _CHUNK_BITS, (min_inclusive >> _CHUNK_BITS) - 1, -1):
+            chunk = self._chunks.get(key)
+            if chunk is None:
+                continue
+            base = key << _CHUNK_BITS
+            lo = max(min_inclusive - base, 0)
+            hi = min(max_exclusive - 1 - base, _LOW_MASK)
+            if isinstance(chunk, bytearray):
+                for low in range(hi, lo - 1, -1):
+                    if chunk[low >> 3] & (1 << (low & 7)):
+                        return base + low
+            else:
+                i = bisect_right(chunk, hi)
+                if i and chunk[i - 1] >= lo:
+                    return base + chunk[i - 1]
+        return None
+
+    def any_in_range(self, min_inclusive: int, max_exclusive: int) -> bool:
+        return self.max_in_range(min_inclusive, max_exclusive) is not None
+
+    # Containers
+
+    @staticmethod
+    def _to_bitmap(offsets: Iterable[int]) -> bytearray:
+        bits = bytearray(_BITMAP_BYTES)
+        for low in offsets:
+            bits[low >> 3] |= 1 << (low & 7)
+        return bits
+
+    @staticmethod
+    def _cardinality(chunk: Container) -> int:
+        if isinstance(chunk, bytearray):
+            return sum(bin(b).count('1') for b in chunk)
+        return len(chunk)
+
+    # Persistence
+
+    def save(self, path: str = DEFAULT_BITMAP_PATH) -> None:
+        """Write atomically: chunk count, then (key, kind, length, payload) per chunk."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        synced = self.synced_at.isoformat().encode() if self.synced_at else b''
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_MAGIC)
+            f.write(struct.pack('<H', len(synced)))
+            f.write(synced)
+            f.write(struct.pack('<I', len(self._chunks)))
+            for key in sorted(self._chunks):
+                chunk = self._chunks[key]
+                if isinstance(chunk, bytearray):
+                    f.write(struct.pack('<IBI', key, 1, len(chunk)))
+                    f.write(chunk)
+                else:
+                    data = array('H', chunk)
+                    if sys.byteorder != 'little':
+                        data.byteswap()
+                    f.write(struct.pack('<IBI', key, 0, len(data)))
+                    f.write(data.tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_BITMAP_PATH) -> 'CitationBitmap':
+        """Load from disk; returns an empty (unsynced) bitmap if the file is missing or unreadable."""
+        bitmap = cls()
+        if not os.path.exists(path):
+            return bitmap
+        try:
+            with open(path, 'rb') as f:
+                if f.read(4) != _MAGIC:
+                    raise ValueError("not a citation bitmap file")
+                (synced_len,) = struct.unpack('<H', f.read(2))
+                synced = f.read(synced_len).decode()
+                (count,) = struct.unpack('<I', f.read(4))
+                chunks: Dict[int, Container] = {}
+                for _ in range(count):
+                    key, kind, length = struct.unpack('<IBI', f.read(9))
+                    if kind == 1:
+                        chunks[key] = bytearray(f.read(length))
+                    else:
+                        data = array('H')
+                        data.frombytes(f.read(length * 2))
+                        if sys.byteorder != 'little':
+                            data.byteswap()
+                        chunks[key] = data
+            bitmap._chunks = chunks
+            bitmap.synced_at = datetime.fromisoformat(synced) if synced else None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable citation bitmap at {path}: {e}")
+            return cls()
+        return bitmap
+
+    def sync(self, db_manager) -> int:
+        """Add citations created since the last sync (all of them on first use); returns rows read."""
+        since = self.synced_at - _SYNC_OVERLAP if self.synced_at else None
+        rows = 0
+        latest = self.synced_at
+        for citation_num, created_at in db_manager.iter_citation_numbers_since(since):
+            self.add(int(citation_num))
+            rows += 1
+            if created_at and (latest is None or created_at > latest):
+                latest = created_at
+        self.synced_at = latest
+        logger.info(f"Citation bitmap synced: {rows} row(s) read since {since or 'the beginning'}, {len(self)} known")
+        return rows
+
+    @classmethod
+    def open(cls, db_manager, path: str = DEFAULT_BITMAP_PATH) -> 'CitationBitmap':
+        """Load the bitmap from disk, bring it up to date from the DB and save it back."""
+        bitmap = cls.load(path)
+        bitmap.sync(db_manager)
+        bitmap.save(path)
+        return bitmap
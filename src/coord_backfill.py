@@ -0,0 +1,132 @@
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from batch_geocoder import BatchGeocoder
+from geocode_cache import GeocodeCache
+from geocoder import Geocoder
+from local_geocoder import DEFAULT_STREET_INDEX_PATH, LocalGeocoder
+from nonstandard import resolve_alias
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.cache', 'geocode_backfill_checkpoint.json')
+
+
+def _load_checkpoint(path: str, mode: Dict) -> Optional[int]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+        return None
+    if checkpoint.get('mode') != mode:
+        logger.info("Checkpoint was written for different options; starting over")
+        return None
+    return checkpoint.get('after')
+
+
+def _save_checkpoint(path: str, after: int, mode: Dict) -> None:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'after': after, 'mode': mode, 'updated_at': datetime.now(timezone.utc).isoformat()}, f)
+    os.replace(tmp_path, path)
+
+
+def run_geocode_backfill(
+    db_manager,
+    since: Optional[datetime] = None,
+    aliases_only: bool = False,
+    regeocode: bool = False,
+    batch_size: int = 5000,
+    dry_run: bool = False,
+    checkpoint_path: str = DEFAULT_CHECKPOINT,
+    restart: bool = False,
+) -> Dict[str, int]:
+    """Fill in citation coordinates in bulk.
+
+    Rows with a location and no coordinates (every located row with regeocode) are streamed
+    in citation_number keyset pages. Each page's distinct locations are resolved once through
+    the BatchGeocoder chain (geocode cache, nonstandard aliases, local street index,
+    Nominatim), and the page is written back with one UPDATE. Locations seen on an earlier
+    page are not looked up again. Progress is checkpointed after every page so an
+    interrupted backfill resumes where it stopped.
+
+    since limits the backfill to rows scraped at or after that time; aliases_only to
+    locations listed in nonstandard.md.
+    """
+    mode = {
+        'since': since.isoformat() if since else None,
+        'aliases_only': aliases_only,
+        'regeocode': regeocode,
+    }
+    if restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    after = _load_checkpoint(checkpoint_path, mode)
+    if after is not None:
+        logger.info(f"Resuming after citation {after} (checkpoint {checkpoint_path})")
+
+    cache = GeocodeCache(db_manager)
+    cache.preload()
+    local_geocoder = LocalGeocoder.open(db_manager, os.getenv('STREET_INDEX_PATH', DEFAULT_STREET_INDEX_PATH))
+    geocoder = BatchGeocoder(cache, Geocoder(), local_geocoder)
+
+    stats = {'rows': 0, 'updated': 0, 'unresolved': 0, 'skipped': 0}
+    started = time.monotonic()
+    failed = False
+    while True:
+        try:
+            rows = db_manager.get_geocode_backfill_batch(after=after, limit=batch_size, since=since, include_geocoded=regeocode)
+        except Exception as e:
+            logger.error(f"Failed to query citations: {e}")
+            failed = True
+            break
+        if not rows:
+            break
+        after = rows[-1]['citation_number']
+        stats['rows'] += len(rows)
+
+        if aliases_only:
+            aliased = [r for r in rows if resolve_alias(r['location']) != (None, None)]
+            stats['skipped'] += len(rows) - len(aliased)
+            rows = aliased
+
+        coords_by_location = geocoder.resolve_many(r['location'] for r in rows)
+        updates = []
+        for row in rows:
+            coords = coords_by_location.get(row['location'])
+            if coords:
+                updates.append((row['citation_number'], coords[0], coords[1]))
+            else:
+                stats['unresolved'] += 1
+        stats['updated'] += len(updates)
+
+        if not dry_run:
+            try:
+                db_manager.update_citation_coords(updates)
+            except Exception as e:
+                logger.error(f"Failed to write coordinates for the page ending at citation {after}: {e}")
+                failed = True
+                break
+            cache.flush()
+            _save_checkpoint(checkpoint_path, after, mode)
+
+        elapsed = time.monotonic() - started
+        logger.info(
+            f"Through citation {after}: {stats['rows']} row(s), {stats['updated']} geocoded, "
+            f"{geocoder.lookups} distinct location(s), {geocoder.nominatim_requests} Nominatim request(s), {elapsed:.0f}s"
+        )
+
+    if not failed and not dry_run and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    if local_geocoder is not None and not dry_run:
+        local_geocoder.save(os.getenv('STREET_INDEX_PATH', DEFAULT_STREET_INDEX_PATH))
+    stats['distinct_locations'] = geocoder.lookups
+    stats['nominatim_requests'] = geocoder.nominatim_requests
+    return stats
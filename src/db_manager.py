@@ -1,21 +1,49 @@
 import os
 import logging
+import threading
+from contextlib import ExitStack, contextmanager
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Dict, Optional, List, Tuple
 
-import psycopg
 from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool
 from supabase import create_client, Client
 
+from location_index import LocationSubscriptionIndex
+
 logger = logging.getLogger(__name__)
 
+# Columns of public.citations a scraped citation dict may carry, in table order
+CITATION_COLUMNS = (
+    'citation_number', 'location', 'plate_state', 'plate_number', 'vin', 'issue_date', 'due_date',
+    'status', 'amount_due', 'more_info_url', 'raw_html', 'issuing_agency', 'comments', 'violations',
+    'image_urls', 'officer_badge', 'officer_name', 'officer_beat', 'officer_info_extracted_at',
+    'latitude', 'longitude', 'geocoded_at', 'created_at', 'scraped_at',
+)
+_CITATION_JSON_COLUMNS = {'violations', 'image_urls'}
+_CITATION_TIMESTAMP_COLUMNS = {'issue_date', 'due_date', 'officer_info_extracted_at', 'geocoded_at', 'created_at', 'scraped_at'}
+_CITATION_NUMERIC_COLUMNS = {'amount_due', 'latitude', 'longitude'}
+# First-seen bookkeeping is never rewritten by a re-scrape
+_CITATION_INSERT_ONLY_COLUMNS = {'citation_number', 'created_at', 'scraped_at'}
+
+# What one citation contributes to public.officer_stats, for the citations in %s
+_OFFICER_CONTRIBUTION_SQL = """
+    SELECT btrim(officer_badge) AS officer_badge, btrim(officer_name) AS officer_name,
+           CASE WHEN jsonb_typeof(image_urls) = 'array' THEN jsonb_array_length(image_urls) ELSE 0 END AS photos,
+           coalesce(amount_due, 0) AS amount, issue_date
+    FROM public.citations
+    WHERE citation_number = ANY(%s::bigint[])
+"""
+
 
 class DatabaseManager:
     def __init__(self, db_config):
         self.db_config = db_config
         self.supabase: Client = None
-        self._pg_conn = None
+        self._pool: Optional[ConnectionPool] = None
+        self._pool_lock = threading.Lock()
         self._initialize_supabase()
 
     def _initialize_supabase(self):
@@ -43,39 +71,67 @@ class DatabaseManager:
             logger.error(f"Failed to initialize Supabase client: {e}")
             raise
 
-    def _get_pg_connection(self):
-        """Create (or reuse) a psycopg connection for analytical queries."""
-        if self._pg_conn and not self._pg_conn.closed:
-            return self._pg_conn
-        try:
-            self._pg_conn = psycopg.connect(
-                host=self.db_config.get('host'),
-                dbname=self.db_config.get('database'),
-                user=self.db_config.get('user'),
-                password=self.db_config.get('password'),
-                port=self.db_config.get('port'),
-                autocommit=True,
-                row_factory=dict_row,
+    def _get_pool(self) -> ConnectionPool:
+        """Create (or reuse) the psycopg connection pool for analytical queries and bulk writes.
+
+        Sizes and timeouts come from PG_POOL_MIN_SIZE, PG_POOL_MAX_SIZE, PG_POOL_TIMEOUT
+        (seconds to wait for a free connection) and PG_STATEMENT_TIMEOUT_MS (0 disables).
+        """
+        with self._pool_lock:
+            if self._pool is not None:
+                return self._pool
+            statement_timeout_ms = int(os.getenv('PG_STATEMENT_TIMEOUT_MS', '30000'))
+
+            def configure(conn):
+                conn.execute(f"SET statement_timeout = {statement_timeout_ms}")
+
+            pool = ConnectionPool(
+                kwargs={
+                    'host': self.db_config.get('host'),
+                    'dbname': self.db_config.get('database'),
+                    'user': self.db_config.get('user'),
+                    'password': self.db_config.get('password'),
+                    'port': self.db_config.get('port'),
+                    'autocommit': True,
+                    'row_factory': dict_row,
+                },
+                min_size=int(os.getenv('PG_POOL_MIN_SIZE', '1')),
+                max_size=int(os.getenv('PG_POOL_MAX_SIZE', '5')),
+                timeout=float(os.getenv('PG_POOL_TIMEOUT', '30')),
+                configure=configure,
+                check=ConnectionPool.check_connection,
+                name='db_manager',
+                open=False,
             )
-            logger.info("✓ PostgreSQL connection established for analytics")
-            return self._pg_conn
-        except Exception as e:
-            logger.error(f"Failed to connect to PostgreSQL for analytics: {e}")
-            raise
+            try:
+                pool.open(wait=True, timeout=pool.timeout)
+            except Exception as e:
+                pool.close()
+                logger.error(f"Failed to connect to PostgreSQL for analytics: {e}")
+                raise
+            logger.info(f"✓ PostgreSQL connection pool ready (max {pool.max_size} connections)")
+            self._pool = pool
+            return pool
+
+    @contextmanager
+    def _connection(self):
+        """Check a connection out of the pool for the duration of a with block."""
+        with self._get_pool().connection() as conn:
+            yield conn
 
     def get_connection(self):
-        """Backwards-compatible accessor for psycopg connection."""
-        return self._get_pg_connection()
+        """Context manager lending a pooled psycopg connection: `with db.get_connection() as conn:`."""
+        return self._connection()
 
     def close_connection(self):
-        """Close the psycopg connection if open."""
-        if self._pg_conn and not self._pg_conn.closed:
+        """Close the connection pool if open."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
             try:
-                self._pg_conn.close()
+                pool.close()
             except Exception:
                 pass
-            finally:
-                self._pg_conn = None
 
     @staticmethod
     def _to_float(value: Optional[Decimal]) -> Optional[float]:
@@ -98,13 +154,199 @@ class DatabaseManager:
     def get_fun_facts(self, lookback_days: int = 30) -> Dict:
         """
         Return aggregated statistics used by the fun facts UI.
-        Uses Supabase to fetch data and performs aggregations in Python.
+
+        Served from the citation_rollup_* tables, which batch_insert_citations and
+        save_officer_info keep current, so the cost does not grow with the citations
+        table. Per-location, per-plate and per-officer rankings use whole UTC days;
+        time-based figures are exact to the 30-minute bucket. Falls back to aggregating
+        raw citations in Python if the rollups cannot be queried.
 
         Args:
-            lookback_days: How far back to query data.
+            lookback_days: How far back to query data (1-180).
         """
         lookback_days = max(1, min(lookback_days, 180))
-        
+        try:
+            return self._fun_facts_from_rollups(lookback_days)
+        except Exception as e:
+            logger.warning(f"Fun facts rollups unavailable, aggregating citations in Python: {e}")
+            return self._fun_facts_from_citations(lookback_days)
+
+    def _fun_facts_from_rollups(self, lookback_days: int) -> Dict:
+        from datetime import timedelta
+        now = datetime.now(timezone.utc)
+        params = {
+            'cutoff': now - timedelta(days=lookback_days),
+            'cutoff_day': (now - timedelta(days=lookback_days)).date(),
+            'last_24h': now - timedelta(hours=24),
+            'last_7d': now - timedelta(days=7),
+        }
+        buckets_since = "FROM public.citation_rollup_buckets WHERE bucket_start >= date_bin('30 minutes', %(cutoff)s, timestamptz '2000-01-01')"
+
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT coalesce(sum(citation_count), 0) AS total_tickets,
+                       coalesce(sum(amount_total), 0) AS total_revenue,
+                       coalesce(sum(amount_count), 0) AS amount_count,
+                       coalesce(max(max_amount), 0) AS most_expensive,
+                       coalesce(sum(citation_count) FILTER (WHERE bucket_start >= date_bin('30 minutes', %(last_24h)s, timestamptz '2000-01-01')), 0) AS last_24h,
+                       coalesce(sum(citation_count) FILTER (WHERE bucket_start >= date_bin('30 minutes', %(last_7d)s, timestamptz '2000-01-01')), 0) AS last_7d
+                {buckets_since}
+                """,
+                params,
+            )
+            totals = cur.fetchone()
+            cur.execute(f"SELECT bucket_start, citation_count {buckets_since} ORDER BY citation_count DESC, bucket_start DESC LIMIT 3", params)
+            windows = cur.fetchall()
+            cur.execute(
+                f"""
+                SELECT extract(hour FROM bucket_start AT TIME ZONE 'UTC')::int AS hour, sum(citation_count) AS citation_count
+                {buckets_since}
+                GROUP BY 1 ORDER BY 2 DESC, 1 LIMIT 1
+                """,
+                params,
+            )
+            worst_hour = cur.fetchone()
+            cur.execute(
+                f"""
+                SELECT to_char(bucket_start AT TIME ZONE 'UTC', 'FMDay') AS day, sum(citation_count) AS citation_count
+                {buckets_since}
+                GROUP BY 1 ORDER BY 2 DESC, 1 LIMIT 1
+                """,
+                params,
+            )
+            worst_day = cur.fetchone()
+            cur.execute(
+                """
+                SELECT location, sum(citation_count) AS citation_count,
+                       sum(amount_total) / nullif(sum(amount_count), 0) AS avg_amount, max(last_seen) AS last_seen
+                FROM public.citation_rollup_locations
+                WHERE day >= %(cutoff_day)s
+                GROUP BY location
+                ORDER BY 2 DESC, 4 DESC
+                LIMIT 5
+                """,
+                params,
+            )
+            locations = cur.fetchall()
+            cur.execute(
+                """
+                SELECT plate_state, plate_number, sum(citation_count) AS citation_count,
+                       sum(amount_total) AS total_amount, max(last_seen) AS last_seen
+                FROM public.citation_rollup_plates
+                WHERE day >= %(cutoff_day)s
+                GROUP BY plate_state, plate_number
+                HAVING sum(citation_count) > 1
+                ORDER BY 3 DESC, 5 DESC
+                LIMIT 5
+                """,
+                params,
+            )
+            plates = cur.fetchall()
+            cur.execute(
+                """
+                SELECT plate_state, sum(citation_count) AS citation_count
+                FROM public.citation_rollup_plates
+                WHERE day >= %(cutoff_day)s AND plate_state <> 'MI'
+                GROUP BY plate_state
+                ORDER BY 2 DESC
+                LIMIT 3
+                """,
+                params,
+            )
+            states = cur.fetchall()
+            cur.execute(
+                """
+                SELECT officer_name, sum(amount_total) AS revenue, sum(citation_count) AS citation_count
+                FROM public.citation_rollup_officers
+                WHERE day >= %(cutoff_day)s
+                GROUP BY officer_name
+                ORDER BY 2 DESC
+                LIMIT 5
+                """,
+                params,
+            )
+            officers = cur.fetchall()
+
+        def iso(value):
+            return value.astimezone(timezone.utc).isoformat() if value else None
+
+        worst_blocks = [
+            {
+                'location': row['location'],
+                'citation_count': int(row['citation_count']),
+                'avg_amount': self._to_float(row['avg_amount']) or 0.0,
+                'last_seen': iso(row['last_seen']),
+            }
+            for row in locations
+        ]
+        repeat_offenders = [
+            {
+                'plate_state': row['plate_state'],
+                'plate_number': row['plate_number'],
+                'citation_count': int(row['citation_count']),
+                'total_amount': self._to_float(row['total_amount']) or 0.0,
+                'last_seen': iso(row['last_seen']),
+            }
+            for row in plates
+        ]
+        amount_count = int(totals['amount_count'])
+        total_revenue = self._to_float(totals['total_revenue']) or 0.0
+        return {
+            'generated_at': now.isoformat(),
+            'lookback_days': lookback_days,
+            'worst_blocks': worst_blocks,
+            'repeat_offenders': repeat_offenders,
+            'spicy_windows': [
+                {
+                    'bucket_start': iso(row['bucket_start']),
+                    'bucket_end': iso(row['bucket_start'] + timedelta(minutes=30)),
+                    'citation_count': int(row['citation_count']),
+                }
+                for row in windows
+            ],
+            'ticket_pressure': {
+                'last_24h': int(totals['last_24h']),
+                'last_7d': int(totals['last_7d']),
+                'avg_amount': total_revenue / amount_count if amount_count else 0.0,
+                'total_revenue': total_revenue,
+                'total_tickets': int(totals['total_tickets']),
+            },
+            'out_of_state_heat': [
+                {'plate_state': row['plate_state'], 'citation_count': int(row['citation_count'])}
+                for row in states
+            ],
+            'champions': {
+                'worst_plate': {
+                    key: repeat_offenders[0][key] for key in ('plate_state', 'plate_number', 'citation_count', 'total_amount')
+                } if repeat_offenders else None,
+                'worst_location': {
+                    key: worst_blocks[0][key] for key in ('location', 'citation_count', 'avg_amount')
+                } if worst_blocks else None,
+            },
+            'insights': {
+                'most_expensive': self._to_float(totals['most_expensive']) or 0.0,
+                'worst_hour': worst_hour['hour'] if worst_hour else None,
+                'worst_hour_count': int(worst_hour['citation_count']) if worst_hour else 0,
+                'worst_day': worst_day['day'] if worst_day else None,
+                'worst_day_count': int(worst_day['citation_count']) if worst_day else 0,
+            },
+            'officer_leaderboard': [
+                {
+                    'officer_name': row['officer_name'],
+                    'revenue': self._to_float(row['revenue']) or 0.0,
+                    'citation_count': int(row['citation_count']),
+                }
+                for row in officers
+            ],
+        }
+
+    def _fun_facts_from_citations(self, lookback_days: int) -> Dict:
+        """
+        Fallback for get_fun_facts: page the lookback window's citations out of
+        Supabase and aggregate them in Python.
+        """
+
         facts: Dict = {
             'generated_at': datetime.utcnow().replace(tzinfo=timezone.utc).isoformat(),
             'lookback_days': lookback_days,
@@ -411,57 +653,314 @@ class DatabaseManager:
 
     def batch_insert_citations(self, citations: List[Dict]) -> Dict:
         """
-        Insert multiple citations in a single batch operation.
-        
+        Upsert multiple citations in one transaction.
+
+        Rows are streamed with COPY into a temporary staging table and merged with
+        INSERT ... ON CONFLICT (citation_number) DO UPDATE, so re-inserting a citation
+        (a racing run, a backfill) refreshes it instead of failing. Columns missing or
+        NULL in the new data never overwrite existing values.
+
+        Rows that cannot be stored (no citation number, unparseable timestamps or amounts)
+        are rejected up front and reported in 'errors' without touching the database; the
+        rest of the batch still goes in. If the COPY path fails the whole batch is retried
+        once through Supabase, one upsert per set of non-NULL columns (see
+        _supabase_upsert_citations).
+
         Args:
             citations: List of citation dictionaries to insert
-            
+
         Returns:
-            Dict with 'success_count' and 'failed_count' keys
-            
-        Note: If batch insert fails, falls back to individual inserts.
+            Dict with 'success_count', 'failed_count' and 'errors' keys
         """
         if not citations:
             return {'success_count': 0, 'failed_count': 0, 'errors': []}
-        
+
+        errors: List[str] = []
+        rows: Dict[int, Dict] = {}
+        for citation in citations:
+            row, error = self._prepare_citation_row(citation)
+            if error:
+                logger.error(error)
+                errors.append(error)
+                continue
+            # Repeats of a citation within the batch merge, later values winning
+            rows.setdefault(row['citation_number'], {}).update(row)
+        if not rows:
+            return {'success_count': 0, 'failed_count': len(errors), 'errors': errors}
+
+        valid_count = len(citations) - len(errors)
+        first, last = min(rows), max(rows)
         try:
-            # Attempt batch insert
-            result = self.supabase.table('citations').insert(citations).execute()
-            success_count = len(citations)
-            citation_numbers = [c.get('citation_number', 'unknown') for c in citations]
-            logger.info(f"Batch inserted {success_count} citations: {citation_numbers[0] if citation_numbers else 'none'} to {citation_numbers[-1] if citation_numbers else 'none'}")
-            return {
-                'success_count': success_count,
-                'failed_count': 0,
-                'errors': []
-            }
+            self._copy_upsert_citations(list(rows.values()))
+            logger.info(f"Upserted {len(rows)} citations via COPY: {first} to {last}")
         except Exception as e:
-            # If batch insert fails, fall back to individual inserts
-            logger.warning(f"Batch insert failed for {len(citations)} citations, falling back to individual inserts: {e}")
-            success_count = 0
-            failed_count = 0
-            errors = []
-            
-            for citation in citations:
-                try:
-                    self.save_citation(citation)
-                    success_count += 1
-                except Exception as individual_error:
-                    failed_count += 1
-                    citation_num = citation.get('citation_number', 'unknown')
-                    error_msg = f"Failed to save citation {citation_num}: {individual_error}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
-            
-            return {
-                'success_count': success_count,
-                'failed_count': failed_count,
-                'errors': errors
-            }
+            logger.warning(f"COPY upsert failed for {len(rows)} citations, retrying as one Supabase upsert: {e}")
+            try:
+                self._supabase_upsert_citations(list(rows.values()))
+                logger.info(f"Upserted {len(rows)} citations via Supabase: {first} to {last}")
+            except Exception as fallback_error:
+                logger.error(f"Failed to save citations {first} to {last}: {fallback_error}")
+                errors.extend(f"Failed to save citation {number}: {fallback_error}" for number in rows)
+                return {'success_count': 0, 'failed_count': len(citations), 'errors': errors}
+
+        return {
+            'success_count': valid_count,
+            'failed_count': len(citations) - valid_count,
+            'errors': errors
+        }
+
+    def _supabase_upsert_citations(self, rows: List[Dict]) -> None:
+        """Upsert prepared rows through Supabase, keeping officer_stats and the fun-fact rollups in step.
+
+        Used when the COPY path fails. The upsert runs inside a Postgres transaction that takes
+        the officer_stats snapshot before it and applies the delta after it, as the COPY path
+        does. If Postgres cannot be reached at all the rows still go in, and officer_stats has
+        to be rebuilt with the backfill in docs/migration_add_officer_stats.sql.
+        """
+        numbers = [row['citation_number'] for row in rows]
+        days = sorted({row['issue_date'].astimezone(timezone.utc).date() for row in rows if row.get('issue_date')})
+        with ExitStack() as stack:
+            cur = None
+            try:
+                conn = stack.enter_context(self._connection())
+                stack.enter_context(conn.transaction())
+                cur = stack.enter_context(conn.cursor())
+            except Exception as e:
+                logger.error(
+                    f"Postgres unavailable, officer_stats and fun fact rollups will miss citations "
+                    f"{min(numbers)} to {max(numbers)} until rebuilt: {e}"
+                )
+            snapshot = cur is not None and self._snapshot_officer_stats(cur, numbers)
 
+            # PostgREST writes every key of a bulk upsert to every row, so NULLs are dropped
+            # and rows are sent in groups sharing the same columns
+            payloads: Dict[Tuple[str, ...], List[Dict]] = {}
+            for row in rows:
+                payload = {
+                    key: value.isoformat() if isinstance(value, datetime) else value
+                    for key, value in row.items() if value is not None
+                }
+                payloads.setdefault(tuple(sorted(payload)), []).append(payload)
+            for payload in payloads.values():
+                self.supabase.table('citations').upsert(payload, on_conflict='citation_number').execute()
 
+            if cur is not None:
+                self._refresh_fun_fact_rollups(cur, days)
+                if snapshot:
+                    self._apply_officer_stats_delta(cur, numbers)
 
+    def _prepare_citation_row(self, citation: Dict) -> Tuple[Optional[Dict], Optional[str]]:
+        """Keep only citations columns and check values Postgres would reject; returns (row, error)."""
+        number = self._to_int(citation.get('citation_number'))
+        if number is None:
+            return None, f"Failed to save citation {citation.get('citation_number', 'unknown')}: missing or invalid citation_number"
+        row = {'citation_number': number}
+        for column in CITATION_COLUMNS[1:]:
+            if column not in citation:
+                continue
+            value = citation[column]
+            if value is not None and column in _CITATION_TIMESTAMP_COLUMNS:
+                parsed = self._parse_timestamp(value)
+                if parsed is None:
+                    return None, f"Failed to save citation {number}: invalid {column} {value!r}"
+                value = parsed
+            elif value is not None and column in _CITATION_NUMERIC_COLUMNS and self._to_float(value) is None:
+                return None, f"Failed to save citation {number}: invalid {column} {value!r}"
+            row[column] = value
+        return row, None
 
+    def _copy_upsert_citations(self, rows: List[Dict]) -> int:
+        """COPY rows into a staging table and merge them into citations in one transaction; returns rows written."""
+        present = {column for row in rows for column in row}
+        columns = [column for column in CITATION_COLUMNS if column in present]
+        column_list = ', '.join(columns)
+        updates = ',\n                       '.join(
+            f"{column} = COALESCE(EXCLUDED.{column}, c.{column})"
+            for column in columns if column not in _CITATION_INSERT_ONLY_COLUMNS
+        )
+        conflict_action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+
+        with self._connection() as conn, conn.transaction(), conn.cursor() as cur:
+            cur.execute("CREATE TEMP TABLE citations_staging (LIKE public.citations) ON COMMIT DROP")
+            with cur.copy(f"COPY citations_staging ({column_list}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row([
+                        Jsonb(row.get(column)) if column in _CITATION_JSON_COLUMNS and row.get(column) is not None
+                        else row.get(column)
+                        for column in columns
+                    ])
+            # Days whose fun-fact rollups the upsert can change: the new issue dates and any being replaced
+            staged_dates = 'issue_date' if 'issue_date' in columns else 'NULL::timestamptz'
+            cur.execute(
+                f"""
+                SELECT DISTINCT (issue_date AT TIME ZONE 'UTC')::date AS day
+                FROM (
+                    SELECT {staged_dates} AS issue_date FROM citations_staging
+                    UNION ALL
+                    SELECT c.issue_date FROM public.citations c JOIN citations_staging s USING (citation_number)
+                ) touched
+                WHERE issue_date IS NOT NULL
+                """
+            )
+            days = [row['day'] for row in cur.fetchall()]
+            numbers = [row['citation_number'] for row in rows]
+            snapshot = self._snapshot_officer_stats(cur, numbers)
+            cur.execute(
+                f"""
+                INSERT INTO public.citations AS c ({column_list})
+                SELECT {column_list} FROM citations_staging
+                ON CONFLICT (citation_number) {conflict_action}
+                """
+            )
+            written = cur.rowcount
+            self._refresh_fun_fact_rollups(cur, days)
+            if snapshot:
+                self._apply_officer_stats_delta(cur, numbers)
+            return written
+
+    def refresh_fun_fact_rollups(self, days) -> None:
+        """Best-effort rebuild of the fun-fact rollups for some UTC dates, in its own transaction."""
+        days = sorted(set(days))
+        if not days:
+            return
+        try:
+            with self._connection() as conn, conn.transaction(), conn.cursor() as cur:
+                self._refresh_fun_fact_rollups(cur, days)
+        except Exception as e:
+            logger.warning(f"Failed to refresh fun fact rollups for {len(days)} day(s): {e}")
+
+    def _refresh_fun_fact_rollups(self, cur, days: List) -> None:
+        """Recompute the citation_rollup_* rows for the given UTC days from citations.
+
+        Must run inside the transaction that changed those citations. Rebuilding whole days
+        keeps the rollups exact however often a citation is re-upserted, and each day is a
+        short issue_date index range scan. Runs in a savepoint: if it fails (e.g. the
+        rollup tables have not been migrated yet) the caller's writes still commit.
+        """
+        if not days:
+            return
+        try:
+            with cur.connection.transaction():
+                # Serialise refreshes so two writers cannot interleave a day's delete and insert
+                cur.execute("SELECT pg_advisory_xact_lock(hashtext('citation_rollups'))")
+                cur.execute(
+                    """
+                    CREATE TEMP TABLE rollup_days ON COMMIT DROP AS
+                    SELECT day, day::timestamp AT TIME ZONE 'UTC' AS day_start, (day + 1)::timestamp AT TIME ZONE 'UTC' AS day_end
+                    FROM unnest(%s::date[]) AS d(day)
+                    """,
+                    (sorted(set(days)),),
+                )
+                cur.execute(
+                    """
+                    CREATE TEMP TABLE rollup_source ON COMMIT DROP AS
+                    SELECT d.day, c.issue_date, btrim(c.location) AS location, upper(btrim(c.plate_state)) AS plate_state,
+                           btrim(c.plate_number) AS plate_number, c.amount_due, btrim(c.officer_name) AS officer_name
+                    FROM rollup_days d
+                    JOIN public.citations c ON c.issue_date >= d.day_start AND c.issue_date < d.day_end
+                    """
+                )
+                cur.execute(
+                    """
+                    DELETE FROM public.citation_rollup_buckets b USING rollup_days d
+                    WHERE b.bucket_start >= d.day_start AND b.bucket_start < d.day_end
+                    """
+                )
+                cur.execute("DELETE FROM public.citation_rollup_locations WHERE day IN (SELECT day FROM rollup_days)")
+                cur.execute("DELETE FROM public.citation_rollup_plates WHERE day IN (SELECT day FROM rollup_days)")
+                cur.execute("DELETE FROM public.citation_rollup_officers WHERE day IN (SELECT day FROM rollup_days)")
+                cur.execute(
+                    """
+                    INSERT INTO public.citation_rollup_buckets (bucket_start, citation_count, amount_total, amount_count, max_amount)
+                    SELECT date_bin('30 minutes', issue_date, timestamptz '2000-01-01'), count(*),
+                           coalesce(sum(amount_due), 0), count(amount_due), max(amount_due)
+                    FROM rollup_source
+                    GROUP BY 1
+                    """
+                )
+                cur.execute(
+                    """
+                    INSERT INTO public.citation_rollup_locations (day, location, citation_count, amount_total, amount_count, last_seen)
+                    SELECT day, location, count(*), coalesce(sum(amount_due), 0), count(amount_due), max(issue_date)
+                    FROM rollup_source
+                    WHERE location <> ''
+                    GROUP BY day, location
+                    """
+                )
+                cur.execute(
+                    """
+                    INSERT INTO public.citation_rollup_plates (day, plate_state, plate_number, citation_count, amount_total, last_seen)
+                    SELECT day, plate_state, plate_number, count(*), coalesce(sum(amount_due), 0), max(issue_date)
+                    FROM rollup_source
+                    WHERE plate_state <> '' AND plate_number <> ''
+                    GROUP BY day, plate_state, plate_number
+                    """
+                )
+                cur.execute(
+                    """
+                    INSERT INTO public.citation_rollup_officers (day, officer_name, citation_count, amount_total)
+                    SELECT day, officer_name, count(*), coalesce(sum(amount_due), 0)
+                    FROM rollup_source
+                    WHERE officer_name <> ''
+                    GROUP BY day, officer_name
+                    """
+                )
+                cur.execute("DROP TABLE rollup_source, rollup_days")
+        except Exception as e:
+            logger.warning(f"Failed to refresh fun fact rollups for {len(days)} day(s): {e}")
+
+    def _snapshot_officer_stats(self, cur, numbers: List[int]) -> bool:
+        """Stash what these citations contribute to officer_stats before they are rewritten.
+
+        Pair with _apply_officer_stats_delta after the write, in the same transaction.
+        Returns False (and the delta should be skipped) if the snapshot could not be taken.
+        """
+        try:
+            with cur.connection.transaction():
+                # Writers take turns so no two transactions subtract the same "before" rows
+                cur.execute("SELECT pg_advisory_xact_lock(hashtext('officer_stats'))")
+                cur.execute("DROP TABLE IF EXISTS officer_stats_before")
+                cur.execute(f"CREATE TEMP TABLE officer_stats_before ON COMMIT DROP AS {_OFFICER_CONTRIBUTION_SQL}", (numbers,))
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to snapshot officer stats: {e}")
+            return False
+
+    def _apply_officer_stats_delta(self, cur, numbers: List[int]) -> None:
+        """Add (after - before) for the rewritten citations to officer_stats, by badge and by name.
+
+        Counts stay exact under re-upserts; first/last seen only ever widen. Runs in a
+        savepoint so a missing officer_stats table never blocks the caller's writes.
+        """
+        try:
+            with cur.connection.transaction():
+                cur.execute(
+                    f"""
+                    INSERT INTO public.officer_stats AS o
+                           (key_type, officer_key, total_citations, total_photos, total_revenue, first_seen, last_seen, updated_at)
+                    SELECT k.key_type, k.officer_key, sum(t.sign), sum(t.sign * t.photos), sum(t.sign * t.amount),
+                           min(t.issue_date) FILTER (WHERE t.sign > 0), max(t.issue_date) FILTER (WHERE t.sign > 0), now()
+                    FROM (
+                        SELECT 1 AS sign, * FROM ({_OFFICER_CONTRIBUTION_SQL}) AS after_rows
+                        UNION ALL
+                        SELECT -1 AS sign, * FROM officer_stats_before
+                    ) t
+                    CROSS JOIN LATERAL (VALUES ('badge', t.officer_badge), ('name', t.officer_name)) AS k(key_type, officer_key)
+                    WHERE k.officer_key <> ''
+                    GROUP BY k.key_type, k.officer_key
+                    ON CONFLICT (key_type, officer_key) DO UPDATE
+                       SET total_citations = o.total_citations + EXCLUDED.total_citations,
+                           total_photos = o.total_photos + EXCLUDED.total_photos,
+                           total_revenue = o.total_revenue + EXCLUDED.total_revenue,
+                           first_seen = LEAST(o.first_seen, EXCLUDED.first_seen),
+                           last_seen = GREATEST(o.last_seen, EXCLUDED.last_seen),
+                           updated_at = now()
+                    """,
+                    (numbers,),
+                )
+                cur.execute("DROP TABLE officer_stats_before")
+        except Exception as e:
+            logger.warning(f"Failed to update officer stats for {len(numbers)} citation(s): {e}")
 
     def get_last_successful_citation(self) -> Optional[int]:
         """Get the highest citation number currently in the database."""
@@ -485,30 +984,12 @@ class DatabaseManager:
     def get_existing_citation_numbers_in_range(self, start_range: int, end_range: int) -> set:
         """Get all existing citation numbers in the given range"""
         try:
-            # Log the query parameters and their types
-            logger.info(f"[DEBUG] get_existing_citation_numbers_in_range called with start={start_range} (type={type(start_range).__name__}), end={end_range} (type={type(end_range).__name__})")
-            
             result = self.supabase.table('citations').select('citation_number').gte('citation_number', start_range).lte('citation_number', end_range).execute()
-            
-            # Log raw result details
-            logger.info(f"[DEBUG] Raw result.data length: {len(result.data) if result.data else 0}")
-            if result.data:
-                # Log sample of what we got back
-                sample = result.data[:5]
-                logger.info(f"[DEBUG] Sample results (first 5): {sample}")
-                sample_types = [(row['citation_number'], type(row['citation_number']).__name__) for row in sample]
-                logger.info(f"[DEBUG] Sample types: {sample_types}")
-                
-                existing_numbers = {row['citation_number'] for row in result.data}
-                logger.info(f"Found {len(existing_numbers)} existing citations in range {start_range}-{end_range}")
-                return existing_numbers
-            else:
-                logger.info(f"[DEBUG] No results returned from Supabase for range {start_range}-{end_range}")
-            return set()
+            existing_numbers = {row['citation_number'] for row in (result.data or [])}
+            logger.debug(f"Found {len(existing_numbers)} existing citations in range {start_range}-{end_range}")
+            return existing_numbers
         except Exception as e:
-            logger.error(f"Failed to get existing citation numbers in range: {e}")
-            import traceback
-            logger.error(f"[DEBUG] Traceback: {traceback.format_exc()}")
+            logger.error(f"Failed to get existing citation numbers in range {start_range}-{end_range}: {e}")
             return set()
 
     def get_max_citation_below(self, threshold: int) -> Optional[int]:
@@ -552,9 +1033,6 @@ class DatabaseManager:
     def get_max_citation_between(self, min_inclusive: int, max_exclusive: int) -> Optional[int]:
         """Return the maximum citation_number in [min_inclusive, max_exclusive)."""
         try:
-            # Log the query parameters and their types
-            logger.info(f"[DEBUG] get_max_citation_between called with min={min_inclusive} (type={type(min_inclusive).__name__}), max={max_exclusive} (type={type(max_exclusive).__name__})")
-            
             result = (
                 self.supabase
                 .table('citations')
@@ -565,25 +1043,345 @@ class DatabaseManager:
                 .limit(1)
                 .execute()
             )
-            
-            # Log raw result details
-            logger.info(f"[DEBUG] Raw result.data: {result.data}")
             if result.data:
-                raw_value = result.data[0]['citation_number']
-                logger.info(f"[DEBUG] Raw citation_number value: {raw_value} (type={type(raw_value).__name__})")
                 return int(result.data[0]['citation_number'])
-            else:
-                logger.info(f"[DEBUG] No results returned from Supabase for range [{min_inclusive}, {max_exclusive})")
+            logger.debug(f"No citations in range [{min_inclusive}, {max_exclusive})")
             return None
         except Exception as e:
             logger.error(
                 f"Failed to get max citation between {min_inclusive} and {max_exclusive}: {e}"
             )
-            import traceback
-            logger.error(f"[DEBUG] Traceback: {traceback.format_exc()}")
             return None
 
+    def iter_citation_numbers_since(self, since: Optional[datetime] = None, batch_size: int = 10000):
+        """Yield (citation_number, created_at) for citations created at or after `since` (all when None).
 
+        Streams through a server-side cursor so a full build never holds the table in memory.
+        """
+        query = "SELECT citation_number, created_at FROM public.citations"
+        params = ()
+        if since is not None:
+            query += " WHERE created_at >= %s"
+            params = (since,)
+        with self._connection() as conn, conn.transaction(), conn.cursor(name='citation_numbers_since') as cur:
+            cur.itersize = batch_size
+            cur.execute(query, params)
+            for row in cur:
+                yield row['citation_number'], row['created_at']
+
+    def get_scrape_ranges(self) -> List[Dict]:
+        """Return enabled rows from the scrape_ranges registry (empty if the table is missing)."""
+        try:
+            result = (
+                self.supabase
+                .table('scrape_ranges')
+                .select('label,min_inclusive,max_exclusive,default_center,frontier,velocity_per_hour,last_run_at')
+                .eq('enabled', True)
+                .order('min_inclusive')
+                .execute()
+            )
+            return result.data or []
+        except Exception as e:
+            logger.error(f"Failed to load scrape ranges: {e}")
+            return []
+
+    def save_scrape_ranges(self, rows: List[Dict]) -> None:
+        """Upsert frontier/velocity state for the given scrape_ranges rows."""
+        if not rows:
+            return
+        try:
+            self.supabase.table('scrape_ranges').upsert(rows, on_conflict='label').execute()
+            logger.info(f"Saved state for {len(rows)} scrape ranges")
+        except Exception as e:
+            logger.error(f"Failed to save scrape ranges: {e}")
+
+    def get_range_issuance_stats(self, ranges: List[Tuple[str, int, int]], lookback_days: int = 14) -> Dict[str, Dict]:
+        """Return per-range issuance statistics from citation history in one query.
+
+        For each (label, min_inclusive, max_exclusive) band over the lookback window:
+          - rate_per_hour: citations issued per hour at the current local hour of day,
+            or the all-day average if that is higher
+          - lag_hours: p90 delay between issue_date and scraped_at (how late numbers appear)
+        """
+        if not ranges:
+            return {}
+        labels = [r[0] for r in ranges]
+        lows = [r[1] for r in ranges]
+        highs = [r[2] for r in ranges]
+        query = """
+            SELECT b.label,
+                   count(c.citation_number) AS issued,
+                   count(c.citation_number) FILTER (
+                       WHERE extract(hour FROM c.issue_date AT TIME ZONE 'America/Detroit')
+                           = extract(hour FROM now() AT TIME ZONE 'America/Detroit')
+                   ) AS issued_this_hour,
+                   percentile_cont(0.9) WITHIN GROUP (
+                       ORDER BY extract(epoch FROM (c.scraped_at - c.issue_date))
+                   ) AS lag_p90_seconds
+            FROM unnest(%(labels)s::text[], %(lows)s::bigint[], %(highs)s::bigint[]) AS b(label, lo, hi)
+            LEFT JOIN public.citations c
+              ON c.citation_number >= b.lo
+             AND c.citation_number < b.hi
+             AND c.issue_date >= now() - make_interval(days => %(days)s)
+            GROUP BY b.label
+        """
+        try:
+            with self._connection() as conn, conn.cursor() as cur:
+                cur.execute(query, {'labels': labels, 'lows': lows, 'highs': highs, 'days': lookback_days})
+                rows = cur.fetchall()
+        except Exception as e:
+            logger.error(f"Failed to load range issuance stats: {e}")
+            return {}
+
+        return {row['label']: self._issuance_stats(row, lookback_days) for row in rows}
+
+    def _issuance_stats(self, row: Dict, lookback_days: int) -> Dict:
+        issued = self._to_int(row.get('issued')) or 0
+        this_hour = self._to_int(row.get('issued_this_hour')) or 0
+        lag_seconds = self._to_float(row.get('lag_p90_seconds'))
+        return {
+            'issued': issued,
+            'rate_per_hour': max(this_hour / lookback_days, issued / (lookback_days * 24.0)),
+            'lag_hours': max(lag_seconds, 0.0) / 3600.0 if lag_seconds is not None else None,
+        }
+
+    def get_range_snapshot(self, ranges: List[Tuple[str, int, int, Optional[int]]], behind: int, ahead: int,
+                           lookback_days: int = 14, include_existing: bool = True) -> Dict[str, Dict]:
+        """Everything a scrape run needs to plan its ranges, in one round-trip.
+
+        ranges: (label, min_inclusive, max_exclusive, center) where center is the range's
+        stored frontier or default center. For each band the anchor is the DB max and the
+        center; the result holds:
+          - max: highest citation_number in [min_inclusive, max_exclusive), or None
+          - existing: set of stored numbers from `behind` below the lower anchor up to the higher one
+            (left empty when include_existing is False, e.g. when a CitationBitmap answers it)
+          - stats: issuance stats as returned by get_range_issuance_stats
+          - misses: {citation_number: (miss_count, last_probed_at)} from citation_probe_misses
+            over the same window extended `ahead` past the higher anchor
+        Returns {} if the query fails so callers can fall back to per-range lookups.
+        """
+        if not ranges:
+            return {}
+        query = """
+            WITH bands AS (
+                SELECT *
+                FROM unnest(%(labels)s::text[], %(lows)s::bigint[], %(highs)s::bigint[], %(centers)s::bigint[])
+                     AS b(label, lo, hi, center)
+            )
+            SELECT b.label,
+                   mx.db_max,
+                   ex.existing,
+                   st.issued,
+                   st.issued_this_hour,
+                   st.lag_p90_seconds,
+                   ms.miss_numbers,
+                   ms.miss_counts,
+                   ms.miss_probed_at
+            FROM bands b
+            CROSS JOIN LATERAL (
+                SELECT max(c.citation_number) AS db_max
+                FROM public.citations c
+                WHERE c.citation_number >= b.lo AND c.citation_number < b.hi
+            ) mx
+            CROSS JOIN LATERAL (
+                SELECT greatest(least(mx.db_max, b.center) - %(behind)s, b.lo) AS win_lo,
+                       greatest(mx.db_max, b.center) AS win_hi
+            ) w
+            CROSS JOIN LATERAL (
+                SELECT coalesce(array_agg(c.citation_number), '{}') AS existing
+                FROM public.citations c
+                WHERE %(include_existing)s AND c.citation_number BETWEEN w.win_lo AND w.win_hi
+            ) ex
+            CROSS JOIN LATERAL (
+                SELECT count(*) AS issued,
+                       count(*) FILTER (
+                           WHERE extract(hour FROM c.issue_date AT TIME ZONE 'America/Detroit')
+                               = extract(hour FROM now() AT TIME ZONE 'America/Detroit')
+                       ) AS issued_this_hour,
+                       percentile_cont(0.9) WITHIN GROUP (
+                           ORDER BY extract(epoch FROM (c.scraped_at - c.issue_date))
+                       ) AS lag_p90_seconds
+                FROM public.citations c
+                WHERE c.citation_number >= b.lo
+                  AND c.citation_number < b.hi
+                  AND c.issue_date >= now() - make_interval(days => %(days)s)
+            ) st
+            CROSS JOIN LATERAL (
+                SELECT array_agg(m.citation_number) AS miss_numbers,
+                       array_agg(m.miss_count) AS miss_counts,
+                       array_agg(m.last_probed_at) AS miss_probed_at
+                FROM public.citation_probe_misses m
+                WHERE m.citation_number BETWEEN w.win_lo AND least(w.win_hi + %(ahead)s, b.hi - 1)
+            ) ms
+        """
+        params = {
+            'labels': [r[0] for r in ranges],
+            'lows': [r[1] for r in ranges],
+            'highs': [r[2] for r in ranges],
+            'centers': [r[3] for r in ranges],
+            'behind': behind,
+            'ahead': ahead,
+            'days': lookback_days,
+            'include_existing': include_existing,
+        }
+        try:
+            with self._connection() as conn, conn.cursor() as cur:
+                cur.execute(query, params)
+                rows = cur.fetchall()
+        except Exception as e:
+            logger.error(f"Failed to load range snapshot: {e}")
+            return {}
+
+        snapshot = {}
+        for row in rows:
+            misses = {}
+            for num, count, probed_at in zip(row['miss_numbers'] or [], row['miss_counts'] or [], row['miss_probed_at'] or []):
+                misses[int(num)] = (int(count), probed_at)
+            snapshot[row['label']] = {
+                'max': self._to_int(row['db_max']),
+                'existing': {int(n) for n in row['existing']},
+                'stats': self._issuance_stats(row, lookback_days),
+                'misses': misses,
+            }
+        return snapshot
+
+    def get_probe_misses(self, spans: List[Tuple[int, int]]) -> Dict[int, Tuple[int, datetime]]:
+        """Return {citation_number: (miss_count, last_probed_at)} for cached misses in the inclusive spans."""
+        if not spans:
+            return {}
+        query = """
+            SELECT m.citation_number, m.miss_count, m.last_probed_at
+            FROM unnest(%(lows)s::bigint[], %(highs)s::bigint[]) AS s(lo, hi)
+            JOIN public.citation_probe_misses m
+              ON m.citation_number BETWEEN s.lo AND s.hi
+        """
+        try:
+            with self._connection() as conn, conn.cursor() as cur:
+                cur.execute(query, {'lows': [s[0] for s in spans], 'highs': [s[1] for s in spans]})
+                rows = cur.fetchall()
+        except Exception as e:
+            logger.error(f"Failed to load probe misses: {e}")
+            return {}
+        return {int(row['citation_number']): (int(row['miss_count']), row['last_probed_at']) for row in rows}
+
+    def record_probe_results(self, misses: List[int], hits: List[int]) -> None:
+        """Bump miss counts for numbers that returned no results and forget numbers that hit."""
+        try:
+            with self._connection() as conn, conn.transaction(), conn.cursor() as cur:
+                if misses:
+                    cur.execute(
+                        """
+                        INSERT INTO public.citation_probe_misses AS m (citation_number, miss_count, last_probed_at)
+                        SELECT n, 1, now() FROM unnest(%s::bigint[]) AS n
+                        ON CONFLICT (citation_number) DO UPDATE
+                           SET miss_count = m.miss_count + 1,
+                               last_probed_at = excluded.last_probed_at
+                        """,
+                        (sorted(set(misses)),),
+                    )
+                if hits:
+                    cur.execute(
+                        "DELETE FROM public.citation_probe_misses WHERE citation_number = ANY(%s::bigint[])",
+                        (list(set(hits)),),
+                    )
+        except Exception as e:
+            logger.error(f"Failed to record probe results: {e}")
+
+    def get_ocr_result(self, image_sha256: str, config_version: int) -> Optional[Dict]:
+        """Return a shared OCR cache entry ({'parser_version', 'lines', 'fields'}) or None."""
+        try:
+            with self._connection() as conn, conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT parser_version, lines, fields
+                    FROM public.ocr_results
+                    WHERE image_sha256 = %s AND config_version = %s
+                    """,
+                    (image_sha256, config_version),
+                )
+                return cur.fetchone()
+        except Exception as e:
+            logger.debug(f"OCR cache lookup failed for {image_sha256}: {e}")
+            return None
+
+    def save_ocr_results(self, entries: List[Tuple[str, List[Dict], Dict]], config_version: int, parser_version: int) -> None:
+        """Upsert (image_sha256, lines, fields) OCR cache entries into the shared ocr_results table."""
+        if not entries:
+            return
+        try:
+            with self._connection() as conn, conn.cursor() as cur:
+                cur.executemany(
+                    """
+                    INSERT INTO public.ocr_results (image_sha256, config_version, parser_version, lines, fields)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON CONFLICT (image_sha256, config_version) DO UPDATE
+                       SET parser_version = excluded.parser_version,
+                           lines = excluded.lines,
+                           fields = excluded.fields,
+                           updated_at = now()
+                    """,
+                    [(sha, config_version, parser_version, Jsonb(lines), Jsonb(fields)) for sha, lines, fields in entries],
+                )
+        except Exception as e:
+            logger.error(f"Failed to save {len(entries)} OCR cache entries: {e}")
+
+    def get_officer_backfill_batch(self, before: Optional[int] = None, limit: int = 100, retry_misses: bool = False) -> List[Dict]:
+        """Citations with receipt images but no officer info, newest first, below `before` (keyset page).
+
+        Rows whose receipt was already OCR'd without finding officer info (officer_info_extracted_at
+        set, officer_badge still NULL) are skipped unless retry_misses is set.
+        """
+        query = """
+            SELECT citation_number, image_urls
+            FROM public.citations
+            WHERE officer_badge IS NULL
+              AND jsonb_typeof(image_urls) = 'array'
+              AND jsonb_array_length(image_urls) > 0
+              AND (%(retry)s OR officer_info_extracted_at IS NULL)
+              AND (%(before)s::bigint IS NULL OR citation_number < %(before)s::bigint)
+            ORDER BY citation_number DESC
+            LIMIT %(limit)s
+        """
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute(query, {'before': before, 'limit': limit, 'retry': retry_misses})
+            return cur.fetchall()
+
+    def save_officer_info(self, results: List[Tuple[int, Dict]]) -> int:
+        """Write OCR'd officer fields for many citations in one statement; returns rows updated.
+
+        Every citation gets officer_info_extracted_at = now(), including those where OCR found
+        nothing, so get_officer_backfill_batch does not hand them out again. Existing values
+        are never overwritten with NULL.
+        """
+        if not results:
+            return 0
+        numbers = [number for number, _ in results]
+        with self._connection() as conn, conn.transaction(), conn.cursor() as cur:
+            snapshot = self._snapshot_officer_stats(cur, numbers)
+            cur.execute(
+                """
+                UPDATE public.citations AS c
+                   SET officer_badge = COALESCE(r.badge, c.officer_badge),
+                       officer_name = COALESCE(r.name, c.officer_name),
+                       officer_beat = COALESCE(r.beat, c.officer_beat),
+                       officer_info_extracted_at = now()
+                FROM unnest(%s::bigint[], %s::text[], %s::text[], %s::text[]) AS r(citation_number, badge, name, beat)
+                WHERE c.citation_number = r.citation_number
+                RETURNING (c.issue_date AT TIME ZONE 'UTC')::date AS day, r.name IS NOT NULL AS named
+                """,
+                (
+                    numbers,
+                    [info.get('officer_badge') for _, info in results],
+                    [info.get('officer_name') for _, info in results],
+                    [info.get('officer_beat') for _, info in results],
+                ),
+            )
+            updated = cur.fetchall()
+            # Only a newly read officer name moves the officer leaderboard
+            self._refresh_fun_fact_rollups(cur, [row['day'] for row in updated if row['named'] and row['day']])
+            if snapshot:
+                self._apply_officer_stats_delta(cur, numbers)
+            return len(updated)
 
     def log_scrape_attempt(self, citation_number: int, success: bool, error_message: str = None):
         """Log a scrape attempt"""
@@ -668,70 +1466,56 @@ class DatabaseManager:
     # Subscriptions
     def get_officer_stats(self, officer_name: str, officer_badge: str) -> Dict:
         """
-        Get statistics for a specific officer (citation count, photo count).
-        Returns a dict with 'total_citations' and 'total_photos'.
+        Get statistics for a specific officer, matched by badge if known, otherwise by name.
+
+        Read from the officer_stats table kept current at ingest; an officer missing from it
+        is counted directly from citations (indexed on badge and name).
+        Returns a dict with 'total_citations', 'total_photos', 'total_revenue',
+        'first_seen' and 'last_seen'.
         """
-        stats = {'total_citations': 0, 'total_photos': 0}
-        
+        stats = {'total_citations': 0, 'total_photos': 0, 'total_revenue': 0.0, 'first_seen': None, 'last_seen': None}
+
+        key_type, officer_key = ('badge', officer_badge) if officer_badge else ('name', officer_name)
+        officer_key = (officer_key or '').strip()
         # We need at least one identifier
-        if not officer_name and not officer_badge:
+        if not officer_key:
             return stats
-            
+
         try:
-            # Build query
-            query = self.supabase.table('citations').select('image_urls', count='exact')
-            
-            # Filter by badge if available (more precise), otherwise name
-            # If both are present, we might want to prioritize badge or match both? 
-            # Given the data quality, matching one might be safer. Let's try matching badge if present, else name.
-            if officer_badge:
-                query = query.eq('officer_badge', officer_badge)
-            elif officer_name:
-                query = query.eq('officer_name', officer_name)
-                
-            # Execute count query first for total reviews/citations
-            # We want all records, not just a page. But selecting all rows for images might be heavy.
-            # Strategy: 
-            # 1. Get exact count of citations (reviews)
-            # 2. To get photo count, we ideally want to sum the lengths of image_urls arrays.
-            #    Doing this client-side (in python) requires fetching all rows.
-            #    Let's fetch just the image_urls column for all matching records.
-            
-            # Fetch all image_urls for this officer
-            # Note: If an officer has thousands of tickets, this fetch might be large.
-            # But the payload is just the list of lists of URLs.
-            # Let's paginate if necessary or just hope limit is high enough? 
-            # Supabase default limit is 1000. We better loop or use a stored procedure.
-            # For simplicity in this "fun" feature, let's just fetch up to 1000 for now to estimate photos.
-            # Or better, we can use the count from step 1 for citations, and sample photos?
-            # User asked for "calculate how many photos".
-            
-            # Let's try a single fetch with a reasonable limit (e.g. 5000)
-            result = query.limit(5000).execute()
-            
-            if result.count is not None:
-                stats['total_citations'] = result.count
-            
-            # Calculate total photos from the returned batch
-            photo_count = 0
-            if result.data:
-                for row in result.data:
-                    urls = row.get('image_urls')
-                    if urls:
-                        if isinstance(urls, list):
-                            photo_count += len(urls)
-                        elif isinstance(urls, str):
-                            # In case it's a JSON string (shouldn't be with python client but safety first)
-                            # Actually python client returns parsed JSON usually
-                            pass
-            
-            # If we hit the limit, this is a lower bound, which is fine for "reviews"
-            stats['total_photos'] = photo_count
-            
-            # If we have 0 citations, return 0
-            if stats['total_citations'] == 0:
-                pass
-                
+            with self._connection() as conn, conn.cursor() as cur:
+                row = None
+                try:
+                    cur.execute(
+                        """
+                        SELECT total_citations, total_photos, total_revenue, first_seen, last_seen
+                        FROM public.officer_stats
+                        WHERE key_type = %s AND officer_key = %s
+                        """,
+                        (key_type, officer_key),
+                    )
+                    row = cur.fetchone()
+                except Exception as e:
+                    logger.debug(f"officer_stats lookup failed, counting citations instead: {e}")
+                if row is None:
+                    column = 'officer_badge' if key_type == 'badge' else 'officer_name'
+                    cur.execute(
+                        f"""
+                        SELECT count(*) AS total_citations,
+                               coalesce(sum(CASE WHEN jsonb_typeof(image_urls) = 'array' THEN jsonb_array_length(image_urls) END), 0) AS total_photos,
+                               coalesce(sum(amount_due), 0) AS total_revenue,
+                               min(issue_date) AS first_seen, max(issue_date) AS last_seen
+                        FROM public.citations
+                        WHERE {column} = %s
+                        """,
+                        (officer_badge if key_type == 'badge' else officer_name,),
+                    )
+                    row = cur.fetchone()
+
+            stats['total_citations'] = int(row['total_citations'] or 0)
+            stats['total_photos'] = int(row['total_photos'] or 0)
+            stats['total_revenue'] = self._to_float(row['total_revenue']) or 0.0
+            stats['first_seen'] = row['first_seen'].isoformat() if row['first_seen'] else None
+            stats['last_seen'] = row['last_seen'].isoformat() if row['last_seen'] else None
             return stats
 
         except Exception as e:
@@ -862,12 +1646,8 @@ class DatabaseManager:
             logger.error(f"Failed to deactivate location subscription: {e}")
             raise
 
-    def find_active_location_subscriptions_for_point(self, lat: float, lon: float) -> List[Dict]:
-        """Return active location subscriptions whose radius covers the provided point.
-
-        Note: We filter coarse candidates in SQL-like fashion in app by reading subs of type 'location',
-        then apply precise haversine distance here.
-        """
+    def get_active_location_subscriptions(self) -> List[Dict]:
+        """Return every active location subscription with a center and radius."""
         try:
             result = (
                 self.supabase
@@ -880,30 +1660,148 @@ class DatabaseManager:
                 .not_.is_('radius_m', 'null')
                 .execute()
             )
-            subs = result.data or []
+            return result.data or []
         except Exception as e:
             logger.error(f"Failed to load location subscriptions: {e}")
             return []
 
-        import math
-        def haversine_m(lat1, lon1, lat2, lon2):
-            R = 6371000.0
-            phi1 = math.radians(lat1)
-            phi2 = math.radians(lat2)
-            dphi = math.radians(lat2 - lat1)
-            dlambda = math.radians(lon2 - lon1)
-            a = math.sin(dphi/2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda/2)**2
-            return 2 * R * math.asin(math.sqrt(a))
-
-        matched = []
-        for s in subs:
-            try:
-                d = haversine_m(lat, lon, float(s['center_lat']), float(s['center_lon']))
-                if d <= float(s['radius_m']):
-                    matched.append(s)
-            except Exception:
-                continue
-        return matched
+    def find_active_location_subscriptions_for_point(self, lat: float, lon: float) -> List[Dict]:
+        """Return active location subscriptions whose radius covers the provided point.
+
+        Loads every subscription for a single lookup; to match many points, build one
+        LocationSubscriptionIndex and reuse it.
+        """
+        return LocationSubscriptionIndex(self.get_active_location_subscriptions()).match(lat, lon)
+
+    def iter_citation_locations(self, batch_size: int = 10000):
+        """Yield every non-null citations.location in citation_number order (server-side cursor)."""
+        with self._connection() as conn, conn.transaction(), conn.cursor(name='citation_locations') as cur:
+            cur.itersize = batch_size
+            cur.execute("SELECT location FROM public.citations WHERE location IS NOT NULL ORDER BY citation_number")
+            for row in cur:
+                yield row['location']
+
+    def get_geocoded_locations(self) -> List[Dict]:
+        """Distinct citation locations with their average stored coordinates ({'location', 'latitude', 'longitude'})."""
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT location, avg(latitude) AS latitude, avg(longitude) AS longitude
+                FROM public.citations
+                WHERE location IS NOT NULL AND latitude IS NOT NULL AND longitude IS NOT NULL
+                GROUP BY location
+                """
+            )
+            return cur.fetchall()
+
+    def get_geocode_cache_keys(self, source: str) -> set:
+        """address_key of every geocode_cache row resolved by the given source."""
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT address_key FROM public.geocode_cache WHERE source = %s", (source,))
+            return {row['address_key'] for row in cur.fetchall()}
+
+    def load_geocode_cache(self, limit: int = 20000) -> List[Dict]:
+        """Most recently used geocode_cache rows, newest first."""
+        try:
+            with self._connection() as conn, conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT address_key, latitude, longitude, source, confidence, resolved, updated_at
+                    FROM public.geocode_cache
+                    ORDER BY updated_at DESC
+                    LIMIT %s
+                    """,
+                    (limit,),
+                )
+                return cur.fetchall()
+        except Exception as e:
+            logger.error(f"Failed to preload geocode cache: {e}")
+            return []
+
+    def get_geocode_entry(self, address_key: str) -> Optional[Dict]:
+        """One geocode_cache row by normalised address key, or None."""
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT address_key, latitude, longitude, source, confidence, resolved, updated_at
+                FROM public.geocode_cache
+                WHERE address_key = %s
+                """,
+                (address_key,),
+            )
+            return cur.fetchone()
+
+    def save_geocode_entries(self, rows: List[Tuple[str, Optional[float], Optional[float], str, Optional[float], bool]]) -> None:
+        """Upsert (address_key, latitude, longitude, source, confidence, resolved) rows into geocode_cache.
+
+        A negative entry never replaces a resolved one.
+        """
+        if not rows:
+            return
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO public.geocode_cache AS g (address_key, latitude, longitude, source, confidence, resolved, updated_at)
+                SELECT k, lat, lon, src, conf, ok, now()
+                FROM unnest(%s::text[], %s::float8[], %s::float8[], %s::text[], %s::real[], %s::boolean[])
+                     AS r(k, lat, lon, src, conf, ok)
+                ON CONFLICT (address_key) DO UPDATE
+                   SET latitude = excluded.latitude,
+                       longitude = excluded.longitude,
+                       source = excluded.source,
+                       confidence = excluded.confidence,
+                       resolved = excluded.resolved,
+                       updated_at = excluded.updated_at
+                 WHERE excluded.resolved OR NOT g.resolved
+                """,
+                tuple(list(column) for column in zip(*rows)),
+            )
+
+    def delete_geocode_entries(self, address_keys: List[str]) -> None:
+        """Remove geocode_cache rows by key (used when keys are re-canonicalised)."""
+        if not address_keys:
+            return
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute("DELETE FROM public.geocode_cache WHERE address_key = ANY(%s::text[])", (address_keys,))
+
+    def get_geocode_backfill_batch(self, after: Optional[int] = None, limit: int = 5000, since: Optional[datetime] = None,
+                                   include_geocoded: bool = False) -> List[Dict]:
+        """Next keyset page of (citation_number, location) above `after` still needing coordinates.
+
+        include_geocoded returns every located row (for re-geocoding); since limits to rows
+        scraped at or after that time.
+        """
+        query = """
+            SELECT citation_number, location
+            FROM public.citations
+            WHERE location IS NOT NULL
+              AND (%(all)s OR latitude IS NULL OR longitude IS NULL)
+              AND (%(since)s::timestamptz IS NULL OR scraped_at >= %(since)s::timestamptz)
+              AND (%(after)s::bigint IS NULL OR citation_number > %(after)s::bigint)
+            ORDER BY citation_number
+            LIMIT %(limit)s
+        """
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute(query, {'after': after, 'limit': limit, 'since': since, 'all': include_geocoded})
+            return cur.fetchall()
+
+    def update_citation_coords(self, rows: List[Tuple[int, float, float]]) -> int:
+        """Set latitude/longitude/geocoded_at for many citations in one statement; returns rows updated."""
+        if not rows:
+            return 0
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE public.citations AS c
+                   SET latitude = r.lat,
+                       longitude = r.lon,
+                       geocoded_at = now()
+                FROM unnest(%s::bigint[], %s::float8[], %s::float8[]) AS r(citation_number, lat, lon)
+                WHERE c.citation_number = r.citation_number
+                """,
+                ([int(n) for n, _, _ in rows], [lat for _, lat, _ in rows], [lon for _, _, lon in rows]),
+            )
+            return cur.rowcount
 
     def get_cached_coords_for_location(self, location: str) -> Optional[Tuple[float, float]]:
         """Return (lat, lon) for a location if any citation has already been geocoded.
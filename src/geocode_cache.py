@@ -0,0 +1,131 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from address_canonicalizer import address_key
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class GeocodeCache:
+    """Canonical address key (address_canonicalizer.address_key) -> coordinates, in an in-process LRU backed by the geocode_cache table.
+
+    Entries are (coords, source, confidence, updated_at); coords is None for a negative entry,
+    i.e. an address no geocoder could resolve. Negative entries expire after negative_ttl_hours
+    so fixes on the Nominatim side are eventually picked up.
+
+    preload() pulls the most recently used entries once per run. When the whole table fits in
+    the LRU a miss is final; otherwise misses fall through to one indexed lookup. New entries
+    are buffered and written in one upsert by flush().
+    """
+
+    def __init__(self, db_manager=None, max_entries: Optional[int] = None, negative_ttl_hours: Optional[float] = None):
+        if max_entries is None:
+            max_entries = int(os.getenv('GEOCODE_CACHE_SIZE', '20000'))
+        if negative_ttl_hours is None:
+            negative_ttl_hours = float(os.getenv('GEOCODE_NEGATIVE_TTL_HOURS', '168'))
+        self.db_manager = db_manager
+        self.max_entries = max(1, max_entries)
+        self.negative_ttl = timedelta(hours=negative_ttl_hours)
+        self._entries: 'OrderedDict[str, Tuple[Optional[Tuple[float, float]], str, Optional[float], datetime]]' = OrderedDict()
+        self._pending: Dict[str, Tuple[Optional[Tuple[float, float]], str, Optional[float]]] = {}
+        self._complete = db_manager is None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def preload(self) -> int:
+        """Load up to max_entries rows from the geocode_cache table; returns how many were loaded."""
+        if self.db_manager is None:
+            return 0
+        rows = self.db_manager.load_geocode_cache(limit=self.max_entries)
+        with self._lock:
+            # Rows arrive most recently used first; insert oldest first so LRU order matches
+            for row in reversed(rows):
+                self._entries[row['address_key']] = self._entry_from_row(row)
+            self._complete = len(rows) < self.max_entries
+        logger.info(f"Geocode cache: preloaded {len(rows)} address(es)")
+        return len(rows)
+
+    @staticmethod
+    def _entry_from_row(row: Dict):
+        coords = None
+        if row.get('resolved') and row.get('latitude') is not None and row.get('longitude') is not None:
+            coords = (float(row['latitude']), float(row['longitude']))
+        return coords, row.get('source'), row.get('confidence'), row.get('updated_at') or datetime.now(timezone.utc)
+
+    def _remember(self, key: str, entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._complete = False
+
+    def lookup(self, address: str):
+        """Return the cached entry for an address, or None if it has never been geocoded.
+
+        A hit is (coords, source, confidence, updated_at) with coords None for a known failure.
+        Expired negative entries count as misses.
+        """
+        key = address_key(address)
+        if not key:
+            return None
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                self._entries.move_to_end(key)
+            complete = self._complete
+        if entry is _MISSING and not complete:
+            try:
+                row = self.db_manager.get_geocode_entry(key)
+            except Exception as e:
+                logger.debug(f"Geocode cache lookup failed for '{key}': {e}")
+                row = None
+            entry = self._entry_from_row(row) if row else None
+            with self._lock:
+                if entry is not None:
+                    self._remember(key, entry)
+        elif entry is _MISSING:
+            entry = None
+
+        if entry is None or (entry[0] is None and datetime.now(timezone.utc) - entry[3] >= self.negative_ttl):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def get(self, address: str) -> Tuple[bool, Optional[Tuple[float, float]]]:
+        """(known, coords): known is False when the address still needs geocoding."""
+        entry = self.lookup(address)
+        if entry is None:
+            return False, None
+        return True, entry[0]
+
+    def store(self, address: str, coords: Optional[Tuple[float, float]], source: str, confidence: Optional[float] = None) -> None:
+        """Record a geocoding result; pass coords=None to record that the address could not be resolved."""
+        key = address_key(address)
+        if not key:
+            return
+        with self._lock:
+            self._remember(key, (coords, source, confidence, datetime.now(timezone.utc)))
+            self._pending[key] = (coords, source, confidence)
+
+    def flush(self) -> None:
+        """Write entries stored since the last flush to the geocode_cache table."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending or self.db_manager is None:
+            return
+        rows: List[Tuple] = [
+            (key, coords[0] if coords else None, coords[1] if coords else None, source, confidence, coords is not None)
+            for key, (coords, source, confidence) in pending.items()
+        ]
+        try:
+            self.db_manager.save_geocode_entries(rows)
+        except Exception as e:
+            logger.error(f"Failed to save {len(rows)} geocode cache entries: {e}")
@@ -3,6 +3,8 @@ import logging
 from typing import Optional, Tuple
 import time
 
+from address_canonicalizer import canonical_address
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,7 +20,7 @@ class Geocoder:
     def geocode_address(self, address: str) -> Optional[Tuple[float, float]]:
         """
         Geocode an address and return (latitude, longitude) tuple.
-        Tries multiple variations if the first attempt fails.
+        Tries the canonical spelling (see address_canonicalizer) and then the original.
         
         Args:
             address: Address string to geocode
@@ -26,23 +28,28 @@ class Geocoder:
         Returns:
             Tuple of (latitude, longitude) or None if geocoding fails
         """
+        return self.geocode_with_status(address)[0]
+
+    def geocode_with_status(self, address: str) -> Tuple[Optional[Tuple[float, float]], bool]:
+        """
+        Like geocode_address, but also says whether a None result is definitive.
+
+        Returns:
+            (coords, definitive): definitive is False when a request failed (network error,
+            HTTP error, rate limiting), so a missing result should not be cached as a miss.
+        """
         if not address:
-            return None
-        
-        # Prepare base address
-        if 'Ann Arbor' not in address:
-            base_address = f"{address}, Ann Arbor, MI"
-        else:
-            base_address = address
+            return None, True
         
-        # Try multiple variations
-        variations = [
-            base_address,  # Original
-            base_address.replace(' St ', ' Ave '),  # Try Ave instead of St
-            base_address.replace(' St ', ' St'),  # Try without space before St
-            base_address.replace('St ', 'Ave '),  # Try Ave instead of St
-        ]
+        # Query the canonical spelling first, then the string as given if it differs
+        variations = []
+        for candidate in (canonical_address(address), ' '.join(address.split())):
+            if 'Ann Arbor' not in candidate:
+                candidate = f"{candidate}, Ann Arbor, MI"
+            if candidate not in variations:
+                variations.append(candidate)
         
+        definitive = True
         for search_address in variations:
             try:
                 # Add delay to respect rate limits
@@ -64,14 +71,15 @@ class Geocoder:
                     lat = float(data[0]['lat'])
                     lon = float(data[0]['lon'])
                     logger.info(f"Geocoded '{address}' to ({lat}, {lon}) using variation: {search_address}")
-                    return (lat, lon)
+                    return (lat, lon), True
                 
             except Exception as e:
                 logger.debug(f"Error geocoding variation '{search_address}': {e}")
+                definitive = False
                 continue
         
         logger.warning(f"No geocoding results for '{address}' after trying {len(variations)} variations")
-        return None
+        return None, definitive
     
     def geocode_and_update_citation(self, db_manager, citation_number: int, address: str) -> bool:
         """
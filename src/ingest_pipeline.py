@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from async_scraper import AsyncCitationScraper
+from ocr_cache import OcrResultCache
+from ocr_pool import OcrWorkerPool
+from scraper import CitationScraper, SearchError
+
+logger = logging.getLogger(__name__)
+
+# Sentinel passed down a stage queue once every upstream worker has finished
+_DONE = object()
+
+
+class IngestPipeline:
+    """Staged producer/consumer ingestion: probe -> details -> OCR -> geocode -> batched insert.
+
+    Stages are connected by bounded asyncio queues, so a slow stage applies backpressure
+    upstream instead of buffering without limit. Probing only waits on the portal; receipt
+    images are downloaded on their own threads and Tesseract runs in an OcrWorkerPool of
+    processes, and geocoding/DB work uses a separate I/O pool, so none of them can stall
+    the search loop while the queues have room.
+
+    Callbacks supplied by the caller:
+      - on_probe(label, citation_number, found): called on the event loop thread for every probe
+        the portal answered (failed searches are not reported); may return further
+        (label, citation_number) jobs to probe, e.g. to advance a frontier
+      - on_probe_error(label, citation_number): called instead of on_probe when the search failed;
+        may likewise return further jobs
+      - geocode(result): fills latitude/longitude on the result dict (runs on the I/O pool)
+      - on_citation(label, result): per-citation bookkeeping/notifications before insert
+      - flush(batch): persists a list of citations
+    on_citation and flush are called one at a time, in order, from the single writer stage.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncCitationScraper,
+        geocode: Callable[[Dict], None],
+        on_citation: Callable[[str, Dict], None],
+        flush: Callable[[List[Dict]], None],
+        on_probe: Optional[Callable[[str, int, bool], Optional[Iterable[Tuple[str, int]]]]] = None,
+        on_probe_error: Optional[Callable[[str, int], Optional[Iterable[Tuple[str, int]]]]] = None,
+        details_concurrency: Optional[int] = None,
+        ocr_workers: Optional[int] = None,
+        geocode_concurrency: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        ocr_cache: Optional[OcrResultCache] = None,
+    ):
+        self.engine = engine
+        self.geocode = geocode
+        self.on_citation = on_citation
+        self.flush = flush
+        self.on_probe = on_probe
+        self.on_probe_error = on_probe_error
+        self.details_concurrency = details_concurrency or int(os.getenv('PIPELINE_DETAILS_CONCURRENCY', '4'))
+        self.ocr_workers = ocr_workers or int(os.getenv('PIPELINE_OCR_WORKERS', os.getenv('OCR_POOL_WORKERS', str(os.cpu_count() or 2))))
+        self.geocode_concurrency = geocode_concurrency or int(os.getenv('PIPELINE_GEOCODE_CONCURRENCY', '2'))
+        self.queue_size = queue_size or int(os.getenv('PIPELINE_QUEUE_SIZE', '100'))
+        self.batch_size = batch_size or int(os.getenv('PIPELINE_BATCH_SIZE', '25'))
+        self.ocr_cache = ocr_cache
+        self._download_executor: Optional[ThreadPoolExecutor] = None
+        self._io_executor: Optional[ThreadPoolExecutor] = None
+        self._ocr_pool: Optional[OcrWorkerPool] = None
+        # One scraper (session) per OCR stage worker for downloading receipt images
+        self._ocr_scrapers: Optional[asyncio.Queue] = None
+        self._probe_q: Optional[asyncio.Queue] = None
+        self._probe_pending = 0
+        self._probe_workers = 0
+
+    async def _stage(self, name: str, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue], workers: int, handle, downstream_workers: int) -> None:
+        """Run `workers` consumers of inbox, forwarding non-None results to outbox."""
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    return
+                try:
+                    out = await handle(item)
+                except Exception as e:
+                    logger.error(f"[{name}] Failed on citation {item[1]}: {e}")
+                    continue
+                if out is not None and outbox is not None:
+                    await outbox.put(out)
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        if outbox is not None:
+            for _ in range(downstream_workers):
+                await outbox.put(_DONE)
+
+    def _enqueue_probe(self, job: Tuple[str, int]) -> None:
+        self._probe_pending += 1
+        self._probe_q.put_nowait(job)
+
+    async def _probe(self, job: Tuple[str, int]):
+        label, citation_num = job
+        try:
+            try:
+                result = await self.engine.run(CitationScraper.search_summary, str(citation_num))
+            except SearchError as e:
+                # A failed search says nothing about whether the number exists, so it is not reported as a miss
+                logger.warning(f"[{label}] Search failed for citation {citation_num}: {e}")
+                if self.on_probe_error:
+                    for follow_up in self.on_probe_error(label, citation_num) or ():
+                        self._enqueue_probe(follow_up)
+                return None
+            if self.on_probe:
+                for follow_up in self.on_probe(label, citation_num, bool(result)) or ():
+                    self._enqueue_probe(follow_up)
+            if not result:
+                logger.debug(f"[{label}] No results for citation {citation_num}")
+                return None
+            return label, citation_num, result
+        finally:
+            # The probe queue is open-ended, so close it once nothing is queued or in flight
+            self._probe_pending -= 1
+            if self._probe_pending == 0:
+                for _ in range(self._probe_workers):
+                    self._probe_q.put_nowait(_DONE)
+
+    async def _fetch_details(self, item):
+        label, citation_num, result = item
+        if result.get('more_info_url'):
+            details = await self.engine.run(CitationScraper.fetch_details_page, result['more_info_url'], False)
+            if details:
+                result.update(details)
+        return item
+
+    async def _ocr(self, item):
+        label, citation_num, result = item
+        if not result.get('image_urls'):
+            return item
+        scraper = await self._ocr_scrapers.get()
+        try:
+            loop = asyncio.get_running_loop()
+            image_bytes = await loop.run_in_executor(self._download_executor, scraper.download_receipt, result['image_urls'][-1])
+            receipt = await self._ocr_pool.analyze_async(image_bytes)
+            # None means OCR did not run; the citation is stored without receipt fields
+            if receipt is not None:
+                scraper.merge_receipt_info(result, receipt)
+        finally:
+            self._ocr_scrapers.put_nowait(scraper)
+        return item
+
+    async def _geocode(self, item):
+        label, citation_num, result = item
+        if result.get('location'):
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._io_executor, self.geocode, result)
+        return item
+
+    async def _write(self, inbox: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        batch: List[Dict] = []
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                break
+            label, citation_num, result = item
+            try:
+                await loop.run_in_executor(self._io_executor, self.on_citation, label, result)
+            except Exception as e:
+                logger.error(f"[write] Failed handling citation {citation_num}: {e}")
+            batch.append(result)
+            if len(batch) >= self.batch_size:
+                await loop.run_in_executor(self._io_executor, self.flush, batch)
+                batch = []
+        if batch:
+            await loop.run_in_executor(self._io_executor, self.flush, batch)
+
+    async def run(self, jobs: Iterable[Tuple[str, int]]) -> None:
+        probe_workers = self.engine.max_concurrency_per_host
+        probe_q: asyncio.Queue = asyncio.Queue()
+        self._probe_q = probe_q
+        self._probe_workers = probe_workers
+        self._probe_pending = 0
+        for job in jobs:
+            self._enqueue_probe(job)
+        if self._probe_pending == 0:
+            for _ in range(probe_workers):
+                probe_q.put_nowait(_DONE)
+        details_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        ocr_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        geocode_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        write_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        self._download_executor = ThreadPoolExecutor(max_workers=self.ocr_workers, thread_name_prefix='receipt')
+        self._ocr_pool = OcrWorkerPool(workers=self.ocr_workers, cache=self.ocr_cache)
+        self._ocr_pool.start()
+        self._io_executor = ThreadPoolExecutor(max_workers=self.geocode_concurrency + 1, thread_name_prefix='ingest-io')
+        self._ocr_scrapers = asyncio.Queue()
+        for _ in range(self.ocr_workers):
+            self._ocr_scrapers.put_nowait(CitationScraper(rate_limiter=self.engine.rate_limiter, token_manager=self.engine.token_manager))
+        try:
+            async with self.engine:
+                await asyncio.gather(
+                    self._stage('probe', probe_q, details_q, probe_workers, self._probe, self.details_concurrency),
+                    self._stage('details', details_q, ocr_q, self.details_concurrency, self._fetch_details, self.ocr_workers),
+                    self._stage('ocr', ocr_q, geocode_q, self.ocr_workers, self._ocr, self.geocode_concurrency),
+                    self._stage('geocode', geocode_q, write_q, self.geocode_concurrency, self._geocode, 1),
+                    self._write(write_q),
+                )
+        finally:
+            self._download_executor.shutdown(wait=True)
+            self._ocr_pool.shutdown()
+            if self.ocr_cache is not None:
+                self.ocr_cache.flush()
+            self._io_executor.shutdown(wait=True)
+
+    def run_sync(self, jobs: List[Tuple[str, int]]) -> None:
+        """Synchronous entry point for cron scripts."""
+        logger.info(
+            f"Ingesting {len(jobs)} initial candidate citations: probe={self.engine.max_concurrency_per_host}, "
+            f"details={self.details_concurrency}, ocr={self.ocr_workers}, geocode={self.geocode_concurrency}, "
+            f"queue={self.queue_size}, batch={self.batch_size}"
+        )
+        asyncio.run(self.run(jobs))
@@ -0,0 +1,193 @@
+import json
+import logging
+import math
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from address_canonicalizer import address_key, split_address
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STREET_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.cache', 'street_index.json')
+
+# Points outside this box are bad geocodes (Nominatim matching another Main St) and are ignored
+ANN_ARBOR_BOUNDS = (42.20, -83.85, 42.35, -83.65)
+# Largest house-number gap interpolated across, and the confidence for close/far neighbours
+MAX_INTERPOLATION_GAP = 400
+CLOSE_GAP = 100
+# Neighbours further apart than this are assumed to be on disconnected pieces of the street
+MAX_SPAN_METERS = 1500
+# Numbers this close past the last known point on a street snap to it
+NEAR_END = 20
+
+
+def parse_street_address(address: str) -> Optional[Tuple[int, str]]:
+    """Split "800 South Forest Ave, Ann Arbor, MI" into (800, 'S FOREST AVE'); None without a house number."""
+    parsed = split_address(address)
+    if parsed is None:
+        return None
+    number, street = parsed
+    return number, street.upper()
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    r = 6371000.0
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dphi = p2 - p1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dlmb / 2) ** 2
+    return 2 * r * math.asin(math.sqrt(a))
+
+
+def _in_bounds(lat: float, lon: float) -> bool:
+    south, west, north, east = ANN_ARBOR_BOUNDS
+    return south <= lat <= north and west <= lon <= east
+
+
+class LocalGeocoder:
+    """Offline geocoder interpolating house numbers along streets we have already geocoded.
+
+    The index maps a normalised street name to its known (house_number, lat, lon) points,
+    sorted by number, built from the coordinates stored on past citations. Addresses the
+    index answered itself are left out, so its estimates never come back as known points.
+    An address is answered from the point with the same number, by linear interpolation
+    between the nearest known numbers on the same side of the street (then either side), or
+    by snapping to the end of the known stretch when it is just past it. Anything else,
+    including streets never seen, returns None so the caller can ask Nominatim.
+    """
+
+    def __init__(self, streets: Optional[Dict[str, List[Tuple[int, float, float]]]] = None, built_at: Optional[float] = None):
+        self.streets: Dict[str, List[Tuple[int, float, float]]] = {
+            street: sorted(points) for street, points in (streets or {}).items()
+        }
+        self.built_at = built_at or time.time()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[str, float, float]]) -> 'LocalGeocoder':
+        """Build from (address, lat, lon) rows; coordinates for the same address are averaged."""
+        sums: Dict[Tuple[str, int], List[float]] = {}
+        for address, lat, lon in rows:
+            if lat is None or lon is None:
+                continue
+            lat, lon = float(lat), float(lon)
+            parsed = parse_street_address(address)
+            if parsed is None or not _in_bounds(lat, lon):
+                continue
+            number, street = parsed
+            acc = sums.setdefault((street, number), [0.0, 0.0, 0])
+            acc[0] += lat
+            acc[1] += lon
+            acc[2] += 1
+        streets: Dict[str, List[Tuple[int, float, float]]] = {}
+        for (street, number), (lat_sum, lon_sum, count) in sums.items():
+            streets.setdefault(street, []).append((number, lat_sum / count, lon_sum / count))
+        return cls(streets)
+
+    @classmethod
+    def from_db(cls, db_manager) -> 'LocalGeocoder':
+        """Build from citation coordinates, skipping addresses whose geocode_cache entry came from this index."""
+        local_keys = db_manager.get_geocode_cache_keys('local')
+        return cls.build(
+            (row['location'], row['latitude'], row['longitude'])
+            for row in db_manager.get_geocoded_locations()
+            if address_key(row['location']) not in local_keys
+        )
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_STREET_INDEX_PATH) -> Optional['LocalGeocoder']:
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable street index {path}: {e}")
+            return None
+        streets = {street: [tuple(p) for p in points] for street, points in data.get('streets', {}).items()}
+        return cls(streets, built_at=data.get('built_at'))
+
+    def save(self, path: str = DEFAULT_STREET_INDEX_PATH) -> None:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with self._lock:
+            data = {'built_at': self.built_at, 'streets': self.streets}
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def open(cls, db_manager, path: str = DEFAULT_STREET_INDEX_PATH, max_age_hours: Optional[float] = None) -> Optional['LocalGeocoder']:
+        """Load the index from disk, rebuilding it from the DB when older than max_age_hours.
+
+        A stale file is still used if the rebuild fails; returns None only when neither works.
+        """
+        if max_age_hours is None:
+            max_age_hours = float(os.getenv('STREET_INDEX_MAX_AGE_HOURS', '24'))
+        index = cls.load(path)
+        if index is not None and time.time() - index.built_at < max_age_hours * 3600:
+            return index
+        try:
+            fresh = cls.from_db(db_manager)
+            fresh.save(path)
+            return fresh
+        except Exception as e:
+            logger.warning(f"Could not rebuild street index: {e}")
+            return index
+
+    def __len__(self) -> int:
+        return sum(len(points) for points in self.streets.values())
+
+    def add(self, address: str, lat: float, lon: float) -> None:
+        """Teach the index a freshly geocoded address, so later numbers on that street stay local."""
+        parsed = parse_street_address(address)
+        if parsed is None or not _in_bounds(lat, lon):
+            return
+        number, street = parsed
+        with self._lock:
+            points = self.streets.setdefault(street, [])
+            i = bisect_left(points, (number,))
+            if i < len(points) and points[i][0] == number:
+                return
+            insort(points, (number, lat, lon))
+
+    def geocode(self, address: str) -> Optional[Tuple[float, float, float]]:
+        """Return (lat, lon, confidence) for an address, or None when it cannot be answered locally."""
+        parsed = parse_street_address(address)
+        if parsed is None:
+            return None
+        number, street = parsed
+        with self._lock:
+            points = self.streets.get(street)
+            if not points:
+                return None
+            same_side = [p for p in points if p[0] % 2 == number % 2]
+            candidates = [same_side, points] if len(same_side) < len(points) else [points]
+            for side in candidates:
+                result = self._locate(side, number)
+                if result is not None:
+                    return result
+        return None
+
+    @staticmethod
+    def _locate(points: List[Tuple[int, float, float]], number: int) -> Optional[Tuple[float, float, float]]:
+        if not points:
+            return None
+        i = bisect_left(points, (number,))
+        if i < len(points) and points[i][0] == number:
+            return points[i][1], points[i][2], 1.0
+        if 0 < i < len(points):
+            lo, hi = points[i - 1], points[i]
+            gap = hi[0] - lo[0]
+            if gap <= MAX_INTERPOLATION_GAP and haversine_m(lo[1], lo[2], hi[1], hi[2]) <= MAX_SPAN_METERS:
+                t = (number - lo[0]) / gap
+                confidence = 0.9 if gap <= CLOSE_GAP else 0.7
+                return lo[1] + t * (hi[1] - lo[1]), lo[2] + t * (hi[2] - lo[2]), confidence
+            return None
+        end = points[0] if i == 0 else points[-1]
+        if abs(end[0] - number) <= NEAR_END:
+            return end[1], end[2], 0.6
+        return None
@@ -0,0 +1,121 @@
+import logging
+import math
+from typing import Dict, Iterable, List, Tuple
+
+from local_geocoder import haversine_m
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional, match_many falls back to per-point grid lookups
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Grid cell size in degrees (~1.1 km of latitude, ~0.8 km of longitude in Ann Arbor)
+CELL_DEGREES = 0.01
+# Subscriptions whose circle would span more cells than this are checked against every point instead
+MAX_CELLS_PER_SUBSCRIPTION = 400
+EARTH_RADIUS_M = 6371000.0
+# On the same sphere as the haversine check, so a circle's bounding box never falls short of it
+METERS_PER_DEGREE_LAT = math.radians(1) * EARTH_RADIUS_M
+# Upper bound on points x candidate subscriptions evaluated at once by match_many
+MAX_PAIRS_PER_CHUNK = 1_000_000
+
+
+def _cell(value: float) -> int:
+    return math.floor(value / CELL_DEGREES)
+
+
+class LocationSubscriptionIndex:
+    """Active location subscriptions bucketed into a lat/lon grid, for matching citation points in memory.
+
+    Each subscription is registered in every grid cell its circle's bounding box touches, so a
+    point only needs the exact haversine check against the few subscriptions in its own cell
+    (plus any very wide ones, which are kept in a separate list). match_many does the same
+    for a batch, checking each cell's points against its candidates in one vectorised NumPy
+    pass when NumPy is installed.
+    """
+
+    def __init__(self, subscriptions: Iterable[Dict]):
+        self.subscriptions: List[Dict] = []
+        # (center_lat, center_lon, radius_m) per subscription, parallel to self.subscriptions
+        self._circles: List[Tuple[float, float, float]] = []
+        self._grid: Dict[Tuple[int, int], List[int]] = {}
+        self._wide: List[int] = []
+        for sub in subscriptions:
+            try:
+                circle = (float(sub['center_lat']), float(sub['center_lon']), float(sub['radius_m']))
+            except (KeyError, TypeError, ValueError):
+                continue
+            if circle[2] < 0:
+                continue
+            self._add(sub, circle)
+
+    @classmethod
+    def from_db(cls, db_manager) -> 'LocationSubscriptionIndex':
+        return cls(db_manager.get_active_location_subscriptions())
+
+    def __len__(self) -> int:
+        return len(self.subscriptions)
+
+    def _add(self, sub: Dict, circle: Tuple[float, float, float]) -> None:
+        i = len(self.subscriptions)
+        self.subscriptions.append(sub)
+        self._circles.append(circle)
+        lat, lon, radius = circle
+        dlat = radius / METERS_PER_DEGREE_LAT
+        dlon = radius / (METERS_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6))
+        lat_cells = range(_cell(lat - dlat), _cell(lat + dlat) + 1)
+        lon_cells = range(_cell(lon - dlon), _cell(lon + dlon) + 1)
+        if len(lat_cells) * len(lon_cells) > MAX_CELLS_PER_SUBSCRIPTION:
+            self._wide.append(i)
+            return
+        for y in lat_cells:
+            for x in lon_cells:
+                self._grid.setdefault((y, x), []).append(i)
+
+    def match(self, lat: float, lon: float) -> List[Dict]:
+        """Subscriptions whose radius covers (lat, lon)."""
+        candidates = self._grid.get((_cell(lat), _cell(lon)), [])
+        return [
+            self.subscriptions[i]
+            for i in candidates + self._wide
+            if haversine_m(lat, lon, self._circles[i][0], self._circles[i][1]) <= self._circles[i][2]
+        ]
+
+    def match_many(self, points: Iterable[Tuple[float, float]]) -> List[List[Dict]]:
+        """Match many (lat, lon) points at once; returns one list of subscriptions per point, in order.
+
+        Points are grouped by grid cell, and each group is checked in one vectorised NumPy
+        haversine pass against only its cell's subscriptions plus the wide ones.
+        """
+        points = list(points)
+        matched: List[List[Dict]] = [[] for _ in points]
+        if not points or not self.subscriptions:
+            return matched
+        if np is None:
+            return [self.match(lat, lon) for lat, lon in points]
+
+        by_cell: Dict[Tuple[int, int], List[int]] = {}
+        for i, (lat, lon) in enumerate(points):
+            by_cell.setdefault((_cell(lat), _cell(lon)), []).append(i)
+
+        circles = np.array(self._circles, dtype=float)
+        for cell, point_ids in by_cell.items():
+            candidates = np.array(self._grid.get(cell, []) + self._wide, dtype=int)
+            if candidates.size == 0:
+                continue
+            sub_lat = np.radians(circles[candidates, 0])
+            sub_lon = np.radians(circles[candidates, 1])
+            radii = circles[candidates, 2]
+            chunk = max(1, MAX_PAIRS_PER_CHUNK // candidates.size)
+            for start in range(0, len(point_ids), chunk):
+                ids = point_ids[start:start + chunk]
+                block = np.radians(np.array([points[i] for i in ids], dtype=float))
+                lat = block[:, 0:1]
+                lon = block[:, 1:2]
+                a = np.sin((sub_lat - lat) / 2) ** 2 + np.cos(lat) * np.cos(sub_lat) * np.sin((sub_lon - lon) / 2) ** 2
+                distances = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+                for i, row in zip(ids, distances <= radii):
+                    matched[i] = [self.subscriptions[j] for j in candidates[row]]
+        return matched
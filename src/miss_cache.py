@@ -0,0 +1,74 @@
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MissCache:
+    """Persistent record of citation numbers that came back "No results found".
+
+    Each miss doubles how long the number is left alone before it is probed again
+    (base_minutes, 2x, 4x, ... capped at max_hours), so gaps deep inside a range that
+    were never issued stop costing a request every run. Numbers within `near_frontier`
+    of a range's frontier are always probed, since that is where new citations appear.
+    A hit removes the number from the cache.
+    """
+
+    def __init__(self, entries: Optional[Dict[int, Tuple[int, datetime]]] = None,
+                 base_minutes: Optional[float] = None, max_hours: Optional[float] = None,
+                 near_frontier: Optional[int] = None):
+        if base_minutes is None:
+            base_minutes = float(os.getenv('MISS_CACHE_BASE_MINUTES', '10'))
+        if max_hours is None:
+            max_hours = float(os.getenv('MISS_CACHE_MAX_HOURS', '24'))
+        if near_frontier is None:
+            near_frontier = int(os.getenv('MISS_CACHE_NEAR_FRONTIER', '10'))
+        self.base = timedelta(minutes=base_minutes)
+        self.max_backoff = timedelta(hours=max_hours)
+        self.near_frontier = near_frontier
+        # citation_number -> (miss_count, last_probed_at)
+        self.entries: Dict[int, Tuple[int, datetime]] = entries or {}
+        self._misses: List[int] = []
+        self._hits: List[int] = []
+        self.skipped = 0
+
+    @classmethod
+    def load(cls, db_manager, spans: Iterable[Tuple[int, int]], **kwargs) -> 'MissCache':
+        """Load cached misses for the given inclusive (start, end) spans."""
+        return cls(db_manager.get_probe_misses(list(spans)), **kwargs)
+
+    def backoff(self, miss_count: int) -> timedelta:
+        if miss_count <= 0:
+            return timedelta(0)
+        return min(self.base * (2 ** (miss_count - 1)), self.max_backoff)
+
+    def should_probe(self, citation_num: int, frontier: int, now: Optional[datetime] = None) -> bool:
+        """True unless the number is away from the frontier and still inside its backoff."""
+        if abs(frontier - citation_num) <= self.near_frontier:
+            return True
+        entry = self.entries.get(citation_num)
+        if entry is None:
+            return True
+        miss_count, last_probed_at = entry
+        now = now or datetime.now(timezone.utc)
+        if now - last_probed_at >= self.backoff(miss_count):
+            return True
+        self.skipped += 1
+        return False
+
+    def record(self, citation_num: int, found: bool) -> None:
+        """Note a probe result; persisted by save()."""
+        if found:
+            self._hits.append(citation_num)
+        else:
+            self._misses.append(citation_num)
+
+    def save(self, db_manager) -> None:
+        if not self._misses and not self._hits:
+            return
+        db_manager.record_probe_results(self._misses, self._hits)
+        logger.info(f"Miss cache: recorded {len(self._misses)} miss(es), cleared {len(self._hits)} hit(s), skipped {self.skipped} backed-off number(s)")
+        self._misses = []
+        self._hits = []
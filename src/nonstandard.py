@@ -1,9 +1,25 @@
+import difflib
 import os
 import re
-from typing import Dict, Tuple, Optional
+import threading
+import time
+from typing import Dict, List, Tuple, Optional
+
+from address_canonicalizer import split_address
 
 NONSTANDARD_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'nonstandard.md')
 
+# Fuzzy matches must be at least this similar (difflib ratio) and this long; numbers must match
+# exactly (see _number_signature), so "Lot 7 Palio" never becomes "Lot #3 - Palio"
+FUZZY_CUTOFF = 0.85
+FUZZY_MIN_LENGTH = 6
+# How often the file's mtime is checked for changes
+RELOAD_CHECK_SECONDS = 1.0
+
+_COORDS_RE = re.compile(r'^(-?\d+(?:\.\d+)?)[ ,]+(-?\d+(?:\.\d+)?)$')
+_KEY_PUNCT_RE = re.compile(r'[^\w\s]')
+_DIGITS_RE = re.compile(r'\d+')
+
 
 def parse_nonstandard_file(path: Optional[str] = None) -> Tuple[Dict[str, str], Dict[str, Tuple[float, float]]]:
     """Parse nonstandard.md into alias->address and alias->(lat, lon) maps."""
@@ -21,13 +37,16 @@ def parse_nonstandard_file(path: Optional[str] = None) -> Tuple[Dict[str, str],
             line = raw_line.strip()
             if not line:
                 continue
+            # Expected formats:
+            #   "Alias: 123 Main St, Ann Arbor, MI 48104"
+            #   "Alias: 42.292306, -83.717500"
             if ':' not in line:
                 continue
             alias, rhs = line.split(':', 1)
             alias = alias.strip()
             rhs = rhs.strip()
 
-            m = re.match(r'^(-?\d+(?:\.\d+)?)[ ,]+(-?\d+(?:\.\d+)?)$', rhs)
+            m = _COORDS_RE.match(rhs)
             if m:
                 lat = float(m.group(1))
                 lon = float(m.group(2))
@@ -40,11 +59,109 @@ def parse_nonstandard_file(path: Optional[str] = None) -> Tuple[Dict[str, str],
     return alias_to_address, alias_to_coords
 
 
+def alias_key(alias: str) -> str:
+    """Case-, punctuation- and whitespace-insensitive key: "Lot #3 - Palio" and "lot 3 palio" -> "LOT 3 PALIO"."""
+    return ' '.join(_KEY_PUNCT_RE.sub(' ', alias or '').upper().split())
+
+
+def _number_signature(key: str) -> Tuple[str, ...]:
+    """The digit runs in a key, in order: "LOT 70 4TH WILLIAM" -> ("70", "4")."""
+    return tuple(_DIGITS_RE.findall(key))
+
+
+class AliasIndex:
+    """nonstandard.md parsed once into a dict keyed by alias_key, reparsed only when the file changes.
+
+    Exact (normalised) lookups are a dict hit. A miss that is not a street address is fuzzy
+    matched with difflib against the known aliases carrying exactly the same numbers, so lot
+    and structure numbers are never fuzzed; the outcome, hit or miss, is memoised
+    per key so each distinct location string pays for fuzzy matching at most once per load.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or NONSTANDARD_FILE
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._loaded = False
+        self._checked_at = 0.0
+        self.addresses: Dict[str, str] = {}
+        self.coords: Dict[str, Tuple[float, float]] = {}
+        # alias_key -> (address, coords)
+        self._by_key: Dict[str, Tuple[Optional[str], Optional[Tuple[float, float]]]] = {}
+        self._fuzzy: Dict[str, Optional[str]] = {}
+        # _number_signature -> alias keys with those numbers, the only fuzzy candidates
+        self._by_numbers: Dict[Tuple[str, ...], List[str]] = {}
+
+    def _current_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if self._loaded and now - self._checked_at < RELOAD_CHECK_SECONDS:
+            return
+        self._checked_at = now
+        mtime = self._current_mtime()
+        if self._loaded and mtime == self._mtime:
+            return
+        addresses, coords = parse_nonstandard_file(self.path)
+        by_key = {}
+        for alias, address in addresses.items():
+            by_key[alias_key(alias)] = (address, None)
+        for alias, point in coords.items():
+            by_key[alias_key(alias)] = (None, point)
+        self.addresses, self.coords = addresses, coords
+        by_numbers: Dict[Tuple[str, ...], List[str]] = {}
+        for key in by_key:
+            by_numbers.setdefault(_number_signature(key), []).append(key)
+        self._by_key = by_key
+        self._by_numbers = by_numbers
+        self._fuzzy = {}
+        self._mtime = mtime
+        self._loaded = True
+
+    def entries(self) -> Dict[str, Tuple[Optional[str], Optional[Tuple[float, float]]]]:
+        """{alias as written in the file: (mapped_address, coords)}."""
+        with self._lock:
+            self._refresh()
+            result = {alias: (address, None) for alias, address in self.addresses.items()}
+            result.update({alias: (None, point) for alias, point in self.coords.items()})
+            return result
+
+    def resolve(self, alias: str) -> Tuple[Optional[str], Optional[Tuple[float, float]]]:
+        """Return (mapped_address, coords) for a location alias, or (None, None)."""
+        key = alias_key(alias)
+        if not key:
+            return None, None
+        with self._lock:
+            self._refresh()
+            hit = self._by_key.get(key)
+            if hit is not None:
+                return hit
+            if key not in self._fuzzy:
+                self._fuzzy[key] = self._fuzzy_match(alias, key)
+            match = self._fuzzy[key]
+            return self._by_key[match] if match else (None, None)
+
+    def _fuzzy_match(self, alias: str, key: str) -> Optional[str]:
+        # Real street addresses are geocoded normally, never pulled onto a nearby alias
+        if len(key) < FUZZY_MIN_LENGTH or split_address(alias) is not None:
+            return None
+        candidates = self._by_numbers.get(_number_signature(key), [])
+        matches = difflib.get_close_matches(key, candidates, n=1, cutoff=FUZZY_CUTOFF)
+        return matches[0] if matches else None
+
+
+_default_index = AliasIndex()
+
+
+def get_alias_index() -> AliasIndex:
+    """The shared index over nonstandard.md."""
+    return _default_index
+
+
 def resolve_alias(alias: str) -> Tuple[Optional[str], Optional[Tuple[float, float]]]:
     """Return (mapped_address, coords) for a given alias, if present."""
-    addr_map, coord_map = parse_nonstandard_file()
-    if alias in coord_map:
-        return None, coord_map[alias]
-    if alias in addr_map:
-        return addr_map[alias], None
-    return None, None
+    return _default_index.resolve(alias)
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from receipt_ocr import OCR_CONFIG_VERSION, RECEIPT_PARSER_VERSION, parse_receipt_lines
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OCR_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.cache', 'ocr_results.sqlite3')
+
+
+def image_key(image_bytes: bytes) -> str:
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+class OcrResultCache:
+    """Content-addressed store of receipt OCR output.
+
+    Keyed by (sha256 of the image bytes, OCR_CONFIG_VERSION), it keeps the raw Tesseract
+    lines with their boxes plus the fields parsed from them. Fields written by an older
+    RECEIPT_PARSER_VERSION are re-derived from the stored lines on read, so improving the
+    parsers never needs Tesseract again; changing crop/preprocessing/Tesseract settings
+    should bump OCR_CONFIG_VERSION instead.
+
+    Entries live in a local SQLite file and, when a db_manager is given, are also shared
+    through the ocr_results table (see docs/migration_add_ocr_results.sql).
+    """
+
+    def __init__(self, path: Optional[str] = None, db_manager=None):
+        self.path = path or os.getenv('OCR_CACHE_PATH', DEFAULT_OCR_CACHE_PATH)
+        self.db_manager = db_manager
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ocr_results (
+                image_sha256   TEXT NOT NULL,
+                config_version INTEGER NOT NULL,
+                parser_version INTEGER NOT NULL,
+                lines          TEXT NOT NULL,
+                fields         TEXT NOT NULL,
+                PRIMARY KEY (image_sha256, config_version)
+            )
+            """
+        )
+        self._conn.commit()
+        self._pending_remote: List[Tuple[str, List[Dict], Dict]] = []
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def get(self, sha: str) -> Optional[Dict]:
+        """Return the parsed fields for an image hash, or None if it has never been OCR'd."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT parser_version, lines, fields FROM ocr_results WHERE image_sha256 = ? AND config_version = ?",
+                (sha, OCR_CONFIG_VERSION),
+            ).fetchone()
+        if row is not None:
+            parser_version, lines, fields = row[0], json.loads(row[1]), json.loads(row[2])
+        elif self.db_manager is not None:
+            remote = self.db_manager.get_ocr_result(sha, OCR_CONFIG_VERSION)
+            if remote is None:
+                self.misses += 1
+                return None
+            parser_version, lines, fields = remote['parser_version'], remote['lines'], remote['fields']
+            self._put_local(sha, parser_version, lines, fields)
+        else:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if parser_version != RECEIPT_PARSER_VERSION:
+            fields = parse_receipt_lines(lines)
+            self.put(sha, lines, fields)
+        return dict(fields)
+
+    def put(self, sha: str, lines: List[Dict], fields: Dict) -> None:
+        self._put_local(sha, RECEIPT_PARSER_VERSION, lines, fields)
+        if self.db_manager is not None:
+            with self._lock:
+                self._pending_remote.append((sha, lines, fields))
+
+    def _put_local(self, sha: str, parser_version: int, lines: List[Dict], fields: Dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ocr_results (image_sha256, config_version, parser_version, lines, fields) VALUES (?, ?, ?, ?, ?)",
+                (sha, OCR_CONFIG_VERSION, parser_version, json.dumps(lines), json.dumps(fields)),
+            )
+            self._conn.commit()
+
+    def flush(self) -> None:
+        """Push entries written since the last flush to the ocr_results table."""
+        with self._lock:
+            pending, self._pending_remote = self._pending_remote, []
+        if pending and self.db_manager is not None:
+            self.db_manager.save_ocr_results(pending, OCR_CONFIG_VERSION, RECEIPT_PARSER_VERSION)
+
+    def entries(self) -> Iterator[Tuple[str, List[Dict], Dict]]:
+        """Yield (sha, lines, fields) for every local entry at the current OCR config version."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT image_sha256, lines, fields FROM ocr_results WHERE config_version = ?",
+                (OCR_CONFIG_VERSION,),
+            ).fetchall()
+        for sha, lines, fields in rows:
+            yield sha, json.loads(lines), json.loads(fields)
+
+    def reparse(self) -> Dict[str, int]:
+        """Re-derive fields for every local entry with the current parsers; no Tesseract involved."""
+        total = changed = 0
+        updates = []
+        for sha, lines, fields in self.entries():
+            total += 1
+            new_fields = parse_receipt_lines(lines)
+            if new_fields != fields:
+                changed += 1
+            updates.append((RECEIPT_PARSER_VERSION, json.dumps(new_fields), sha, OCR_CONFIG_VERSION))
+            if self.db_manager is not None:
+                self._pending_remote.append((sha, lines, new_fields))
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE ocr_results SET parser_version = ?, fields = ? WHERE image_sha256 = ? AND config_version = ?",
+                updates,
+            )
+            self._conn.commit()
+        self.flush()
+        return {'total': total, 'changed': changed}
+
+
+def ocr_cache_from_env(db_manager=None) -> Optional[OcrResultCache]:
+    """OcrResultCache per OCR_CACHE (default on) and OCR_CACHE_DB (share via the ocr_results table, default off)."""
+    if os.getenv('OCR_CACHE', '1').lower() in ('0', 'false', 'no'):
+        return None
+    shared = os.getenv('OCR_CACHE_DB', '0').lower() in ('1', 'true', 'yes')
+    try:
+        return OcrResultCache(db_manager=db_manager if shared else None)
+    except Exception as e:
+        logger.warning(f"OCR cache unavailable: {e}")
+        return None
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Sequence
+
+from ocr_cache import OcrResultCache, image_key
+from receipt_ocr import ocr_receipt, parse_receipt_lines
+
+logger = logging.getLogger(__name__)
+
+
+def _ocr_chunk(images: List[bytes], timeout: float) -> List[Optional[List[Dict]]]:
+    """Worker-process entry point: OCR lines per image (None on failure), never raising so one bad receipt can't sink a chunk."""
+    results = []
+    for image_bytes in images:
+        try:
+            results.append(ocr_receipt(image_bytes, timeout=timeout))
+        except Exception as e:
+            logger.debug(f"Receipt OCR failed in worker: {e}")
+            results.append(None)
+    return results
+
+
+class OcrWorkerPool:
+    """Receipt OCR on a process pool, so Tesseract uses every core instead of the caller's thread.
+
+    Jobs are receipt image bytes; results are the receipt_ocr field dicts. Each job gets a
+    timeout that is enforced twice: Tesseract itself is killed after `timeout` seconds, and
+    callers stop waiting shortly after that. A timed-out or failed job (including Tesseract
+    not being installed) yields None, so callers can tell it apart from a receipt that was
+    read but had no fields.
+
+    Workers only run Tesseract; fields are parsed in the calling process. With an
+    OcrResultCache, images already OCR'd under the current config never reach a worker.
+    """
+
+    def __init__(self, workers: Optional[int] = None, timeout: Optional[float] = None, cache: Optional[OcrResultCache] = None):
+        if workers is None:
+            workers = int(os.getenv('OCR_POOL_WORKERS', str(os.cpu_count() or 2)))
+        if timeout is None:
+            timeout = float(os.getenv('OCR_JOB_TIMEOUT_SECONDS', '60'))
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.cache = cache
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'OcrWorkerPool':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown()
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _wait_budget(self, jobs: int) -> float:
+        # Tesseract enforces `timeout` per image; allow a little extra for decode and IPC
+        return self.timeout * jobs + 5
+
+    def submit_chunk(self, images: List[bytes]) -> Future:
+        self.start()
+        return self._executor.submit(_ocr_chunk, images, self.timeout)
+
+    def _finish(self, sha: Optional[str], lines: Optional[List[Dict]]) -> Optional[Dict]:
+        if lines is None:
+            return None
+        fields = parse_receipt_lines(lines)
+        if self.cache is not None and sha is not None:
+            self.cache.put(sha, lines, fields)
+        return fields
+
+    def _cached(self, image_bytes: bytes):
+        """Return (sha, cached fields or None)."""
+        if self.cache is None:
+            return None, None
+        sha = image_key(image_bytes)
+        return sha, self.cache.get(sha)
+
+    def analyze(self, image_bytes: bytes) -> Optional[Dict]:
+        """OCR one receipt, blocking until it finishes or times out; None if OCR did not run."""
+        return self.analyze_batch([image_bytes], chunk_size=1)[0]
+
+    def analyze_batch(self, images: Sequence[bytes], chunk_size: int = 4) -> List[Optional[Dict]]:
+        """OCR many receipts across the pool; results are returned in input order, None where OCR failed.
+
+        Images are sent to workers `chunk_size` at a time to cut per-job IPC overhead.
+        """
+        results: List[Optional[Dict]] = [None] * len(images)
+        shas: List[Optional[str]] = [None] * len(images)
+        todo: List[int] = []
+        for i, image_bytes in enumerate(images):
+            shas[i], results[i] = self._cached(image_bytes)
+            if results[i] is None:
+                todo.append(i)
+
+        chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+        futures = [self.submit_chunk([images[i] for i in chunk]) for chunk in chunks]
+        for chunk, future in zip(chunks, futures):
+            try:
+                chunk_lines = future.result(timeout=self._wait_budget(len(chunk)))
+            except FutureTimeoutError:
+                logger.warning(f"Receipt OCR timed out for a chunk of {len(chunk)} image(s)")
+                future.cancel()
+                chunk_lines = [None] * len(chunk)
+            except Exception as e:
+                logger.warning(f"Receipt OCR worker failed: {e}")
+                chunk_lines = [None] * len(chunk)
+            for i, lines in zip(chunk, chunk_lines):
+                results[i] = self._finish(shas[i], lines)
+        if self.cache is not None:
+            self.cache.flush()
+        return results
+
+    async def analyze_async(self, image_bytes: bytes) -> Optional[Dict]:
+        """Awaitable single-receipt OCR for the ingest pipeline; None if OCR did not run."""
+        loop = asyncio.get_running_loop()
+        # Cache lookups may go to the DB, so keep them off the event loop
+        sha, cached = await loop.run_in_executor(None, self._cached, image_bytes)
+        if cached is not None:
+            return cached
+        future = asyncio.wrap_future(self.submit_chunk([image_bytes]))
+        try:
+            lines = (await asyncio.wait_for(future, timeout=self._wait_budget(1)))[0]
+        except asyncio.TimeoutError:
+            logger.warning("Receipt OCR timed out")
+            return None
+        except Exception as e:
+            logger.warning(f"Receipt OCR worker failed: {e}")
+            return None
+        # Parsing and the SQLite cache write (insert + commit) also stay off the event loop
+        return await loop.run_in_executor(None, self._finish, sha, lines)
@@ -0,0 +1,268 @@
+import logging
+import math
+import os
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seed data for the scrape_ranges table, used when the table is missing or empty.
+# Adding a band is a row insert into scrape_ranges (see docs/migration_add_scrape_ranges.sql).
+DEFAULT_RANGES: List[Dict] = [
+    {'label': 'AA', 'min_inclusive': 10_000_000, 'max_exclusive': 10_020_000, 'default_center': 10_014_000},
+    {'label': 'NC', 'min_inclusive': 2_080_000, 'max_exclusive': 2_100_000, 'default_center': 2_081_673},
+    {'label': 'Third', 'min_inclusive': 1_000_000, 'max_exclusive': 1_020_000, 'default_center': 1_123_108},
+    {'label': 'Fourth', 'min_inclusive': 2_000_000, 'max_exclusive': 2_080_000, 'default_center': 2_025_645},
+    {'label': 'Fifth', 'min_inclusive': 1_020_000, 'max_exclusive': 1_030_000, 'default_center': 1_027_117},
+    {'label': 'FifthB', 'min_inclusive': 1_030_000, 'max_exclusive': 1_040_000, 'default_center': 1_035_000},
+    {'label': 'Sixth', 'min_inclusive': 1_040_000, 'max_exclusive': 1_050_000, 'default_center': 1_048_162},
+    {'label': 'Seventh', 'min_inclusive': 1_070_000, 'max_exclusive': 1_080_000, 'default_center': 1_072_744},
+    {'label': 'Eighth', 'min_inclusive': 1_120_000, 'max_exclusive': 1_130_000, 'default_center': 1_123_252},
+    {'label': 'Ninth', 'min_inclusive': 10_910_000, 'max_exclusive': 10_920_000, 'default_center': 10_913_791},
+    {'label': 'Tenth', 'min_inclusive': 2_040_000, 'max_exclusive': 2_060_000, 'default_center': 2_050_000},
+    {'label': 'Eleventh', 'min_inclusive': 10_310_000, 'max_exclusive': 10_320_000, 'default_center': 10_310_223},
+]
+
+# Weight of the latest run when smoothing issuance velocity
+VELOCITY_SMOOTHING = 0.3
+
+# Bounds on how far behind issuance a citation can show up on the portal, used to size
+# the backward re-check window
+MIN_LAG_HOURS = 0.25
+MAX_LAG_HOURS = 24.0
+
+
+class ScrapeRange:
+    """One citation-number band: its bounds, current frontier and issuance velocity."""
+
+    def __init__(self, label: str, min_inclusive: int, max_exclusive: int, default_center: Optional[int] = None,
+                 frontier: Optional[int] = None, velocity_per_hour: Optional[float] = None,
+                 last_run_at: Optional[str] = None, **_ignored):
+        self.label = label
+        self.min_inclusive = int(min_inclusive)
+        self.max_exclusive = int(max_exclusive)
+        self.default_center = int(default_center) if default_center is not None else None
+        self.frontier = int(frontier) if frontier is not None else None
+        self.velocity_per_hour = float(velocity_per_hour) if velocity_per_hour is not None else None
+        self.last_run_at = last_run_at
+        self.hits_this_run = 0
+        # Issuance statistics derived from citation history (see apply_issuance_stats)
+        self.rate_per_hour: Optional[float] = None
+        self.lag_hours: Optional[float] = None
+
+    def contains(self, citation_num: int) -> bool:
+        return self.min_inclusive <= citation_num < self.max_exclusive
+
+    def center(self) -> int:
+        """Where scanning starts: the frontier, else the configured default, else the band floor."""
+        if self.frontier is not None:
+            return self.frontier
+        if self.default_center is not None:
+            return self.default_center
+        return self.min_inclusive
+
+    def expected_rate(self) -> float:
+        """Best current estimate of citations issued per hour in this band."""
+        rates = [r for r in (self.rate_per_hour, self.velocity_per_hour) if r is not None]
+        return max(rates) if rates else 0.0
+
+    def to_row(self) -> Dict:
+        return {
+            'label': self.label,
+            'min_inclusive': self.min_inclusive,
+            'max_exclusive': self.max_exclusive,
+            'default_center': self.default_center,
+            'frontier': self.frontier,
+            'velocity_per_hour': self.velocity_per_hour,
+            'last_run_at': self.last_run_at,
+        }
+
+
+class FrontierScan:
+    """Per-run probe plan for one range.
+
+    Re-checks a window behind the frontier for late or out-of-order numbers, then walks
+    forward past the frontier until `miss_limit` consecutive numbers come back empty.
+    Every hit past the frontier pushes the stopping point out again, so busy bands keep
+    extending within the run while quiet ones stop after `miss_limit` probes. Probes that
+    failed (portal errors, not "No results found") don't count as misses: each pushes the
+    stopping point out by one, up to another `miss_limit` numbers past the last hit.
+    """
+
+    def __init__(self, scrape_range: ScrapeRange, back_window: int, miss_limit: int, max_forward: int):
+        self.range = scrape_range
+        center = scrape_range.center()
+        self.back_start = max(center - back_window, scrape_range.min_inclusive)
+        self.center = center
+        self.miss_limit = max(1, miss_limit)
+        self.forward_cap = min(center + max_forward, scrape_range.max_exclusive - 1)
+        self.last_hit = center
+        self.next_forward = center + 1
+        # Forward numbers past last_hit whose probe failed
+        self._errors: Set[int] = set()
+
+    def _extend(self) -> List[int]:
+        stop = min(self.last_hit + self.miss_limit + len(self._errors), self.forward_cap)
+        numbers = list(range(self.next_forward, stop + 1))
+        self.next_forward = max(self.next_forward, stop + 1)
+        return numbers
+
+    def initial_numbers(self, existing: Iterable[int], should_probe: Optional[Callable[[int, int], bool]] = None) -> List[int]:
+        """Backward window (minus numbers already stored) followed by the first forward probes.
+
+        should_probe(citation_num, frontier) can veto backward numbers, e.g. MissCache backoff.
+        Forward probes are never filtered so the consecutive-miss count stays meaningful.
+        """
+        existing = set(existing)
+        backward = [
+            n for n in range(self.back_start, self.center + 1)
+            if n not in existing and (should_probe is None or should_probe(n, self.center))
+        ]
+        return backward + self._extend()
+
+    def on_result(self, citation_num: int, found: bool) -> List[int]:
+        """Record a probe result and return any further forward numbers to probe."""
+        if found and citation_num > self.last_hit:
+            self.last_hit = citation_num
+            self._errors = {n for n in self._errors if n > citation_num}
+            return self._extend()
+        return []
+
+    def on_error(self, citation_num: int) -> List[int]:
+        """Record a failed probe and return any forward number probed in its place."""
+        if citation_num <= self.last_hit or citation_num in self._errors or len(self._errors) >= self.miss_limit:
+            return []
+        self._errors.add(citation_num)
+        return self._extend()
+
+
+class RangeRegistry:
+    """Data-driven set of scrape ranges, persisted in the scrape_ranges table."""
+
+    def __init__(self, ranges: List[ScrapeRange]):
+        self.ranges = ranges
+        self._by_label: Dict[str, ScrapeRange] = {r.label: r for r in ranges}
+        self._scans: Dict[str, FrontierScan] = {}
+
+    @classmethod
+    def load(cls, db_manager) -> 'RangeRegistry':
+        rows = db_manager.get_scrape_ranges()
+        if not rows:
+            logger.warning("scrape_ranges table missing or empty; using built-in DEFAULT_RANGES")
+            rows = [dict(r) for r in DEFAULT_RANGES]
+        return cls([ScrapeRange(**row) for row in rows])
+
+    def get(self, label: str) -> Optional[ScrapeRange]:
+        return self._by_label.get(label)
+
+    def update_frontiers(self, maxima: Dict[str, Optional[int]]) -> None:
+        """Advance each range's frontier to the DB max inside its bounds (never backwards)."""
+        for label, db_max in maxima.items():
+            r = self._by_label.get(label)
+            if r is None or db_max is None or not r.contains(db_max):
+                continue
+            if r.frontier is None or db_max > r.frontier:
+                r.frontier = db_max
+
+    def apply_issuance_stats(self, stats: Dict[str, Dict]) -> None:
+        """Attach per-range issuance rate and portal lag derived from issue_date/scraped_at history."""
+        for label, row in stats.items():
+            r = self._by_label.get(label)
+            if r is None:
+                continue
+            r.rate_per_hour = row.get('rate_per_hour')
+            r.lag_hours = row.get('lag_hours')
+
+    def plan(self, settings: Dict) -> Dict[str, FrontierScan]:
+        """Build this run's FrontierScan for each range.
+
+        With adaptive windows on, each range's backward window covers the numbers it issues
+        during its typical portal lag, and its forward miss limit covers what it issues in
+        about two scrape intervals. Ranges without history fall back to the fixed settings.
+        """
+        self._scans = {}
+        for r in self.ranges:
+            back_window, miss_limit = settings['back_window'], settings['miss_limit']
+            if settings['adaptive'] and (r.rate_per_hour is not None or r.velocity_per_hour is not None):
+                back_window, miss_limit = adaptive_window(
+                    r.expected_rate(),
+                    r.lag_hours,
+                    settings['interval_minutes'],
+                    settings['min_probes'],
+                    settings['max_probes'],
+                )
+            self._scans[r.label] = FrontierScan(r, back_window, miss_limit, settings['max_forward'])
+        return self._scans
+
+    def on_probe(self, label: str, citation_num: int, found: bool) -> List[Tuple[str, int]]:
+        """Feed a probe result back; returns new (label, citation_number) jobs to schedule."""
+        r = self._by_label.get(label)
+        if r is not None and found and r.contains(citation_num):
+            r.hits_this_run += 1
+            if r.frontier is None or citation_num > r.frontier:
+                r.frontier = citation_num
+        scan = self._scans.get(label)
+        if scan is None:
+            return []
+        return [(label, n) for n in scan.on_result(citation_num, found)]
+
+    def on_probe_error(self, label: str, citation_num: int) -> List[Tuple[str, int]]:
+        """Report a probe that failed; returns new (label, citation_number) jobs to schedule."""
+        scan = self._scans.get(label)
+        if scan is None:
+            return []
+        return [(label, n) for n in scan.on_error(citation_num)]
+
+    def finish_run(self, now: Optional[datetime] = None) -> None:
+        """Fold this run's hit count into each range's smoothed issuance velocity."""
+        now = now or datetime.now(timezone.utc)
+        for r in self.ranges:
+            if r.last_run_at:
+                try:
+                    last = datetime.fromisoformat(str(r.last_run_at).replace('Z', '+00:00'))
+                    hours = max((now - last).total_seconds() / 3600.0, 1 / 60)
+                    rate = r.hits_this_run / hours
+                    if r.velocity_per_hour is None:
+                        r.velocity_per_hour = rate
+                    else:
+                        r.velocity_per_hour = (1 - VELOCITY_SMOOTHING) * r.velocity_per_hour + VELOCITY_SMOOTHING * rate
+                except ValueError:
+                    logger.warning(f"Unparseable last_run_at for range {r.label}: {r.last_run_at}")
+            r.last_run_at = now.isoformat()
+
+    def save(self, db_manager) -> None:
+        db_manager.save_scrape_ranges([r.to_row() for r in self.ranges])
+
+
+def adaptive_window(rate_per_hour: float, lag_hours: Optional[float], interval_minutes: float,
+                    min_probes: int, max_probes: int) -> Tuple[int, int]:
+    """Return (back_window, miss_limit) sized from a range's issuance rate.
+
+    back_window: numbers issued during the p90 delay between issue and appearing on the portal.
+    miss_limit: a floor of min_probes plus what the range issues in two scrape intervals.
+    """
+    lag = min(max(lag_hours if lag_hours is not None else 1.0, MIN_LAG_HOURS), MAX_LAG_HOURS)
+    back_window = math.ceil(rate_per_hour * lag)
+    miss_limit = min_probes + math.ceil(rate_per_hour * (interval_minutes / 60.0) * 2)
+    clamp = lambda n: max(min_probes, min(n, max_probes))
+    return clamp(back_window), clamp(miss_limit)
+
+
+def scan_settings_from_env() -> Dict:
+    """Return the frontier-scan settings from the environment."""
+    def env_int(name: str, default: int) -> int:
+        try:
+            return int(os.getenv(name, str(default)))
+        except ValueError:
+            return default
+
+    return {
+        'back_window': env_int('SCRAPE_RANGE_SIZE', 50),
+        'miss_limit': env_int('FRONTIER_MISS_LIMIT', 25),
+        'max_forward': env_int('FRONTIER_MAX_FORWARD', 500),
+        'adaptive': os.getenv('ADAPTIVE_WINDOWS', '1').lower() not in ('0', 'false', 'no'),
+        'interval_minutes': env_int('SCRAPER_INTERVAL_MINUTES', 5),
+        'min_probes': env_int('ADAPTIVE_MIN_PROBES', 5),
+        'max_probes': env_int('ADAPTIVE_MAX_PROBES', 200),
+        'stats_lookback_days': env_int('ADAPTIVE_LOOKBACK_DAYS', 14),
+    }
@@ -0,0 +1,184 @@
+"""Declarative receipt field extraction.
+
+Each field is a list of named regex alternatives, compiled once at import into a single
+pattern per field. Officer fields are found by scanning the normalised OCR text once per
+field with finditer, then applying the matches in line order with the same precedence the
+old line-by-line parser used:
+
+  - an OFFICER line sets badge and/or name; a later OFFICER line overrides an earlier one
+  - BADGE only fills the badge if nothing has set it yet
+  - BEAT and NAME keep the first value found
+
+Officer patterns use [^\\S\\n] for whitespace so no match can run across lines.
+"""
+import re
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+_SP = r'[^\S\n]'
+_STREET_SUFFIX = r'(?:St|Street|Ave|Avenue|Rd|Road|Blvd|Boulevard|Dr|Drive|Ln|Lane|Ct|Court|Pl|Place|Way|Cir|Circle)'
+
+# Keyword every alternative of a field starts with. It is factored out of the alternation so
+# the regex engine only tries the alternatives where the keyword actually occurs. An optional
+# OFFICER before NAME never changed what the old name pattern captured, so it is not kept.
+FIELD_KEYWORDS: Dict[str, str] = {
+    'officer': 'OFFICER',
+    'badge': 'BADGE',
+    'beat': 'BEAT',
+    'name': 'NAME',
+    'location': 'LOCATION',
+}
+
+# field -> [(alternative name, pattern after the keyword)], in priority order. Group names are
+# <alternative>_<part> so a match says both which alternative hit and what it captured.
+FIELD_SPECS: Dict[str, List[Tuple[str, str]]] = {
+    'officer': [
+        # OFFICER: badge name (e.g. OFFICER : 801 RITTER)
+        ('badge_name', rf'(?::|{_SP})+(?P<badge_name_badge>\d{{1,8}}){_SP}+(?P<badge_name_name>[A-Z0-9][A-Z0-9,\.\'\- \t\r\f\v]+)'),
+        # OFFICER: name (badge)
+        ('name_badge', rf'(?::|{_SP})+(?P<name_badge_name>[A-Z][A-Z,\.\'\- \t\r\f\v]+){_SP}*\((?P<name_badge_badge>\d{{1,8}})\)'),
+        # Just the badge number on a line with OFFICER
+        ('badge_only', rf'(?::|{_SP})+(?P<badge_only_badge>\d{{1,8}})$'),
+    ],
+    'badge': [
+        ('badge', rf'(?::|{_SP})+(?P<badge_badge>\d{{1,8}})'),
+    ],
+    'beat': [
+        ('beat', rf'(?::|{_SP})+(?P<beat_beat>[A-Z0-9\-]+)'),
+    ],
+    'name': [
+        ('name', rf'(?::|{_SP})+(?P<name_name>[A-Z][A-Z,\.\'\- \t\r\f\v]+)'),
+    ],
+    'location': [
+        # LOCATION: 800 S Forest Ave (with direction)
+        ('colon_dir', rf':\s*(?P<colon_dir_number>\d+)\s*(?P<colon_dir_direction>[NSEW])\s+(?P<colon_dir_street>[A-Za-z\s]+{_STREET_SUFFIX})'),
+        # LOCATION: 1100 Prospect St (without direction)
+        ('colon', rf':\s*(?P<colon_number>\d+)\s+(?P<colon_street>[A-Za-z\s]+{_STREET_SUFFIX})'),
+        # No colon: LOCATION800SForestAve
+        ('packed_dir', rf'(?P<packed_dir_number>\d+)(?P<packed_dir_direction>[NSEW])(?P<packed_dir_street>[A-Za-z]+{_STREET_SUFFIX})'),
+        # No colon or direction: LOCATION1100ProspectSt
+        ('packed', rf'(?P<packed_number>\d+)(?P<packed_street>[A-Za-z]+{_STREET_SUFFIX})'),
+    ],
+}
+
+
+def _compile(field: str, flags: int = 0) -> 're.Pattern':
+    alternatives = '|'.join(f'(?:{pattern})' for _, pattern in FIELD_SPECS[field])
+    return re.compile(f'{FIELD_KEYWORDS[field]}(?:{alternatives})', flags)
+
+
+FIELD_PATTERNS: Dict[str, 're.Pattern'] = {
+    'officer': _compile('officer', re.MULTILINE),
+    'badge': _compile('badge'),
+    'beat': _compile('beat'),
+    'name': _compile('name'),
+    'location': _compile('location', re.IGNORECASE),
+}
+
+# Within a line, officer patterns are applied before badge, beat and name
+_FIELD_ORDER = {'officer': 0, 'badge': 1, 'beat': 2, 'name': 3}
+
+_DIRECTIONAL_RE = re.compile(r'^([NSEW])([A-Z][a-z]+.*)$')
+_CAMEL_RE = re.compile(r'(?<=[a-z])(?=[A-Z])')
+_WHITESPACE_RE = re.compile(r'\s+')
+_NEWLINE_RE = re.compile(r'\n')
+
+
+def _alternative(match: 're.Match') -> str:
+    """Name of the FIELD_SPECS alternative that produced a match."""
+    return match.lastgroup.rsplit('_', 1)[0] if match.lastgroup else ''
+
+
+def _group(match: 're.Match', alternative: str, part: str) -> Optional[str]:
+    return match.group(f'{alternative}_{part}')
+
+
+def extract_officer_fields(text: str) -> Dict:
+    """Officer badge, name and beat from OCR text."""
+    result = {
+        'officer_badge': None,
+        'officer_name': None,
+        'officer_beat': None
+    }
+    if not text:
+        return result
+
+    normalized = '\n'.join(line.strip() for line in text.upper().split('\n'))
+    line_starts = [0] + [m.end() for m in _NEWLINE_RE.finditer(normalized)]
+
+    # First match per (field, line), like re.search on each line
+    events = {}
+    for field, pattern in FIELD_PATTERNS.items():
+        if field == 'location':
+            continue
+        for match in pattern.finditer(normalized):
+            line_no = bisect_right(line_starts, match.start()) - 1
+            events.setdefault((line_no, _FIELD_ORDER[field]), (field, match))
+
+    for key in sorted(events):
+        field, match = events[key]
+        if field == 'officer':
+            alternative = _alternative(match)
+            if alternative == 'badge_name':
+                result['officer_badge'] = _group(match, alternative, 'badge').strip()
+                result['officer_name'] = clean_officer_name(_group(match, alternative, 'name'))
+            elif alternative == 'name_badge':
+                result['officer_name'] = clean_officer_name(_group(match, alternative, 'name'))
+                result['officer_badge'] = _group(match, alternative, 'badge').strip()
+            elif alternative == 'badge_only':
+                result['officer_badge'] = _group(match, alternative, 'badge').strip()
+        elif field == 'badge' and not result['officer_badge']:
+            result['officer_badge'] = match.group('badge_badge').strip()
+        elif field == 'beat' and not result['officer_beat']:
+            result['officer_beat'] = match.group('beat_beat').strip()
+        elif field == 'name' and not result['officer_name']:
+            result['officer_name'] = clean_officer_name(match.group('name_name'))
+
+    return result
+
+
+def extract_location(text: str) -> Optional[str]:
+    """Street address from the LOCATION line of OCR text."""
+    if not text:
+        return None
+    match = FIELD_PATTERNS['location'].search(text)
+    if not match:
+        return None
+    alternative = _alternative(match)
+    number = _group(match, alternative, 'number')
+    street = add_spaces_before_capitals(_group(match, alternative, 'street').strip())
+    if alternative.endswith('dir'):
+        address = f"{number} {_group(match, alternative, 'direction')} {street}"
+    else:
+        address = f"{number} {street}"
+    return _WHITESPACE_RE.sub(' ', address).strip()
+
+
+def clean_officer_name(name: str) -> Optional[str]:
+    """Clean up officer name from OCR text."""
+    if not name:
+        return None
+
+    # Remove extra whitespace and trailing punctuation
+    name = ' '.join(name.split()).strip(' ,.')
+
+    # Skip if too short or mostly numbers (OCR noise)
+    if len(name) < 2:
+        return None
+    if sum(c.isdigit() for c in name) > len(name) // 2:
+        return None
+
+    return name
+
+
+def add_spaces_before_capitals(text: str) -> str:
+    """Add spaces before capital letters for better readability"""
+    if not text:
+        return text
+
+    # Directional prefix stuck to the street name: SForestAve -> S Forest Ave
+    match = _DIRECTIONAL_RE.match(text)
+    if match:
+        return f"{match.group(1)} {add_spaces_before_capitals(match.group(2))}"
+
+    return _CAMEL_RE.sub(' ', text)
@@ -0,0 +1,133 @@
+import io
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from receipt_fields import (
+    add_spaces_before_capitals,
+    clean_officer_name,
+    extract_location as parse_address_from_ocr,
+    extract_officer_fields as parse_officer_info_from_ocr,
+)
+from receipt_preprocess import preprocess_receipt, preprocessing_available, roi_to_source
+
+logger = logging.getLogger(__name__)
+
+OCR_CONFIG = r'--oem 3 --psm 6'
+
+# Bump OCR_CONFIG_VERSION whenever cropping, preprocessing or Tesseract settings change (cached
+# OCR output is then ignored); bump RECEIPT_PARSER_VERSION when only the field parsers change
+# (cached output is re-parsed without Tesseract). See ocr_cache.OcrResultCache.
+# Version 3 is the OpenCV-preprocessed ROI (receipt_preprocess) with boxes mapped back through
+# the deskew rotation (2 skipped that step); 1 is the plain PIL upscale.
+OCR_CONFIG_VERSION = 3 if preprocessing_available() else 1
+RECEIPT_PARSER_VERSION = 1
+
+# Receipt layout, as fractions of the full image. Officer/badge/beat lines sit in the top
+# 40%; the LOCATION line sits 20%-70% down, and only its left 70% holds the address.
+OCR_REGION_BOTTOM = 0.7
+OFFICER_REGION_BOTTOM = 0.4
+LOCATION_REGION = (0.2, 0.7)
+LOCATION_MAX_X = 0.7
+
+# Without OpenCV, small crops are upscaled so Tesseract sees legible glyphs
+MIN_OCR_WIDTH = 800
+MIN_OCR_HEIGHT = 600
+
+
+def ocr_receipt(image_bytes: bytes, timeout: float = 0, preprocess: Optional[bool] = None) -> Optional[List[Dict]]:
+    """Run one layout-aware Tesseract pass over a receipt image.
+
+    Returns the recognised lines top to bottom, each as
+    {'text', 'x0', 'y0', 'x1', 'y1', 'words': [[text, x0], ...]} with coordinates given
+    as fractions of the full image, or None if Tesseract is not available.
+    A non-zero timeout kills Tesseract after that many seconds (raises RuntimeError).
+
+    With OpenCV available (or preprocess=True) Tesseract reads the small binarized text
+    band from receipt_preprocess; otherwise the top of the receipt is upscaled with PIL.
+    """
+    try:
+        import pytesseract
+    except ImportError:
+        logger.debug("Tesseract not available, skipping OCR")
+        return None
+
+    if preprocess is None:
+        preprocess = preprocessing_available()
+    if preprocess:
+        prepared = preprocess_receipt(image_bytes, OCR_REGION_BOTTOM)
+        if prepared is not None:
+            roi, transform = prepared
+            data = pytesseract.image_to_data(roi, config=OCR_CONFIG, output_type=pytesseract.Output.DICT, timeout=timeout)
+
+            def to_full(x, y):
+                sx, sy = roi_to_source(x, y, transform)
+                return sx / transform.full_width, sy / transform.full_height
+
+            return _group_lines(data, to_full)
+
+    image = Image.open(io.BytesIO(image_bytes))
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    # One crop covering both the officer and location regions
+    region = image.crop((0, 0, image.width, int(image.height * OCR_REGION_BOTTOM)))
+    if region.width < MIN_OCR_WIDTH or region.height < MIN_OCR_HEIGHT:
+        ratio = max(MIN_OCR_WIDTH / region.width, MIN_OCR_HEIGHT / region.height)
+        region = region.resize((int(region.width * ratio), int(region.height * ratio)), Image.Resampling.LANCZOS)
+
+    data = pytesseract.image_to_data(region, config=OCR_CONFIG, output_type=pytesseract.Output.DICT, timeout=timeout)
+    return _group_lines(data, lambda x, y: (x / region.width, y / region.height * OCR_REGION_BOTTOM))
+
+
+def _group_lines(data: Dict, to_full: Callable[[float, float], Tuple[float, float]]) -> List[Dict]:
+    """Group image_to_data words into lines, mapping boxes to fractions of the full image via to_full."""
+    lines: Dict[tuple, Dict] = {}
+    for i, word in enumerate(data['text']):
+        word = (word or '').strip()
+        if not word or str(data['conf'][i]) == '-1':
+            continue
+        x0, y0 = to_full(data['left'][i], data['top'][i])
+        x1, y1 = to_full(data['left'][i] + data['width'][i], data['top'][i] + data['height'][i])
+        key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        line = lines.get(key)
+        if line is None:
+            lines[key] = {'x0': x0, 'y0': y0, 'x1': x1, 'y1': y1, 'words': [[word, x0]]}
+        else:
+            line['x0'], line['y0'] = min(line['x0'], x0), min(line['y0'], y0)
+            line['x1'], line['y1'] = max(line['x1'], x1), max(line['y1'], y1)
+            line['words'].append([word, x0])
+    ordered = sorted(lines.values(), key=lambda l: (round(l['y0'], 3), l['x0']))
+    for line in ordered:
+        line['text'] = ' '.join(w for w, _ in line['words'])
+    return ordered
+
+
+def parse_receipt_lines(lines: List[Dict]) -> Dict:
+    """Extract location and officer badge/name/beat from OCR lines."""
+    officer_text = '\n'.join(l['text'] for l in lines if l['y0'] < OFFICER_REGION_BOTTOM)
+    result = parse_officer_info_from_ocr(officer_text)
+
+    def left_text(line: Dict) -> str:
+        return ' '.join(w for w, x0 in line['words'] if x0 < LOCATION_MAX_X)
+
+    top, bottom = LOCATION_REGION
+    location_lines = [l for l in lines if top <= l['y0'] < bottom]
+    location_line = next((l for l in location_lines if 'LOCATION' in l['text'].upper()), None)
+    if location_line is not None:
+        location_text = left_text(location_line)
+    else:
+        location_text = '\n'.join(left_text(l) for l in location_lines)
+    result['location'] = parse_address_from_ocr(location_text)
+    return result
+
+
+def analyze_receipt_bytes(image_bytes: bytes, timeout: float = 0, preprocess: Optional[bool] = None) -> Dict:
+    """OCR a receipt once and return location, officer_badge, officer_name and officer_beat."""
+    lines = ocr_receipt(image_bytes, timeout=timeout, preprocess=preprocess)
+    if lines is None:
+        return {'location': None, 'officer_badge': None, 'officer_name': None, 'officer_beat': None}
+    if lines:
+        logger.debug("Receipt OCR text:\n" + '\n'.join(l['text'] for l in lines)[:800])
+    return parse_receipt_lines(lines)
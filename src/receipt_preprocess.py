@@ -0,0 +1,147 @@
+import logging
+import os
+from typing import NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import cv2
+    import numpy as np
+except ImportError:  # pragma: no cover - optional, falls back to the PIL path in receipt_ocr
+    cv2 = None
+    np = None
+
+# Tesseract reads best with capital letters roughly 20-35px tall; text lines are scaled toward this
+TARGET_LINE_HEIGHT = 32
+# Skew beyond this is treated as a misdetection rather than corrected
+MAX_DESKEW_DEGREES = 10.0
+# Fraction of a row/column's pixels that must be ink for it to count as text
+INK_THRESHOLD = 0.01
+# Padding kept around the detected text band, in pixels of the source image
+BAND_PADDING = 12
+
+
+def preprocessing_available() -> bool:
+    """True when OpenCV/NumPy are installed and RECEIPT_PREPROCESS is not switched off."""
+    return cv2 is not None and os.getenv('RECEIPT_PREPROCESS', '1').lower() not in ('0', 'false', 'no')
+
+
+class RoiTransform(NamedTuple):
+    """How ROI pixels map back to the source image (see roi_to_source)."""
+    x_offset: float
+    y_offset: float
+    scale: float
+    full_width: int
+    full_height: int
+    # Inverse of the deskew rotation as a 2x3 affine ((a, b, c), (d, e, f)), or None if not rotated
+    unrotate: Optional[Tuple[Tuple[float, float, float], Tuple[float, float, float]]] = None
+
+
+def roi_to_source(x: float, y: float, transform: RoiTransform) -> Tuple[float, float]:
+    """Map ROI pixel (x, y) to source image pixels: undo the scale and crop, then the deskew rotation."""
+    x = x / transform.scale + transform.x_offset
+    y = y / transform.scale + transform.y_offset
+    if transform.unrotate is None:
+        return x, y
+    (a, b, c), (d, e, f) = transform.unrotate
+    return a * x + b * y + c, d * x + e * y + f
+
+
+def deskew(binary: 'np.ndarray') -> Tuple['np.ndarray', float, Optional['np.ndarray']]:
+    """Rotate a binarized (ink=255) image so its text lines are horizontal.
+
+    Returns (image, angle, matrix) where matrix is the 2x3 affine applied, or None when the
+    image was left as is.
+    """
+    coords = cv2.findNonZero(binary)
+    if coords is None or len(coords) < 50:
+        return binary, 0.0, None
+    angle = cv2.minAreaRect(coords)[-1]
+    # minAreaRect reports angles in (0, 90]; map to the smallest rotation
+    if angle > 45:
+        angle -= 90
+    if abs(angle) < 0.1 or abs(angle) > MAX_DESKEW_DEGREES:
+        return binary, 0.0, None
+    h, w = binary.shape
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    rotated = cv2.warpAffine(binary, matrix, (w, h), flags=cv2.INTER_NEAREST, borderValue=0)
+    return rotated, angle, matrix
+
+
+def _runs(mask: 'np.ndarray'):
+    """(start, end) index pairs of consecutive True values in a 1-D mask."""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return list(zip(edges[::2], edges[1::2]))
+
+
+def text_band(binary: 'np.ndarray') -> Optional[Tuple[int, int, int, int, float]]:
+    """Locate the block of text rows in a binarized image.
+
+    Returns (x0, y0, x1, y1, median_line_height) from the row and column ink profiles, or
+    None when there is no text.
+    """
+    h, w = binary.shape
+    ink = binary > 0
+    row_mask = ink.mean(axis=1) > INK_THRESHOLD
+    rows = _runs(row_mask)
+    if not rows:
+        return None
+    line_heights = [end - start for start, end in rows if end - start >= 4]
+    line_height = float(np.median(line_heights)) if line_heights else float(TARGET_LINE_HEIGHT)
+    y0, y1 = rows[0][0], rows[-1][1]
+    col_mask = ink[y0:y1].mean(axis=0) > INK_THRESHOLD
+    cols = np.flatnonzero(col_mask)
+    if cols.size == 0:
+        return None
+    x0, x1 = int(cols[0]), int(cols[-1]) + 1
+    return (
+        max(x0 - BAND_PADDING, 0),
+        max(y0 - BAND_PADDING, 0),
+        min(x1 + BAND_PADDING, w),
+        min(y1 + BAND_PADDING, h),
+        line_height,
+    )
+
+
+def preprocess_receipt(image_bytes: bytes, region_bottom: float) -> Optional[Tuple['np.ndarray', RoiTransform]]:
+    """Turn a receipt image into a small binarized ROI for Tesseract.
+
+    Grayscale decode -> crop to the top `region_bottom` of the receipt -> adaptive threshold
+    -> deskew -> crop to the detected text band -> scale so text lines are about
+    TARGET_LINE_HEIGHT px tall (usually a downscale, unlike the old fixed 800px upscale).
+
+    Returns (roi, transform), where roi_to_source(x, y, transform) maps an ROI pixel back to
+    the source image (undoing the deskew rotation too), or None if the image cannot be decoded.
+    """
+    gray = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        return None
+    full_h, full_w = gray.shape
+    region = gray[: max(int(full_h * region_bottom), 1)]
+
+    # Ink = 255 so profiles and minAreaRect work on text pixels
+    binary = cv2.adaptiveThreshold(region, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 31, 15)
+    binary, angle, matrix = deskew(binary)
+    if angle:
+        logger.debug(f"Deskewed receipt by {angle:.2f} degrees")
+
+    band = text_band(binary)
+    if band is None:
+        return None
+    x0, y0, x1, y1, line_height = band
+    roi = binary[y0:y1, x0:x1]
+
+    scale = TARGET_LINE_HEIGHT / line_height if line_height else 1.0
+    scale = min(max(scale, 0.5), 3.0)
+    if abs(scale - 1.0) > 0.05:
+        interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+        roi = cv2.resize(roi, None, fx=scale, fy=scale, interpolation=interpolation)
+
+    # Back to black text on white, which is what Tesseract expects
+    roi = cv2.bitwise_not(roi)
+    unrotate = None
+    if matrix is not None:
+        inverse = cv2.invertAffineTransform(matrix)
+        unrotate = tuple(tuple(float(v) for v in row) for row in inverse)
+    return roi, RoiTransform(float(x0), float(y0), scale, full_w, full_h, unrotate)
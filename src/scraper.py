@@ -7,14 +7,49 @@ from zoneinfo import ZoneInfo
 from typing import Optional, Dict, List
 import time
 import random
-from PIL import Image
-import io
+import threading
+
+from token_manager import VerificationTokenManager
+from address_canonicalizer import canonical_address
+from receipt_ocr import (
+    add_spaces_before_capitals,
+    analyze_receipt_bytes,
+    clean_officer_name,
+    parse_address_from_ocr,
+    parse_officer_info_from_ocr,
+)
 
 logger = logging.getLogger(__name__)
 
 
+class SearchError(Exception):
+    """A portal search that failed (no token, request error, error page), as opposed to "No results found"."""
+
+
+class RateLimiter:
+    """Thread-safe ceiling on request starts per second, shared across sessions."""
+
+    def __init__(self, max_per_second: float):
+        self.min_interval = 1.0 / max_per_second if max_per_second and max_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        if not self.min_interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
 class CitationScraper:
-    def __init__(self):
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None, token_manager: Optional[VerificationTokenManager] = None):
+        self.rate_limiter = rate_limiter
+        # Shared across pooled scrapers; tokens are still tracked per session
+        self.token_manager = token_manager or VerificationTokenManager()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36',
@@ -26,62 +61,73 @@ class CitationScraper:
         })
 
     def normalize_location(self, location: str) -> str:
-        """Normalize location strings - replace Tappan St with Tappan Ave"""
-        if not location:
-            return location
-        # Replace "Tappan St" with "Tappan Ave" (case-insensitive)
-        location = re.sub(r'\bTappan\s+St\b', 'Tappan Ave', location, flags=re.IGNORECASE)
-        location = re.sub(r'\bTappan\s+Street\b', 'Tappan Ave', location, flags=re.IGNORECASE)
-        return location
-
-    def get_verification_token(self) -> Optional[str]:
-        try:
-            start = time.time()
-            response = self.session.get('https://annarbor.citationportal.com/', timeout=30)
-            elapsed = (time.time() - start) * 1000
-            logger.debug(f"GET / (token) status={response.status_code} elapsed_ms={elapsed:.0f}")
-            soup = BeautifulSoup(response.text, 'html.parser')
-            token_input = soup.find('input', {'name': '__RequestVerificationToken'})
-            return token_input['value'] if token_input else None
-        except Exception as e:
-            logger.error(f"Error getting verification token: {e}")
-            return None
+        """Canonical spelling of a location (see address_canonicalizer), e.g. Tappan St -> Tappan Ave"""
+        return canonical_address(location)
 
-    def search_citation(self, citation_number: str) -> Optional[Dict]:
-        token = self.get_verification_token()
-        if not token:
-            return None
+    def _throttle(self) -> None:
+        """Block until the shared rate limiter (if any) allows another request."""
+        if self.rate_limiter:
+            self.rate_limiter.wait()
 
+    def get_verification_token(self, force_refresh: bool = False) -> Optional[str]:
+        """Return the session's cached anti-forgery token, refreshing it when expired."""
+        return self.token_manager.get_token(self.session, force_refresh=force_refresh, before_request=self._throttle)
+
+    def _post_search(self, citation_number: str, token: str) -> requests.Response:
         search_data = {
             '__RequestVerificationToken': token,
             'Type': 'NumberStrict',
             'Term': citation_number,
             'AdditionalTerm': ''
         }
+        # minimal delay for politeness
+        delay = random.uniform(0.01, 0.05)
+        logger.debug(f"POST /Citation/Search delay_s={delay:.3f} citation={citation_number}")
+        time.sleep(delay)
+
+        self._throttle()
+        start = time.time()
+        response = self.session.post(
+            'https://annarbor.citationportal.com/Citation/Search',
+            data=search_data,
+            timeout=30
+        )
+        elapsed = (time.time() - start) * 1000
+        logger.debug(f"POST /Citation/Search status={response.status_code} elapsed_ms={elapsed:.0f} citation={citation_number}")
+        return response
+
+    def search_summary(self, citation_number: str) -> Optional[Dict]:
+        """Search the portal for a citation and return the result row, without the details page.
+
+        Returns None only when the portal answers "No results found"; raises SearchError
+        when the search itself failed, so callers don't mistake an outage for a miss.
+        """
+        token = self.get_verification_token()
+        if not token:
+            raise SearchError(f"No verification token for citation {citation_number}")
 
         try:
-            # minimal delay for politeness
-            delay = random.uniform(0.01, 0.05)
-            logger.debug(f"POST /Citation/Search delay_s={delay:.3f} citation={citation_number}")
-            time.sleep(delay)
+            response = self._post_search(citation_number, token)
+            if self.token_manager.is_rejected(response):
+                # Token expired or was rejected; refresh once and retry
+                logger.debug(f"Search rejected (status={response.status_code}) for {citation_number}; refreshing token")
+                token = self.get_verification_token(force_refresh=True)
+                if not token:
+                    raise SearchError(f"No verification token for citation {citation_number}")
+                response = self._post_search(citation_number, token)
+        except requests.RequestException as e:
+            raise SearchError(f"Error searching citation {citation_number}: {e}") from e
+        if response.status_code != 200:
+            raise SearchError(f"Search for citation {citation_number} returned status {response.status_code}")
+        return self.parse_search_results(response.text, citation_number)
 
-            start = time.time()
-            response = self.session.post(
-                'https://annarbor.citationportal.com/Citation/Search',
-                data=search_data,
-                timeout=30
-            )
-            elapsed = (time.time() - start) * 1000
-            logger.debug(f"POST /Citation/Search status={response.status_code} elapsed_ms={elapsed:.0f} citation={citation_number}")
-            base = self.parse_search_results(response.text, citation_number)
-            if base and base.get('more_info_url'):
-                details = self.fetch_details_page(base['more_info_url'])
-                if details:
-                    base.update(details)
-            return base
-        except Exception as e:
-            logger.error(f"Error searching citation {citation_number}: {e}")
-            return None
+    def search_citation(self, citation_number: str) -> Optional[Dict]:
+        base = self.search_summary(citation_number)
+        if base and base.get('more_info_url'):
+            details = self.fetch_details_page(base['more_info_url'])
+            if details:
+                base.update(details)
+        return base
 
     def parse_search_results(self, html: str, citation_number: str) -> Optional[Dict]:
         soup = BeautifulSoup(html, 'html.parser')
@@ -111,7 +157,7 @@ class CitationScraper:
                     'more_info_url': more_info_url,
                     'raw_html': html
                 }
-        return None
+        raise SearchError(f"Unrecognised search response for citation {citation_number}")
 
     def extract_amount(self, text: str) -> Optional[float]:
         match = re.search(r'\$(\d+\.?\d*)', text)
@@ -142,24 +188,25 @@ class CitationScraper:
         except Exception:
             return None
 
-    def fetch_details_page(self, url: str) -> Optional[Dict]:
+    def fetch_details_page(self, url: str, include_receipt: bool = True) -> Optional[Dict]:
         try:
             # minimal delay for politeness
             delay = random.uniform(0.01, 0.05)
             logger.debug(f"GET details delay_s={delay:.3f} url={url}")
             time.sleep(delay)
+            self._throttle()
             start = time.time()
             resp = self.session.get(url, timeout=30)
             elapsed = (time.time() - start) * 1000
             logger.debug(f"GET details status={resp.status_code} elapsed_ms={elapsed:.0f} url={url}")
             if resp.status_code != 200:
                 return None
-            return self.parse_details_page(resp.text)
+            return self.parse_details_page(resp.text, include_receipt=include_receipt)
         except Exception as e:
             logger.error(f"Error fetching details page {url}: {e}")
             return None
 
-    def parse_details_page(self, html: str) -> Optional[Dict]:
+    def parse_details_page(self, html: str, include_receipt: bool = True) -> Optional[Dict]:
         soup = BeautifulSoup(html, 'html.parser')
         info = {}
         info_list = soup.select('.citation-information-box ul.list-unstyled > li')
@@ -208,96 +255,61 @@ class CitationScraper:
                 image_urls.append(f"https://annarbor.citationportal.com{href}")
         if image_urls:
             info['image_urls'] = image_urls
-            
-            # Extract clean address from receipt image (last image)
-            try:
-                clean_address = self.extract_address_from_receipt(image_urls[-1])
-                if clean_address:
-                    clean_address = self.normalize_location(clean_address)
-                    info['location'] = clean_address
-                    logger.info(f"Extracted clean address from OCR: {clean_address}")
-            except Exception as e:
-                logger.warning(f"Failed to extract address from receipt image: {e}")
-            
-            # Extract officer info from receipt image (last image)
-            try:
-                officer_info = self.extract_officer_info_from_receipt(image_urls[-1])
-                has_officer_info = False
-                if officer_info.get('officer_badge'):
-                    info['officer_badge'] = officer_info['officer_badge']
-                    has_officer_info = True
-                if officer_info.get('officer_name'):
-                    info['officer_name'] = officer_info['officer_name']
-                    has_officer_info = True
-                if officer_info.get('officer_beat'):
-                    info['officer_beat'] = officer_info['officer_beat']
-                    has_officer_info = True
-                
-                if has_officer_info:
-                    info['officer_info_extracted_at'] = datetime.now().isoformat()
-            except Exception as e:
-                logger.warning(f"Failed to extract officer info from receipt image: {e}")
+            if include_receipt:
+                self.apply_receipt_info(info)
+
+        return info
+
+    def apply_receipt_info(self, info: Dict) -> Dict:
+        """OCR the receipt image (last image) once and merge clean address and officer info into info."""
+        image_urls = info.get('image_urls') or []
+        if not image_urls:
+            return info
+
+        try:
+            receipt = self.analyze_receipt(image_urls[-1])
+        except Exception as e:
+            logger.warning(f"Failed to analyze receipt image: {e}")
+            return info
+        return self.merge_receipt_info(info, receipt)
+
+    def merge_receipt_info(self, info: Dict, receipt: Dict) -> Dict:
+        """Merge receipt OCR fields (see receipt_ocr.analyze_receipt_bytes) into citation info."""
+        clean_address = receipt.get('location')
+        if clean_address:
+            clean_address = self.normalize_location(clean_address)
+            info['location'] = clean_address
+            logger.info(f"Extracted clean address from OCR: {clean_address}")
+
+        has_officer_info = False
+        for key in ('officer_badge', 'officer_name', 'officer_beat'):
+            if receipt.get(key):
+                info[key] = receipt[key]
+                has_officer_info = True
+        if has_officer_info:
+            info['officer_info_extracted_at'] = datetime.now().isoformat()
+            logger.info(f"Extracted officer info from OCR: badge={receipt.get('officer_badge')}, name={receipt.get('officer_name')}, beat={receipt.get('officer_beat')}")
 
         return info
-    
+
+    def download_receipt(self, image_url: str) -> bytes:
+        self._throttle()
+        response = self.session.get(image_url, timeout=30)
+        response.raise_for_status()
+        return response.content
+
+    def analyze_receipt(self, image_url: str) -> Dict:
+        """Download a receipt once and extract location and officer info from a single OCR pass."""
+        return analyze_receipt_bytes(self.download_receipt(image_url))
+
     def extract_address_from_receipt(self, image_url: str) -> Optional[str]:
         """Extract clean address from receipt image using OCR"""
         try:
-            # Check if pytesseract is available
-            try:
-                import pytesseract
-            except ImportError:
-                logging.debug("Tesseract not available, skipping OCR")
-                return None
-            
-            # Download image
-            response = self.session.get(image_url, timeout=30)
-            response.raise_for_status()
-            
-            # Preprocess image
-            image = Image.open(io.BytesIO(response.content))
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # Crop to LOCATION region - targeting the middle-left area of receipt
-            # Based on typical receipt layout, LOCATION is in the middle portion, left side
-            original_width = image.width
-            original_height = image.height
-            
-            # Crop to approximately the middle section (20%-70% from top) and left 70% to capture long addresses
-            crop_left = 0
-            crop_top = int(original_height * 0.2)  # Start from 20% down
-            crop_right = int(original_width * 0.7)  # End at 70% width (increased from 60% for longer streets)
-            crop_bottom = int(original_height * 0.7)  # End at 70% from top
-            
-            # Create cropped image
-            cropped_image = image.crop((crop_left, crop_top, crop_right, crop_bottom))
-            
-            # Resize if too small for better OCR accuracy
-            if cropped_image.width < 800 or cropped_image.height < 600:
-                ratio = max(800 / cropped_image.width, 600 / cropped_image.height)
-                new_width = int(cropped_image.width * ratio)
-                new_height = int(cropped_image.height * ratio)
-                cropped_image = cropped_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Extract text with OCR on cropped region
-            custom_config = r'--oem 3 --psm 6'
-            text = pytesseract.image_to_string(cropped_image, config=custom_config)
-            
-            # Find the LOCATION line specifically
-            location_line = None
-            for line in text.split('\n'):
-                if 'LOCATION' in line.upper():
-                    location_line = line
-                    break
-            
-            # Extract address from text (or just the LOCATION line if found)
-            return self.parse_address_from_ocr(location_line if location_line else text)
-            
+            return self.analyze_receipt(image_url).get('location')
         except Exception as e:
             logger.debug(f"Error extracting address from receipt: {e}")
             return None
-    
+
     def extract_officer_info_from_receipt(self, image_url: str) -> Dict:
         """Extract officer badge, name, and beat from receipt image using OCR.
         
@@ -309,231 +321,23 @@ class CitationScraper:
             'officer_name': None,
             'officer_beat': None
         }
-        
         try:
-            # Check if pytesseract is available
-            try:
-                import pytesseract
-            except ImportError:
-                logger.debug("Tesseract not available, skipping officer OCR")
-                return result
-            
-            # Download image
-            response = self.session.get(image_url, timeout=30)
-            response.raise_for_status()
-            
-            # Preprocess image
-            image = Image.open(io.BytesIO(response.content))
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            original_width = image.width
-            original_height = image.height
-            
-            # Officer info is typically near the TOP of the receipt (after citation number and date)
-            # Scan the top 40% of the image to capture OFFICER and BEAT lines
-            crop_left = 0
-            crop_top = 0  # Start from top
-            crop_right = original_width  # Full width
-            crop_bottom = int(original_height * 0.4)  # Top 40%
-            
-            cropped_image = image.crop((crop_left, crop_top, crop_right, crop_bottom))
-            
-            # Resize if too small for better OCR accuracy
-            if cropped_image.width < 800 or cropped_image.height < 400:
-                ratio = max(800 / cropped_image.width, 400 / cropped_image.height)
-                new_width = int(cropped_image.width * ratio)
-                new_height = int(cropped_image.height * ratio)
-                cropped_image = cropped_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Extract text with OCR
-            custom_config = r'--oem 3 --psm 6'
-            text = pytesseract.image_to_string(cropped_image, config=custom_config)
-            
-            # Debug: log the raw OCR text for troubleshooting
-            if text and text.strip():
-                logger.debug(f"Officer OCR raw text (top portion):\n{text[:500]}")
-            
-            # Parse the text for officer info
-            result = self.parse_officer_info_from_ocr(text)
-            
-            if result.get('officer_badge') or result.get('officer_name'):
-                logger.info(f"Extracted officer info from OCR: badge={result.get('officer_badge')}, name={result.get('officer_name')}, beat={result.get('officer_beat')}")
-            
-            return result
-            
+            receipt = self.analyze_receipt(image_url)
+            return {key: receipt.get(key) for key in result}
         except Exception as e:
             logger.debug(f"Error extracting officer info from receipt: {e}")
             return result
-    
+
     def parse_officer_info_from_ocr(self, text: str) -> Dict:
-        """Parse officer badge, name, and beat from OCR text.
-        
-        Typical receipt patterns:
-        - OFFICER: 801 RITTER
-        - OFFICER: 1234 SMITH, JOHN
-        - OFFICER 1234 SMITH JOHN
-        - BADGE: 1234
-        - BEAT: A
-        """
-        result = {
-            'officer_badge': None,
-            'officer_name': None,
-            'officer_beat': None
-        }
-        
-        if not text:
-            return result
-        
-        # Normalize text
-        text = text.upper()
-        lines = text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Pattern: OFFICER: 1234 SMITH, JOHN or OFFICER 1234 SMITH JOHN
-            # Allow 1-8 digits for badge to be safe
-            officer_patterns = [
-                # OFFICER: badge name (e.g. OFFICER : 801 RITTER)
-                r'OFFICER[:\s]+(\d{1,8})\s+([A-Z0-9][A-Z0-9\s,\.\'-]+)',
-                # OFFICER: name (badge)
-                r'OFFICER[:\s]+([A-Z][A-Z\s,\.\'-]+)\s*\((\d{1,8})\)',
-                # Just looking for badge number on a line with OFFICER
-                r'OFFICER[:\s]+(\d{1,8})$',
-            ]
-            
-            # Check officer patterns
-            for pattern in officer_patterns:
-                match = re.search(pattern, line)
-                if match:
-                    groups = match.groups()
-                    if len(groups) >= 2:
-                        # First pattern: badge then name
-                        if groups[0].isdigit():
-                            result['officer_badge'] = groups[0].strip()
-                            result['officer_name'] = self._clean_officer_name(groups[1])
-                        else:
-                            # Second pattern: name then badge
-                            result['officer_name'] = self._clean_officer_name(groups[0])
-                            result['officer_badge'] = groups[1].strip()
-                    elif len(groups) == 1 and groups[0].isdigit():
-                        result['officer_badge'] = groups[0].strip()
-                    
-                    # If we found something, break logic for this line? 
-                    # We might still find BEAT on the same line if it exists
-                    break
-            
-            # Pattern: BADGE: 1234 or BADGE 1234 (if not found in OFFICER line)
-            if not result['officer_badge']:
-                badge_match = re.search(r'BADGE[:\s]+(\d{1,8})', line)
-                if badge_match:
-                    result['officer_badge'] = badge_match.group(1).strip()
-            
-            # Pattern: BEAT: A1 or BEAT A (single letter or number or mix)
-            # Sometimes just "BEAT A"
-            if not result['officer_beat']:
-                beat_match = re.search(r'BEAT[:\s]+([A-Z0-9\-]+)', line)
-                if beat_match:
-                    result['officer_beat'] = beat_match.group(1).strip()
-            
-            # Pattern: OFFICER NAME: SMITH, JOHN
-            if not result['officer_name']:
-                name_match = re.search(r'(?:OFFICER\s*)?NAME[:\s]+([A-Z][A-Z\s,\.\'-]+)', line)
-                if name_match:
-                    result['officer_name'] = self._clean_officer_name(name_match.group(1))
-        
-        return result
-    
+        """Parse officer badge, name, and beat from OCR text (see receipt_ocr)."""
+        return parse_officer_info_from_ocr(text)
+
     def _clean_officer_name(self, name: str) -> Optional[str]:
-        """Clean up officer name from OCR text."""
-        if not name:
-            return None
-        
-        # Remove extra whitespace
-        name = ' '.join(name.split())
-        
-        # Remove trailing punctuation except for valid name characters
-        name = name.strip(' ,.')
-        
-        # Skip if too short or looks like noise
-        if len(name) < 2:
-            return None
-        
-        # Skip if it's mostly numbers
-        if sum(c.isdigit() for c in name) > len(name) // 2:
-            return None
-        
-        return name if name else None
-    
-    def parse_address_from_ocr(self, text: str) -> Optional[str]:
-        """Parse address from OCR text"""
-        if not text:
-            return None
-        
-        # Look for LOCATION patterns - handle both "LOCATION:" and "LOCATION" formats
-        location_patterns = [
-            # Pattern: LOCATION: 800 S Forest Ave (with direction)
-            r'LOCATION:\s*(\d+)\s*([NSEW])\s+([A-Za-z\s]+(?:St|Street|Ave|Avenue|Rd|Road|Blvd|Boulevard|Dr|Drive|Ln|Lane|Ct|Court|Pl|Place|Way|Cir|Circle))',
-            # Pattern: LOCATION: 1100 Prospect St (without direction)
-            r'LOCATION:\s*(\d+)\s+([A-Za-z\s]+(?:St|Street|Ave|Avenue|Rd|Road|Blvd|Boulevard|Dr|Drive|Ln|Lane|Ct|Court|Pl|Place|Way|Cir|Circle))',
-            # Pattern without colon: LOCATION800SForestAve
-            r'LOCATION(\d+)([NSEW])([A-Za-z]+(?:St|Street|Ave|Avenue|Rd|Road|Blvd|Boulevard|Dr|Drive|Ln|Lane|Ct|Court|Pl|Place|Way|Cir|Circle))',
-            # Pattern without colon and direction: LOCATION1100ProspectSt
-            r'LOCATION(\d+)([A-Za-z]+(?:St|Street|Ave|Avenue|Rd|Road|Blvd|Boulevard|Dr|Drive|Ln|Lane|Ct|Court|Pl|Place|Way|Cir|Circle))',
-        ]
-        
-        for pattern in location_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                if len(match.groups()) == 3:
-                    # Pattern with direction
-                    number, direction, street = match.groups()
-                    formatted_street = self.add_spaces_before_capitals(street.strip())
-                    # Clean up the address - remove newlines and extra whitespace
-                    address = f"{number} {direction} {formatted_street}"
-                    address = re.sub(r'\s+', ' ', address).strip()
-                    # Take only the first line (before any newline)
-                    address = address.split('\n')[0].strip()
-                    return address
-                elif len(match.groups()) == 2:
-                    # Pattern without direction
-                    number, street = match.groups()
-                    formatted_street = self.add_spaces_before_capitals(street.strip())
-                    # Clean up the address - remove newlines and extra whitespace
-                    address = f"{number} {formatted_street}"
-                    address = re.sub(r'\s+', ' ', address).strip()
-                    # Take only the first line (before any newline)
-                    address = address.split('\n')[0].strip()
-                    return address
-        
-        return None
-    
-    def add_spaces_before_capitals(self, text: str) -> str:
-        """Add spaces before capital letters for better readability"""
-        if not text:
-            return text
-        
-        # Special handling for directional indicators (N, S, E, W)
-        directional_pattern = r'^([NSEW])([A-Z][a-z]+.*)$'
-        match = re.match(directional_pattern, text)
-        if match:
-            direction = match.group(1)
-            street_part = match.group(2)
-            formatted_street = self.add_spaces_before_capitals(street_part)
-            return f"{direction} {formatted_street}"
-        
-        # Regular case: add space before capital letters
-        result = text[0]
-        for i in range(1, len(text)):
-            char = text[i]
-            if char.isupper() and text[i-1].islower():
-                result += ' ' + char
-            else:
-                result += char
-        
-        return result
+        return clean_officer_name(name)
 
+    def parse_address_from_ocr(self, text: str) -> Optional[str]:
+        """Parse address from OCR text (see receipt_ocr)."""
+        return parse_address_from_ocr(text)
 
+    def add_spaces_before_capitals(self, text: str) -> str:
+        return add_spaces_before_capitals(text)
@@ -0,0 +1,76 @@
+import logging
+import os
+import threading
+import time
+import weakref
+from typing import Dict, Optional
+
+import requests
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+PORTAL_URL = 'https://annarbor.citationportal.com/'
+
+
+class VerificationTokenManager:
+    """Cache the portal's __RequestVerificationToken per requests.Session.
+
+    The anti-forgery token is only valid together with the antiforgery cookie that the
+    same GET set on the session, so tokens are tracked per session (one per pooled
+    scraper) and cleared together with that cookie when they are refreshed.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, portal_url: str = PORTAL_URL):
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv('PORTAL_TOKEN_TTL_SECONDS', '60'))
+        self.ttl_seconds = ttl_seconds
+        self.portal_url = portal_url
+        self._lock = threading.Lock()
+        self._entries: 'weakref.WeakKeyDictionary[requests.Session, Dict]' = weakref.WeakKeyDictionary()
+        self.fetch_count = 0
+
+    def get_token(self, session: requests.Session, force_refresh: bool = False, before_request=None) -> Optional[str]:
+        """Return a cached token for the session, fetching a new one if missing or expired."""
+        if not force_refresh:
+            with self._lock:
+                entry = self._entries.get(session)
+            if entry and (time.monotonic() - entry['fetched_at']) < self.ttl_seconds:
+                return entry['token']
+
+        self.invalidate(session)
+        try:
+            if before_request:
+                before_request()
+            start = time.time()
+            response = session.get(self.portal_url, timeout=30)
+            elapsed = (time.time() - start) * 1000
+            logger.debug(f"GET / (token) status={response.status_code} elapsed_ms={elapsed:.0f}")
+            soup = BeautifulSoup(response.text, 'html.parser')
+            token_input = soup.find('input', {'name': '__RequestVerificationToken'})
+            if not token_input:
+                return None
+            token = token_input['value']
+            with self._lock:
+                self._entries[session] = {'token': token, 'fetched_at': time.monotonic()}
+                self.fetch_count += 1
+            return token
+        except Exception as e:
+            logger.error(f"Error getting verification token: {e}")
+            return None
+
+    def invalidate(self, session: requests.Session) -> None:
+        """Drop the cached token and its antiforgery cookies for the session."""
+        with self._lock:
+            self._entries.pop(session, None)
+        for cookie in list(session.cookies):
+            if 'antiforgery' in cookie.name.lower() or cookie.name == '__RequestVerificationToken':
+                session.cookies.clear(cookie.domain, cookie.path, cookie.name)
+
+    @staticmethod
+    def is_rejected(response: requests.Response) -> bool:
+        """True when the portal refused a POST because of a stale or missing token."""
+        if 400 <= response.status_code < 500:
+            return True
+        text = response.text[:2000].lower() if response.text else ''
+        return 'anti-forgery token' in text or 'antiforgery token' in text
@@ -1,11 +1,15 @@
 from flask import Flask, jsonify, render_template, request
 import os
 import logging
+import threading
+import time
 from pathlib import Path
 from db_manager import DatabaseManager
 from storage_factory import StorageFactory
 from email_notifier import EmailNotifier
 from geocoder import Geocoder
+from geocode_cache import GeocodeCache
+from address_canonicalizer import canonical_address
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +44,40 @@ def get_geocoder():
         _geocoder = Geocoder()
     return _geocoder
 
+# Shared geocode cache, so repeated searches for any spelling of an address skip Nominatim
+_geocode_cache = None
+
+def get_geocode_cache():
+    """Get or create the shared GeocodeCache instance"""
+    global _geocode_cache
+    if _geocode_cache is None:
+        _geocode_cache = GeocodeCache(get_db_manager())
+    return _geocode_cache
+
+# Officer stats for the citation popup, reused per officer for a few minutes
+OFFICER_STATS_TTL_SECONDS = float(os.getenv('OFFICER_STATS_TTL_SECONDS', '300'))
+OFFICER_STATS_CACHE_SIZE = 1000
+_officer_stats_cache = {}
+_officer_stats_lock = threading.Lock()
+
+def get_officer_stats_cached(officer_name, officer_badge):
+    """DatabaseManager.get_officer_stats, cached in-process for OFFICER_STATS_TTL_SECONDS"""
+    key = ('badge', officer_badge.strip()) if officer_badge else ('name', (officer_name or '').strip())
+    now = time.monotonic()
+    with _officer_stats_lock:
+        hit = _officer_stats_cache.get(key)
+        if hit and hit[0] > now:
+            return hit[1]
+    stats = get_db_manager().get_officer_stats(officer_name=officer_name, officer_badge=officer_badge)
+    with _officer_stats_lock:
+        if len(_officer_stats_cache) >= OFFICER_STATS_CACHE_SIZE:
+            for stale in [k for k, (expires, _) in _officer_stats_cache.items() if expires <= now]:
+                del _officer_stats_cache[stale]
+            if len(_officer_stats_cache) >= OFFICER_STATS_CACHE_SIZE:
+                _officer_stats_cache.clear()
+        _officer_stats_cache[key] = (now + OFFICER_STATS_TTL_SECONDS, stats)
+    return stats
+
 def get_og_image_url(base_url):
     """Get the Open Graph preview image URL, checking for og-preview.png first"""
     # Check if og-preview.png exists in static folder
@@ -321,7 +359,7 @@ def get_citation(citation_number):
         officer_stats = None
         if citation.get('officer_name') or citation.get('officer_badge'):
             try:
-                officer_stats = db_manager.get_officer_stats(
+                officer_stats = get_officer_stats_cached(
                     officer_name=citation.get('officer_name'),
                     officer_badge=citation.get('officer_badge')
                 )
@@ -668,16 +706,21 @@ def geocode_address():
         if not query:
             return jsonify({'status': 'error', 'error': 'q parameter is required'}), 400
 
-        geocoder = get_geocoder()
-        # Use geocoder.geocode_address
-        coords = geocoder.geocode_address(query)
+        cache = get_geocode_cache()
+        known, coords = cache.get(query)
+        if not known:
+            coords, definitive = get_geocoder().geocode_with_status(query)
+            if coords or definitive:
+                cache.store(query, coords, 'nominatim')
+                cache.flush()
         
         if coords:
             return jsonify({
                 'status': 'success', 
                 'lat': coords[0], 
                 'lon': coords[1],
-                'query': query
+                'query': query,
+                'canonical': canonical_address(query)
             })
         else:
             return jsonify({
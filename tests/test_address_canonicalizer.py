@@ -0,0 +1,39 @@
+import pytest
+
+from address_canonicalizer import address_key, canonical_address, split_address
+
+
+@pytest.mark.parametrize('location, expected', [
+    ('500 Tappan St', '500 Tappan Ave'),
+    ('500 Tappan Street, Ann Arbor, MI 48104', '500 Tappan Ave'),
+    ('500 S Tappan St', '500 S Tappan Ave'),
+    ('500 South Tappan Street', '500 S Tappan Ave'),
+    ('500 n tappan st', '500 N Tappan Ave'),
+])
+def test_street_alias_applies_after_directional_prefix(location, expected):
+    assert canonical_address(location) == expected
+
+
+@pytest.mark.parametrize('location, expected', [
+    ('Tappan St', 'Tappan Ave'),
+    ('S Tappan St', 'S Tappan Ave'),
+    ('tappan street', 'Tappan Ave'),
+    ('Tappan Street & Hill St', 'Tappan Ave & Hill St'),
+    ('Hill St & S Tappan St.', 'Hill St & S Tappan Ave.'),
+    ('Tappan Avenue', 'Tappan Avenue'),
+    ('Tappanst Lot', 'Tappanst Lot'),
+])
+def test_street_alias_applies_without_house_number(location, expected):
+    assert canonical_address(location) == expected
+
+
+def test_spellings_share_a_key():
+    assert address_key('800 South Forest Avenue, Ann Arbor, MI') == address_key('800SForestAve') == '800 S FOREST AVE'
+
+
+def test_directional_street_name_is_kept():
+    assert split_address('100 North St') == (100, 'North St')
+
+
+def test_non_address_only_collapses_whitespace():
+    assert canonical_address('  Lot   3 Palio ') == 'Lot 3 Palio'
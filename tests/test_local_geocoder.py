@@ -0,0 +1,90 @@
+import pytest
+
+from local_geocoder import LocalGeocoder
+
+EVEN_LON = -83.7480
+ODD_LON = -83.7482
+
+
+def lat_for(number):
+    # ~11 m of latitude per 10 house numbers
+    return 42.28 + (number - 100) * 0.00001
+
+
+@pytest.fixture
+def geocoder():
+    rows = [(f"{n} Main St", lat_for(n), EVEN_LON) for n in (100, 200, 300)]
+    rows += [(f"{n} Main Street", lat_for(n), ODD_LON) for n in (101, 301)]
+    return LocalGeocoder.build(rows)
+
+
+def test_exact_hit(geocoder):
+    assert geocoder.geocode('200 Main St, Ann Arbor, MI') == (lat_for(200), EVEN_LON, 1.0)
+
+
+def test_interpolates_between_close_neighbours(geocoder):
+    lat, lon, confidence = geocoder.geocode('150 Main St')
+    assert lat == pytest.approx(lat_for(150))
+    assert lon == pytest.approx(EVEN_LON)
+    assert confidence == 0.9
+
+
+def test_interpolates_on_the_same_side_of_the_street(geocoder):
+    lat, lon, confidence = geocoder.geocode('201 Main St')
+    assert lat == pytest.approx(lat_for(201))
+    assert lon == pytest.approx(ODD_LON)
+    assert confidence == 0.7
+
+
+def test_no_interpolation_across_a_large_number_gap():
+    geocoder = LocalGeocoder.build([('100 Elm St', lat_for(100), EVEN_LON), ('600 Elm St', lat_for(600), EVEN_LON)])
+    assert geocoder.geocode('300 Elm St') is None
+
+
+def test_no_interpolation_across_disconnected_pieces():
+    # 100 and 200 are about 2.2 km apart, past MAX_SPAN_METERS
+    geocoder = LocalGeocoder.build([('100 Elm St', 42.28, EVEN_LON), ('200 Elm St', 42.30, EVEN_LON)])
+    assert geocoder.geocode('150 Elm St') is None
+
+
+def test_snaps_just_past_the_known_stretch(geocoder):
+    assert geocoder.geocode('310 Main St') == (lat_for(300), EVEN_LON, 0.6)
+    assert geocoder.geocode('90 Main St') == (lat_for(100), EVEN_LON, 0.6)
+    assert geocoder.geocode('330 Main St') is None
+
+
+def test_unknown_street_and_non_addresses(geocoder):
+    assert geocoder.geocode('150 Elm St') is None
+    assert geocoder.geocode('Lot 3 Palio') is None
+
+
+def test_build_averages_repeats_and_drops_points_outside_ann_arbor():
+    geocoder = LocalGeocoder.build([
+        ('100 Elm St', 42.280, EVEN_LON),
+        ('100 Elm Street', 42.282, EVEN_LON),
+        ('200 Elm St', 40.0, -80.0),
+    ])
+    assert len(geocoder) == 1
+    assert geocoder.geocode('100 Elm St') == (pytest.approx(42.281), EVEN_LON, 1.0)
+
+
+class FakeDb:
+    def __init__(self, rows, local_keys):
+        self.rows = rows
+        self.local_keys = local_keys
+
+    def get_geocoded_locations(self):
+        return self.rows
+
+    def get_geocode_cache_keys(self, source):
+        return self.local_keys if source == 'local' else set()
+
+
+def test_from_db_skips_coordinates_the_index_produced():
+    rows = [
+        {'location': f"{n} Main St", 'latitude': lat_for(n), 'longitude': EVEN_LON}
+        for n in (100, 150, 200)
+    ]
+    geocoder = LocalGeocoder.from_db(FakeDb(rows, {'150 MAIN ST'}))
+    assert len(geocoder) == 2
+    assert geocoder.geocode('150 Main St')[2] == 0.9
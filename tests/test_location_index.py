@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+import location_index
+from local_geocoder import haversine_m
+from location_index import LocationSubscriptionIndex
+
+
+@pytest.fixture
+def subscriptions():
+    rng = random.Random(1)
+    subs = [
+        {
+            'id': i,
+            'center_lat': 42.28 + rng.uniform(-0.05, 0.05),
+            'center_lon': -83.74 + rng.uniform(-0.05, 0.05),
+            'radius_m': rng.choice([50, 200, 800, 3000, 60000]),
+        }
+        for i in range(300)
+    ]
+    return subs + [{'id': 'no-center', 'center_lat': None, 'center_lon': -83.7, 'radius_m': 100}]
+
+
+@pytest.fixture
+def points():
+    rng = random.Random(2)
+    return [(42.28 + rng.uniform(-0.07, 0.07), -83.74 + rng.uniform(-0.07, 0.07)) for _ in range(1000)]
+
+
+def _brute_force(subs, lat, lon):
+    return {
+        s['id'] for s in subs
+        if s['center_lat'] is not None and haversine_m(lat, lon, s['center_lat'], s['center_lon']) <= s['radius_m']
+    }
+
+
+def test_match_agrees_with_brute_force(subscriptions, points):
+    index = LocationSubscriptionIndex(subscriptions)
+    assert len(index) == 300
+    for lat, lon in points:
+        assert {s['id'] for s in index.match(lat, lon)} == _brute_force(subscriptions, lat, lon)
+
+
+@pytest.mark.parametrize('chunk', [1_000_000, 7])
+def test_match_many_agrees_with_match(subscriptions, points, monkeypatch, chunk):
+    monkeypatch.setattr(location_index, 'MAX_PAIRS_PER_CHUNK', chunk)
+    index = LocationSubscriptionIndex(subscriptions)
+    for (lat, lon), matched in zip(points, index.match_many(points)):
+        assert {s['id'] for s in matched} == {s['id'] for s in index.match(lat, lon)}
+
+
+def test_point_just_inside_radius_across_a_cell_boundary():
+    # The circle's top edge sits just past the 42.30 cell boundary
+    radius = 1000.0
+    center_lat = 42.30 - 0.008988
+    point = (center_lat + 0.0089925, -83.74)
+    assert haversine_m(point[0], point[1], center_lat, -83.74) <= radius
+    index = LocationSubscriptionIndex([{'id': 1, 'center_lat': center_lat, 'center_lon': -83.74, 'radius_m': radius}])
+    assert [s['id'] for s in index.match(*point)] == [1]
+    assert [[s['id'] for s in matched] for matched in index.match_many([point])] == [[1]]
@@ -0,0 +1,40 @@
+import pytest
+
+from nonstandard import AliasIndex
+
+NONSTANDARD_MD = """\
+Lot #3 - Palio: 353 S Main St, Ann Arbor, MI 48104
+Lot #7 - Farmers Market: 315 Detroit St, Ann Arbor, MI 48104
+Lot #10 - Kerrytown: 212 E Kingsley St, Ann Arbor, MI 48104
+Lot #70 - 4th & William: 115 E William St, Ann Arbor, MI 48104
+Lot #16 - Community High: 401 N Division St, Ann Arbor, MI 48104
+Lot #6 - Main & Ann: 151 W Ann St, Ann Arbor, MI 48104
+NC2 Lot: 42.292306, -83.717500
+"""
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = tmp_path / 'nonstandard.md'
+    path.write_text(NONSTANDARD_MD, encoding='utf-8')
+    return AliasIndex(str(path))
+
+
+def test_exact_alias_ignores_case_and_punctuation(index):
+    assert index.resolve('lot 3 palio') == ('353 S Main St, Ann Arbor, MI 48104', None)
+
+
+def test_fuzzy_match_within_same_lot_number(index):
+    assert index.resolve('Lot #3 - Pallio') == ('353 S Main St, Ann Arbor, MI 48104', None)
+    assert index.resolve('Lot 7 Farmer Market') == ('315 Detroit St, Ann Arbor, MI 48104', None)
+
+
+@pytest.mark.parametrize('alias', [
+    'Lot 7 Palio',
+    'Lot 16 Main & Ann',
+    'Lot 70 Farmers Market',
+    'Lot 1 Kerrytown',
+    'NC27 Lot',
+])
+def test_fuzzy_match_never_changes_the_number(index, alias):
+    assert index.resolve(alias) == (None, None)
@@ -0,0 +1,35 @@
+from range_registry import FrontierScan, ScrapeRange
+
+
+def make_scan(miss_limit=3):
+    r = ScrapeRange('T', 1000, 2000, frontier=1100)
+    return FrontierScan(r, back_window=2, miss_limit=miss_limit, max_forward=500)
+
+
+def test_forward_scan_stops_after_miss_limit():
+    scan = make_scan()
+    assert scan.initial_numbers([]) == [1098, 1099, 1100, 1101, 1102, 1103]
+    assert [scan.on_result(n, False) for n in (1101, 1102, 1103)] == [[], [], []]
+
+
+def test_failed_probes_do_not_count_as_misses():
+    scan = make_scan()
+    scan.initial_numbers([])
+    assert scan.on_error(1101) == [1104]
+    assert scan.on_error(1101) == []
+    assert scan.on_result(1102, False) == []
+    assert scan.on_result(1104, True) == [1105, 1106, 1107]
+
+
+def test_failed_probes_extend_at_most_miss_limit():
+    scan = make_scan()
+    scan.initial_numbers([])
+    extra = []
+    n = 1101
+    while True:
+        follow_up = scan.on_error(n)
+        if not follow_up:
+            break
+        extra += follow_up
+        n += 1
+    assert extra == [1104, 1105, 1106]
@@ -0,0 +1,46 @@
+import pytest
+
+cv2 = pytest.importorskip('cv2')
+np = pytest.importorskip('numpy')
+
+from receipt_preprocess import preprocess_receipt, roi_to_source
+
+WIDTH, HEIGHT = 800, 1200
+ANGLE = 5.0
+# Left-aligned "text lines" (x0, x1, y) in the unrotated receipt, all in the OCR region
+BARS = [(80, 420, 150), (80, 360, 230), (80, 480, 310), (80, 300, 390)]
+BAR_HEIGHT = 12
+
+
+def _rotated_receipt():
+    image = np.full((HEIGHT, WIDTH), 255, dtype=np.uint8)
+    for x0, x1, y in BARS:
+        cv2.rectangle(image, (x0, y), (x1, y + BAR_HEIGHT), 0, thickness=-1)
+    matrix = cv2.getRotationMatrix2D((WIDTH / 2, HEIGHT / 2), ANGLE, 1.0)
+    rotated = cv2.warpAffine(image, matrix, (WIDTH, HEIGHT), borderValue=255)
+    ok, encoded = cv2.imencode('.png', rotated)
+    assert ok
+    return encoded.tobytes(), matrix
+
+
+def _ink_runs(mask):
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return list(zip(edges[::2], edges[1::2]))
+
+
+def test_roi_boxes_map_back_through_the_deskew_rotation():
+    image_bytes, matrix = _rotated_receipt()
+    roi, transform = preprocess_receipt(image_bytes, 0.7)
+    assert transform.unrotate is not None
+
+    ink = roi < 128
+    rows = _ink_runs(ink.mean(axis=1) > 0.01)
+    assert len(rows) == len(BARS)
+    for (x0, x1, y), (top, bottom) in zip(BARS, rows):
+        cols = np.flatnonzero(ink[top:bottom].any(axis=0))
+        roi_center = ((cols[0] + cols[-1] + 1) / 2, (top + bottom) / 2)
+        expected = matrix @ np.array([(x0 + x1) / 2, y + BAR_HEIGHT / 2, 1.0])
+        mapped = roi_to_source(*roi_center, transform)
+        assert mapped[0] == pytest.approx(expected[0], abs=6)
+        assert mapped[1] == pytest.approx(expected[1], abs=4)
@@ -0,0 +1,52 @@
+import pytest
+
+requests = pytest.importorskip('requests')
+pytest.importorskip('bs4')
+pytest.importorskip('PIL')
+
+from scraper import CitationScraper, SearchError
+
+NO_RESULTS_HTML = '<div class="k-grid-norecords-template">No results found.</div>'
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text=''):
+        self.status_code = status_code
+        self.text = text
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    s = CitationScraper()
+    monkeypatch.setattr(s, 'get_verification_token', lambda force_refresh=False: 'token')
+    return s
+
+
+def test_no_results_is_a_miss(scraper, monkeypatch):
+    monkeypatch.setattr(scraper, '_post_search', lambda number, token: FakeResponse(200, NO_RESULTS_HTML))
+    assert scraper.search_summary('1000001') is None
+
+
+@pytest.mark.parametrize('response', [
+    FakeResponse(503, 'Service Unavailable'),
+    FakeResponse(200, '<html><body>Something went wrong</body></html>'),
+])
+def test_error_pages_raise(scraper, monkeypatch, response):
+    monkeypatch.setattr(scraper, '_post_search', lambda number, token: response)
+    with pytest.raises(SearchError):
+        scraper.search_summary('1000001')
+
+
+def test_request_failure_raises(scraper, monkeypatch):
+    def fail(number, token):
+        raise requests.ConnectionError('connection reset')
+
+    monkeypatch.setattr(scraper, '_post_search', fail)
+    with pytest.raises(SearchError):
+        scraper.search_summary('1000001')
+
+
+def test_missing_token_raises(scraper, monkeypatch):
+    monkeypatch.setattr(scraper, 'get_verification_token', lambda force_refresh=False: None)
+    with pytest.raises(SearchError):
+        scraper.search_summary('1000001')